@@ -62,13 +62,19 @@ class Link(BaseModel):
     utilization: float = 0.0
     latency: Optional[float] = None  # in ms
     cost: Optional[int] = None
-    properties: Dict[str, Any] = Field(default_factory=dict)
+    properties: Dict[str, Any] = Field(default_factory=dict)  # "srlg": shared-risk groups
     discovered_at: datetime = Field(default_factory=datetime.utcnow)
     
     class Config:
         json_encoders = {
             datetime: lambda v: v.isoformat()
         }
+    
+    @property
+    def srlg(self) -> List[str]:
+        """Shared-risk link groups (conduits, line cards) the link is in."""
+        groups = self.properties.get("srlg") or []
+        return [groups] if isinstance(groups, str) else [str(g) for g in groups]
 
 
 class DiscoveryRequest(BaseModel):
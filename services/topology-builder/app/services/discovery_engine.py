@@ -1,5 +1,6 @@
 import asyncio
 import ipaddress
+import json
 from typing import List, Dict, Any, Optional
 import uuid
 import structlog
@@ -13,6 +14,12 @@ from app.core.dependencies import get_database_connections
 
 logger = structlog.get_logger()
 
+# Read by the what-if engine to invalidate its baseline cache
+TOPOLOGY_VERSION_KEY = "topology:version"
+
+# Pub/sub channel the what-if engine listens on to refresh its topology
+TOPOLOGY_EVENTS_CHANNEL = "topology:events"
+
 
 class NetworkDiscoverer:
     """Network topology discovery engine."""
@@ -64,6 +71,9 @@ class NetworkDiscoverer:
             # Save to Neo4j
             await self._save_topology_to_neo4j(nodes, links)
             
+            # Signal consumers that cached topology state is stale
+            self._bump_topology_version(result.discovery_id)
+            
             # Update result
             result.status = DiscoveryStatus.COMPLETED
             result.nodes_discovered = len(nodes)
@@ -122,14 +132,15 @@ class NetworkDiscoverer:
             nodes.append(node)
         
         # Create links between routers
+        # Links sharing a line card or conduit fail together (SRLG)
         link_configs = [
-            {"src": "R1", "dst": "R2", "capacity": 1000, "cost": 10},
-            {"src": "R1", "dst": "R3", "capacity": 1000, "cost": 15},
+            {"src": "R1", "dst": "R2", "capacity": 1000, "cost": 10, "srlg": ["R1-linecard-0"]},
+            {"src": "R1", "dst": "R3", "capacity": 1000, "cost": 15, "srlg": ["R1-linecard-0"]},
             {"src": "R2", "dst": "R3", "capacity": 500, "cost": 20},
-            {"src": "R2", "dst": "R4", "capacity": 1000, "cost": 10},
-            {"src": "R3", "dst": "R4", "capacity": 1000, "cost": 12},
-            {"src": "R3", "dst": "R5", "capacity": 500, "cost": 25},
-            {"src": "R4", "dst": "R5", "capacity": 1000, "cost": 8},
+            {"src": "R2", "dst": "R4", "capacity": 1000, "cost": 10, "srlg": ["conduit-north"]},
+            {"src": "R3", "dst": "R4", "capacity": 1000, "cost": 12, "srlg": ["conduit-north"]},
+            {"src": "R3", "dst": "R5", "capacity": 500, "cost": 25, "srlg": ["conduit-R5"]},
+            {"src": "R4", "dst": "R5", "capacity": 1000, "cost": 8, "srlg": ["conduit-R5"]},
         ]
         
         for i, config in enumerate(link_configs):
@@ -142,7 +153,8 @@ class NetworkDiscoverer:
                 capacity=config["capacity"],
                 utilization=round(__import__('random').uniform(0.2, 0.8), 2),
                 latency=round(__import__('random').uniform(1.0, 10.0), 1),
-                cost=config["cost"]
+                cost=config["cost"],
+                properties={"srlg": config["srlg"]} if "srlg" in config else {}
             )
             links.append(link)
         
@@ -196,6 +208,7 @@ class NetworkDiscoverer:
                             cost: $cost,
                             interface_src: $interface_src,
                             interface_dst: $interface_dst,
+                            srlg: $srlg,
                             discovered_at: datetime($discovered_at)
                         }]->(b)
                         """,
@@ -208,6 +221,7 @@ class NetworkDiscoverer:
                         cost=link.cost,
                         interface_src=link.interface_src,
                         interface_dst=link.interface_dst,
+                        srlg=link.srlg,
                         discovered_at=link.discovered_at.isoformat()
                     )
                 
@@ -217,6 +231,18 @@ class NetworkDiscoverer:
             logger.error("Failed to save topology to Neo4j", error=str(e))
             raise
     
+    def _bump_topology_version(self, discovery_id: str):
+        """Record the discovery that produced the current topology."""
+        try:
+            redis_client = self.db_connections["redis"]
+            redis_client.set(TOPOLOGY_VERSION_KEY, discovery_id)
+            redis_client.publish(TOPOLOGY_EVENTS_CHANNEL, json.dumps({
+                "event": "topology_updated",
+                "version": discovery_id
+            }))
+        except Exception as e:
+            logger.error("Failed to update topology version", error=str(e))
+    
     async def get_discovery_status(self, discovery_id: str) -> Optional[DiscoveryResult]:
         """Get discovery status."""
         try:
@@ -277,6 +303,7 @@ class NetworkDiscoverer:
                            r.latency as latency, r.cost as cost,
                            r.interface_src as interface_src,
                            r.interface_dst as interface_dst,
+                           r.srlg as srlg,
                            r.discovered_at as discovered_at
                     """
                 )
@@ -292,6 +319,9 @@ class NetworkDiscoverer:
                         cost=record["cost"],
                         interface_src=record["interface_src"],
                         interface_dst=record["interface_dst"],
+                        properties=(
+                            {"srlg": list(record["srlg"])} if record["srlg"] else {}
+                        ),
                         discovered_at=datetime.fromisoformat(
                             record["discovered_at"].replace("Z", "+00:00")
                         ) if record["discovered_at"] else datetime.utcnow()
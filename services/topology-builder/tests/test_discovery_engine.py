@@ -1,3 +1,4 @@
+import json
 import pytest
 import asyncio
 from unittest.mock import MagicMock, patch
@@ -92,6 +93,26 @@ async def test_save_topology_to_neo4j(discoverer, mock_connections):
     assert mock_session.run.call_count >= 2  # At least one for nodes, one for links
 
 
+@pytest.mark.asyncio
+async def test_save_link_srlg(discoverer, mock_connections):
+    """Test that shared-risk link groups are stored on the link."""
+    from app.models.topology import Link
+    
+    links = [
+        Link(id="L1", source="R1", target="R2", capacity=1000,
+             properties={"srlg": ["conduit-7", "R1-linecard-0"]}),
+        Link(id="L2", source="R2", target="R3", capacity=1000)
+    ]
+    mock_session = MagicMock()
+    mock_connections["neo4j"].session.return_value.__enter__.return_value = mock_session
+    
+    await discoverer._save_topology_to_neo4j([], links)
+    
+    stored = [call.kwargs["srlg"] for call in mock_session.run.call_args_list
+              if "srlg" in call.kwargs]
+    assert stored == [["conduit-7", "R1-linecard-0"], []]
+
+
 @pytest.mark.asyncio
 async def test_get_discovery_status_not_found(discoverer, mock_connections):
     """Test getting status for non-existent discovery."""
@@ -114,4 +135,19 @@ async def test_get_network_topology_empty(discoverer, mock_connections):
     
     assert len(topology.nodes) == 0
     assert len(topology.links) == 0
-    assert topology.metadata is not None
\ No newline at end of file
+    assert topology.metadata is not None
+
+@pytest.mark.asyncio
+async def test_run_discovery_bumps_topology_version(discoverer, mock_connections):
+    """Test that a completed discovery publishes a new topology version."""
+    request = DiscoveryRequest(network_range="192.168.1.0/24")
+    from app.models.topology import DiscoveryResult
+    result = DiscoveryResult(discovery_id="disc-1", request=request)
+    
+    await discoverer._run_discovery(result)
+    
+    assert result.status == DiscoveryStatus.COMPLETED
+    mock_connections["redis"].set.assert_called_with("topology:version", "disc-1")
+    channel, message = mock_connections["redis"].publish.call_args.args
+    assert channel == "topology:events"
+    assert json.loads(message)["version"] == "disc-1"
@@ -6,6 +6,7 @@ import structlog
 from app.models.simulation import NetworkMetrics
 from app.core.auth import verify_token
 from app.core.dependencies import get_clickhouse_client
+from app.services.executor import get_executor
 
 router = APIRouter()
 security = HTTPBearer()
@@ -18,12 +19,15 @@ async def get_system_metrics(token: str = Depends(security)):
     try:
         verify_token(token.credentials)
         
+        executor_stats = get_executor().stats()
+        
         # Return mock system metrics
         return {
             "cpu_usage": 45.2,
             "memory_usage": 68.7,
             "disk_usage": 34.1,
-            "active_simulations": 2,
+            "active_simulations": executor_stats["running"],
+            "queued_simulations": executor_stats["queue_depth"],
             "completed_simulations": 156,
             "uptime_seconds": 86400,
             "version": "1.0.0"
@@ -36,6 +40,21 @@ async def get_system_metrics(token: str = Depends(security)):
         raise HTTPException(status_code=500, detail="Failed to get system metrics")
 
 
+@router.get("/executor", response_model=dict)
+async def get_executor_metrics(token: str = Depends(security)):
+    """Get analysis executor queue depth and wait times."""
+    try:
+        verify_token(token.credentials)
+        
+        return get_executor().stats()
+        
+    except ValueError as e:
+        raise HTTPException(status_code=401, detail=str(e))
+    except Exception as e:
+        logger.error("Failed to get executor metrics", error=str(e))
+        raise HTTPException(status_code=500, detail="Failed to get executor metrics")
+
+
 @router.get("/network", response_model=NetworkMetrics)
 async def get_network_metrics(
     time_range: Optional[str] = "1h",
@@ -1,17 +1,36 @@
-from typing import Optional
+import asyncio
+from typing import AsyncIterator, Optional
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import StreamingResponse
 from fastapi.security import HTTPBearer
 import structlog
 
-from app.models.simulation import SimulationRequest, SimulationResult
-from app.services.simulation_engine import NetworkSimulator
+from app.models.simulation import (
+    SimulationAction, SimulationProgress, SimulationRequest, SimulationResult,
+    SimulationStatus, BatchSimulationRequest, BatchSimulationResult,
+    ContingencyRequest, ContingencyResult, ReplayRequest, ReplayResult,
+    LinkOptimizationRequest, LinkOptimizationResult, CriticalityReport,
+    SRLGSweepRequest, SRLGSweepResult
+)
+from app.services.executor import ExecutorSaturated
+from app.services.job_queue import get_job_queue
+from app.services.simulation_engine import get_simulator
 from app.core.auth import verify_token
+from app.core.config import settings
 
 router = APIRouter()
 security = HTTPBearer()
 logger = structlog.get_logger()
 
 
+def _authenticate(token) -> None:
+    """Verify the bearer token, rejecting the request with 401."""
+    try:
+        verify_token(token.credentials)
+    except ValueError as e:
+        raise HTTPException(status_code=401, detail=str(e))
+
+
 @router.post("/simulate", response_model=SimulationResult)
 async def run_simulation(
     request: SimulationRequest,
@@ -22,18 +41,153 @@ async def run_simulation(
         # Verify authentication
         verify_token(token.credentials)
         
-        simulator = NetworkSimulator()
-        result = await simulator.simulate(request)
+        simulator = get_simulator()
+        result = await asyncio.wait_for(
+            simulator.simulate(request),
+            timeout=settings.MAX_SIMULATION_TIME
+        )
         
         return result
         
     except ValueError as e:
         raise HTTPException(status_code=401, detail=str(e))
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=504,
+            detail=f"Simulation exceeded {settings.MAX_SIMULATION_TIME}s time limit"
+        )
+    except ExecutorSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         logger.error("Simulation failed", error=str(e))
         raise HTTPException(status_code=500, detail="Simulation failed")
 
 
+@router.post("/simulate/async", response_model=SimulationResult, status_code=202)
+async def submit_simulation(
+    request: SimulationRequest,
+    token: str = Depends(security)
+):
+    """Queue a simulation and return immediately with its PENDING result."""
+    _authenticate(token)
+    try:
+        return await get_job_queue().submit(request)
+        
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error("Failed to queue simulation", error=str(e))
+        raise HTTPException(status_code=500, detail="Failed to queue simulation")
+
+
+@router.post("/simulate/batch", response_model=BatchSimulationResult)
+async def run_batch_simulation(
+    request: BatchSimulationRequest,
+    token: str = Depends(security)
+):
+    """Run many simulations against one topology load and baseline."""
+    _authenticate(token)
+    try:
+        if len(request.scenarios) > settings.MAX_BATCH_SIZE:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Batch exceeds {settings.MAX_BATCH_SIZE} scenarios"
+            )
+        
+        simulator = get_simulator()
+        return await simulator.simulate_batch(request.scenarios)
+        
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except HTTPException:
+        raise
+    except ExecutorSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        logger.error("Batch simulation failed", error=str(e))
+        raise HTTPException(status_code=500, detail="Batch simulation failed")
+
+
+@router.post("/simulate/contingency", response_model=ContingencyResult)
+async def run_contingency_sweep(
+    request: ContingencyRequest,
+    token: str = Depends(security)
+):
+    """Evaluate every single (N-1) or double (N-2) link failure."""
+    _authenticate(token)
+    try:
+        simulator = get_simulator()
+        return await simulator.simulate_contingency(request)
+        
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ExecutorSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        logger.error("Contingency sweep failed", error=str(e))
+        raise HTTPException(status_code=500, detail="Contingency sweep failed")
+
+
+@router.post("/simulate/srlg", response_model=SRLGSweepResult)
+async def run_srlg_sweep(
+    request: SRLGSweepRequest,
+    token: str = Depends(security)
+):
+    """Evaluate the failure of every shared-risk link group."""
+    _authenticate(token)
+    try:
+        simulator = get_simulator()
+        return await simulator.simulate_srlg_sweep(request)
+        
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ExecutorSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        logger.error("SRLG sweep failed", error=str(e))
+        raise HTTPException(status_code=500, detail="SRLG sweep failed")
+
+
+@router.post("/simulate/optimize-links", response_model=LinkOptimizationResult)
+async def optimize_link_additions(
+    request: LinkOptimizationRequest,
+    token: str = Depends(security)
+):
+    """Find the candidate link additions that best improve the network."""
+    _authenticate(token)
+    try:
+        simulator = get_simulator()
+        return await simulator.optimize_links(request)
+        
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ExecutorSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        logger.error("Link optimization failed", error=str(e))
+        raise HTTPException(status_code=500, detail="Link optimization failed")
+
+
+@router.post("/simulate/replay", response_model=ReplayResult)
+async def run_historical_replay(
+    request: ReplayRequest,
+    token: str = Depends(security)
+):
+    """Evaluate a change against every 5-minute interval of recent history."""
+    _authenticate(token)
+    try:
+        simulator = get_simulator()
+        return await simulator.simulate_replay(request)
+        
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ExecutorSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        logger.error("Historical replay failed", error=str(e))
+        raise HTTPException(status_code=500, detail="Historical replay failed")
+
+
 @router.get("/simulation/{simulation_id}/results", response_model=Optional[SimulationResult])
 async def get_simulation_results(
     simulation_id: str,
@@ -44,7 +198,7 @@ async def get_simulation_results(
         # Verify authentication
         verify_token(token.credentials)
         
-        simulator = NetworkSimulator()
+        simulator = get_simulator()
         result = await simulator.get_simulation_result(simulation_id)
         
         if not result:
@@ -61,10 +215,53 @@ async def get_simulation_results(
         raise HTTPException(status_code=500, detail="Failed to retrieve results")
 
 
+@router.get("/simulation/{simulation_id}/stream")
+async def stream_simulation(
+    simulation_id: str,
+    token: str = Depends(security)
+):
+    """Stream simulation progress as Server-Sent Events."""
+    try:
+        # Verify authentication
+        verify_token(token.credentials)
+        
+        simulator = get_simulator()
+        if not await simulator.get_simulation_result(simulation_id):
+            raise HTTPException(status_code=404, detail="Simulation not found")
+        
+        return StreamingResponse(
+            _server_sent_events(simulator.watch(simulation_id)),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+        
+    except ValueError as e:
+        raise HTTPException(status_code=401, detail=str(e))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Failed to stream simulation progress", error=str(e))
+        raise HTTPException(status_code=500, detail="Failed to stream progress")
+
+
+async def _server_sent_events(
+    events: AsyncIterator[Optional[SimulationProgress]]
+) -> AsyncIterator[str]:
+    """Format progress events as an SSE stream with keep-alive comments."""
+    async for event in events:
+        if event is None:
+            yield ": keep-alive\n\n"
+        else:
+            yield f"event: {event.stage}\ndata: {event.model_dump_json()}\n\n"
+
+
 @router.get("/simulations")
 async def list_simulations(
     limit: int = 10,
     offset: int = 0,
+    action: Optional[SimulationAction] = None,
+    risk_level: Optional[str] = None,
+    status: Optional[SimulationStatus] = None,
     token: str = Depends(security)
 ):
     """List recent simulations."""
@@ -72,21 +269,64 @@ async def list_simulations(
         # Verify authentication
         verify_token(token.credentials)
         
-        # TODO: Implement pagination and filtering
+        if not 1 <= limit <= 100 or offset < 0:
+            raise HTTPException(
+                status_code=400,
+                detail="limit must be 1-100 and offset non-negative"
+            )
+        
+        simulator = get_simulator()
+        simulations, total = await simulator.history.page(
+            limit=limit,
+            offset=offset,
+            action=action,
+            risk_level=risk_level,
+            status=status
+        )
+        
         return {
-            "simulations": [],
-            "total": 0,
+            "simulations": simulations,
+            "total": total,
             "limit": limit,
             "offset": offset
         }
         
     except ValueError as e:
         raise HTTPException(status_code=401, detail=str(e))
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error("Failed to list simulations", error=str(e))
         raise HTTPException(status_code=500, detail="Failed to list simulations")
 
 
+@router.get("/criticality", response_model=CriticalityReport)
+async def get_criticality(
+    limit: int = 20,
+    token: str = Depends(security)
+):
+    """Most critical links and nodes of the current topology."""
+    try:
+        # Verify authentication
+        verify_token(token.credentials)
+        
+        if not 1 <= limit <= 1000:
+            raise HTTPException(status_code=400, detail="limit must be 1-1000")
+        
+        simulator = get_simulator()
+        return await simulator.get_criticality(limit)
+        
+    except ValueError as e:
+        raise HTTPException(status_code=401, detail=str(e))
+    except HTTPException:
+        raise
+    except ExecutorSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        logger.error("Failed to get criticality", error=str(e))
+        raise HTTPException(status_code=500, detail="Failed to get criticality")
+
+
 @router.delete("/simulation/{simulation_id}")
 async def cancel_simulation(
     simulation_id: str,
@@ -97,11 +337,30 @@ async def cancel_simulation(
         # Verify authentication
         verify_token(token.credentials)
         
-        # TODO: Implement simulation cancellation
-        return {"message": "Simulation cancelled", "simulation_id": simulation_id}
+        result = await get_job_queue().cancel(simulation_id)
+        if not result:
+            raise HTTPException(status_code=404, detail="Simulation not found")
+        
+        if result.status in (SimulationStatus.COMPLETED, SimulationStatus.FAILED):
+            raise HTTPException(
+                status_code=409,
+                detail=f"Simulation already {result.status.value}"
+            )
+        
+        return {
+            "message": (
+                "Simulation cancelled"
+                if result.status == SimulationStatus.CANCELLED
+                else "Cancellation requested"
+            ),
+            "simulation_id": simulation_id,
+            "status": result.status.value
+        }
         
     except ValueError as e:
         raise HTTPException(status_code=401, detail=str(e))
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error("Failed to cancel simulation", error=str(e))
         raise HTTPException(status_code=500, detail="Failed to cancel simulation")
\ No newline at end of file
@@ -44,6 +44,28 @@ class Settings(BaseSettings):
     # Simulation settings
     MAX_SIMULATION_TIME: int = 300  # seconds
     SIMULATION_CACHE_TTL: int = 3600  # seconds
+    RESULT_CODEC: str = "orjson"  # "json", "orjson" or "msgpack"
+    RESULT_COMPRESSION_THRESHOLD: int = 4096  # bytes; 0 disables zstd
+    BASELINE_CACHE_SIZE: int = 4  # topology versions kept in memory
+    RESULT_CACHE_SIZE: int = 1024  # memoized analyses kept in memory
+    TOPOLOGY_SNAPSHOT_DIR: str = "/tmp/nettwin/topology"  # empty to disable
+    MAX_BATCH_SIZE: int = 200  # scenarios per batch request
+    BATCH_WORKERS: int = 4  # parallel pieces per batch evaluation; 1 runs inline
+    ANALYSIS_EXECUTOR: str = "thread"  # "thread" or "process"
+    ANALYSIS_WORKERS: int = 4  # concurrent graph-analysis jobs
+    ANALYSIS_QUEUE_SIZE: int = 64  # jobs waiting before rejecting new ones
+    POOL_WORKERS: int = 4  # processes of the shared compute pool
+    POOL_START_METHOD: str = "forkserver"  # "forkserver" or "spawn"
+    JOB_QUEUE_BACKEND: str = "redis"  # "redis" stream or in-process "memory"
+    JOB_WORKERS: int = 2  # concurrent asynchronous simulation jobs
+    JOB_STREAM_MAXLEN: int = 10000  # approximate cap on queued job entries
+    JOB_CLAIM_IDLE: int = 600  # seconds unacked before reclaim; above MAX_SIMULATION_TIME
+    JOB_RECLAIM_INTERVAL: int = 60  # seconds between scans for abandoned jobs
+    PROGRESS_HEARTBEAT: int = 15  # seconds between idle progress stream pings
+    LINK_PERFORMANCE_MODEL: str = "threshold"  # "threshold", "mm1", "md1" or "mm1k"
+    LINK_BUFFER_PACKETS: int = 64  # queue depth of the "mm1k" model
+    CRITICALITY_WORKERS: int = 4  # worker processes for betweenness
+    CRITICALITY_MAX_SOURCES: int = 1000  # betweenness sources sampled beyond this; 0 for exact
     
     class Config:
         env_file = ".env"
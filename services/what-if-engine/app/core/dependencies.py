@@ -33,6 +33,9 @@ def get_database_connections() -> Dict[str, Any]:
             decode_responses=True
         )
         connections["redis"] = redis_client
+        
+        # Undecoded client for binary-encoded payloads
+        connections["redis_binary"] = redis.from_url(settings.REDIS_URL)
         logger.info("Redis connection established")
         
         # ClickHouse connection
@@ -63,6 +66,11 @@ def get_redis_client():
     return get_database_connections()["redis"]
 
 
+def get_binary_redis_client():
+    """Get Redis client that returns raw bytes."""
+    return get_database_connections()["redis_binary"]
+
+
 def get_clickhouse_client():
     """Get ClickHouse client."""
     return get_database_connections()["clickhouse"]
\ No newline at end of file
@@ -21,7 +21,7 @@ def setup_logging():
         processors=[
             structlog.processors.TimeStamper(fmt="iso"),
             structlog.stdlib.add_log_level,
-            structlog.processors.add_logger_name,
+            structlog.stdlib.add_logger_name,
             structlog.dev.ConsoleRenderer() if settings.DEBUG 
             else structlog.processors.JSONRenderer(),
         ],
@@ -39,8 +39,7 @@ def log_simulation_event(
     """Log structured simulation events."""
     logger = structlog.get_logger()
     logger.info(
-        "simulation_event",
-        event=event,
+        event,
         simulation_id=simulation_id,
         **kwargs
     )
\ No newline at end of file
@@ -1,13 +1,18 @@
+import asyncio
 import logging
 import structlog
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 
 from app.core.config import settings
 from app.core.logging import setup_logging
 from app.api.v1.router import api_router
 from app.core.dependencies import get_database_connections
+from app.services.executor import shutdown_executor
+from app.services.job_queue import get_job_queue, shutdown_job_queue
+from app.services.simulation_engine import get_simulator
 
 
 # Setup structured logging
@@ -28,9 +33,30 @@ async def lifespan(app: FastAPI):
         logger.error("Failed to initialize database connections", error=str(e))
         raise
     
+    # Shared simulator: warm topology and baseline, refreshed on change events
+    simulator = get_simulator()
+    try:
+        await simulator.warm_up()
+    except Exception as e:
+        logger.warning("Simulator warm-up failed", error=str(e))
+    topology_listener = asyncio.create_task(
+        simulator.listen_for_topology_events()
+    )
+    
+    # Consume queued jobs and reclaim those of dead replicas right away,
+    # not only after this replica's first submission
+    try:
+        await get_job_queue().start()
+    except Exception as e:
+        logger.warning("Simulation job workers failed to start", error=str(e))
+    
     yield
     
     logger.info("Shutting down NetTwinSaaS What-If Engine")
+    topology_listener.cancel()
+    await asyncio.gather(topology_listener, return_exceptions=True)
+    await shutdown_job_queue()
+    shutdown_executor()
 
 
 app = FastAPI(
@@ -109,6 +135,12 @@ async def health_check():
         )
 
 
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics endpoint."""
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
 @app.get("/")
 async def root():
     """Root endpoint."""
@@ -13,6 +13,8 @@ class SimulationAction(str, Enum):
     ADD_NODE = "add_node"
     REMOVE_NODE = "remove_node"
     CHANGE_QOS = "change_qos"
+    AVAILABILITY = "availability"
+    FAIL_SRLG = "fail_srlg"  # parameters["srlg"]: shared-risk link group
 
 
 class SimulationStatus(str, Enum):
@@ -24,6 +26,26 @@ class SimulationStatus(str, Enum):
     CANCELLED = "cancelled"
 
 
+class TrafficDemand(BaseModel):
+    """Traffic demand between two nodes (Mbps)."""
+    src: str
+    dst: str
+    volume: float = Field(..., ge=0)
+
+
+class ScenarioStep(BaseModel):
+    """One change of a multi-step scenario."""
+    action: SimulationAction
+    src: Optional[str] = None
+    dst: Optional[str] = None
+    capacity: Optional[int] = None
+    latency: Optional[float] = None
+    cost: Optional[int] = None
+    node_id: Optional[str] = None
+    qos_class: Optional[str] = None
+    parameters: Optional[Dict[str, Any]] = Field(default_factory=dict)
+
+
 class SimulationRequest(BaseModel):
     """Simulation request model."""
     action: SimulationAction
@@ -35,6 +57,8 @@ class SimulationRequest(BaseModel):
     node_id: Optional[str] = None
     qos_class: Optional[str] = None
     parameters: Optional[Dict[str, Any]] = Field(default_factory=dict)
+    traffic_matrix: Optional[List[TrafficDemand]] = None
+    steps: Optional[List[ScenarioStep]] = None  # applied in order after this action
     
     class Config:
         json_encoders = {
@@ -42,6 +66,19 @@ class SimulationRequest(BaseModel):
         }
 
 
+class StepImpact(BaseModel):
+    """Impact of one scenario step relative to the step before it."""
+    step: int
+    action: SimulationAction
+    target: str = ""
+    latency_increase: float = 0.0  # change from the previous step
+    cumulative_latency_increase: float = 0.0  # change from the baseline
+    disconnected_pairs: int = 0  # baseline-reachable node pairs cut off
+    congested_links: List[str] = Field(default_factory=list)
+    new_congested_links: List[str] = Field(default_factory=list)
+    risk_level: str = "low"
+
+
 class ImpactAnalysis(BaseModel):
     """Impact analysis results."""
     affected_paths: List[str] = Field(default_factory=list)
@@ -51,6 +88,17 @@ class ImpactAnalysis(BaseModel):
     redundancy_impact: str = "none"
     risk_level: str = "low"
     recommendations: List[str] = Field(default_factory=list)
+    unrouted_traffic: Optional[float] = None
+    availability: Optional[float] = None  # mean fraction of connected pairs kept
+    availability_interval: Optional[List[float]] = None  # 95% confidence bounds
+    expected_lost_traffic: Optional[float] = None
+    failure_trials: Optional[int] = None
+    steps: Optional[List[StepImpact]] = None  # per-step deltas of multi-step scenarios
+    latency_interval: Optional[List[float]] = None  # 95% bounds of a sampled latency_increase
+    affected_pair_fraction: Optional[float] = None  # sampled share of pairs with changed paths
+    affected_pair_interval: Optional[List[float]] = None  # 95% confidence bounds
+    sampled_sources: Optional[int] = None  # sources evaluated in approximate mode
+    disconnected_groups: List[List[str]] = Field(default_factory=list)  # nodes cut off by the change
 
 
 class SimulationResult(BaseModel):
@@ -60,6 +108,7 @@ class SimulationResult(BaseModel):
     request: SimulationRequest
     impact_analysis: Optional[ImpactAnalysis] = None
     execution_time: Optional[float] = None
+    stage_timings: Dict[str, float] = Field(default_factory=dict)  # seconds per stage
     error_message: Optional[str] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
     completed_at: Optional[datetime] = None
@@ -72,6 +121,189 @@ class SimulationResult(BaseModel):
         }
 
 
+class SimulationProgress(BaseModel):
+    """Progress event streamed while a simulation runs."""
+    simulation_id: str
+    stage: str  # "load", "apply", "analyze" or the final status
+    status: SimulationStatus = SimulationStatus.RUNNING
+    impact_analysis: Optional[Dict[str, Any]] = None  # partial ImpactAnalysis fields
+    result: Optional[SimulationResult] = None  # set on the final event
+    timestamp: datetime = Field(default_factory=datetime.utcnow)
+
+
+class BatchSimulationRequest(BaseModel):
+    """Batch of simulation requests evaluated against one baseline."""
+    scenarios: List[SimulationRequest] = Field(..., min_length=1)
+
+
+class ScenarioRanking(BaseModel):
+    """Position of one scenario in a batch ranking."""
+    rank: int
+    index: int
+    simulation_id: str
+    status: SimulationStatus
+    risk_level: Optional[str] = None
+    latency_increase: Optional[float] = None
+
+
+class BatchSimulationResult(BaseModel):
+    """Batch simulation results with scenarios ranked by risk and latency."""
+    batch_id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    results: List[SimulationResult] = Field(default_factory=list)
+    ranking: List[ScenarioRanking] = Field(default_factory=list)
+    execution_time: Optional[float] = None
+
+
+class ContingencyRequest(BaseModel):
+    """N-1 / N-2 link failure sweep request."""
+    order: int = Field(1, ge=1, le=2)
+    links: Optional[List[str]] = None  # "src-dst" labels; all links if empty
+    max_scenarios: int = Field(10000, ge=1)
+
+
+class FailureImpact(BaseModel):
+    """Impact of one failure scenario in a contingency sweep."""
+    failed_links: List[str]
+    srlg: Optional[str] = None  # shared-risk link group that failed
+    disconnected: bool = False
+    connectivity_loss: float = 0.0  # fraction of node pairs that lose reachability
+    latency_increase: float = 0.0
+    congested_links: List[str] = Field(default_factory=list)
+    packet_loss: float = 0.0
+    risk_level: str = "low"
+
+
+class ContingencyResult(BaseModel):
+    """Contingency sweep results, most severe failures first."""
+    sweep_id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    order: int = 1
+    scenarios_evaluated: int = 0
+    truncated: bool = False
+    partitioning_failures: int = 0
+    failures: List[FailureImpact] = Field(default_factory=list)
+    execution_time: Optional[float] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class SRLGSweepRequest(BaseModel):
+    """Failure sweep over shared-risk link groups (SRLGs)."""
+    groups: Optional[List[str]] = None  # all groups if empty
+    max_scenarios: int = Field(10000, ge=1)
+
+
+class SRLGSweepResult(BaseModel):
+    """SRLG failure sweep results, most severe failures first."""
+    sweep_id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    groups_evaluated: int = 0
+    truncated: bool = False
+    partitioning_failures: int = 0
+    failures: List[FailureImpact] = Field(default_factory=list)
+    execution_time: Optional[float] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class OptimizationObjective(str, Enum):
+    LATENCY = "latency"
+    PEAK_UTILIZATION = "peak_utilization"
+
+
+class LinkCandidate(BaseModel):
+    """Node pair a new link may be added between."""
+    src: str
+    dst: str
+    latency: Optional[float] = None
+    cost: Optional[int] = None  # OSPF cost of the new link
+    price: float = Field(1.0, gt=0)  # charged against the budget
+
+
+class LinkOptimizationRequest(BaseModel):
+    """Search for the link additions that best improve an objective."""
+    candidates: List[LinkCandidate] = Field(..., min_length=1)
+    capacity: int = Field(1000, gt=0)
+    budget: float = Field(..., gt=0)
+    max_links: int = Field(1, ge=1, le=10)
+    objective: OptimizationObjective = OptimizationObjective.LATENCY
+    traffic_matrix: Optional[List[TrafficDemand]] = None  # routed for peak_utilization
+    max_evaluations: int = Field(10000, ge=1)  # objective evaluations before the search stops
+
+
+class LinkAddition(BaseModel):
+    """One selected link, in the order it was added."""
+    src: str
+    dst: str
+    price: float
+    improvement: float = 0.0  # objective reduction on top of the links before it
+
+
+class LinkOptimizationResult(BaseModel):
+    """Best link additions found within the budget."""
+    optimization_id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    objective: OptimizationObjective = OptimizationObjective.LATENCY
+    links: List[LinkAddition] = Field(default_factory=list)
+    baseline_value: float = 0.0
+    optimized_value: float = 0.0
+    greedy_value: float = 0.0  # value of the greedy starting solution
+    total_price: float = 0.0
+    optimal: bool = False  # the search finished within max_evaluations
+    evaluations: int = 0
+    pruned: int = 0  # subtrees cut by the bound
+    execution_time: Optional[float] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class ElementCriticality(BaseModel):
+    """Criticality of one link or node."""
+    element: str  # "src-dst" label for links, node id for nodes
+    score: float = 0.0
+    betweenness: float = 0.0  # share of node pairs routed over the element
+    shortest_paths: float = 0.0  # node pairs routed over it, split across equal-cost paths
+    cut: bool = False  # bridge or articulation point
+    load: float = 0.0  # utilization, the busiest attached link for nodes
+
+
+class CriticalityReport(BaseModel):
+    """Most critical links and nodes of the current topology."""
+    topology_version: str
+    links: List[ElementCriticality] = Field(default_factory=list)
+    nodes: List[ElementCriticality] = Field(default_factory=list)
+    computation_time: Optional[float] = None
+
+
+class ReplayRequest(BaseModel):
+    """Replay of a change against historical interface utilization."""
+    scenario: SimulationRequest
+    days: int = Field(7, ge=1, le=90)
+    percentile: float = Field(95.0, gt=0, le=100)
+
+
+class LinkCongestion(BaseModel):
+    """Utilization of one link across the replayed intervals."""
+    link: str
+    peak_utilization: float = 0.0
+    percentile_utilization: float = 0.0
+    baseline_peak_utilization: float = 0.0
+    congested_intervals: int = 0
+
+
+class ReplayResult(BaseModel):
+    """Congestion of a change over every replayed interval."""
+    replay_id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    intervals: int = 0
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+    peak_utilization: float = 0.0  # busiest link in the busiest interval
+    percentile_utilization: float = 0.0  # percentile of per-interval peaks
+    baseline_peak_utilization: float = 0.0
+    baseline_percentile_utilization: float = 0.0
+    congested_intervals: int = 0  # intervals with any link above 80%
+    baseline_congested_intervals: int = 0
+    busiest_interval: Optional[datetime] = None
+    peak_unrouted_traffic: float = 0.0  # Mbps with no path after the change
+    links: List[LinkCongestion] = Field(default_factory=list)
+    execution_time: Optional[float] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
 class NetworkMetrics(BaseModel):
     """Network metrics model."""
     total_nodes: int = 0
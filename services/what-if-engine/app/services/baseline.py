@@ -0,0 +1,85 @@
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+from scipy.sparse.csgraph import shortest_path
+
+from app.models.simulation import TrafficDemand
+from app.services.connectivity_index import ConnectivityIndex
+from app.services.criticality import CriticalityIndex
+from app.services.graph_core import CompactTopology
+from app.services.link_models import LinkPerformanceModel
+from app.services.shortest_paths import IncrementalShortestPaths
+from app.services.traffic import TrafficModel, demand_key
+
+# Demand matrices kept routed per baseline
+TRAFFIC_MODEL_CACHE_SIZE = 4
+
+
+class BaselineAnalysis:
+    """Precomputed metrics of the unmodified network for one topology version.
+
+    Everything here depends only on the topology, so it is computed once per
+    version and shared by every what-if request against that version.
+    """
+
+    def __init__(
+        self,
+        topology: CompactTopology,
+        link_model: Optional[LinkPerformanceModel] = None,
+        criticality_workers: int = 1,
+        criticality_sources: int = 0
+    ):
+        self.topology = topology
+        self.version = topology.fingerprint()
+        self.created_at = time.time()
+
+        # Connectivity, with bridges and articulation points for answering
+        # single removals without a traversal
+        self.connectivity = ConnectivityIndex(topology)
+        self.connected = self.connectivity.connected
+
+        # Latency-weighted all-pairs distances (incremental update base),
+        # including queueing delay when a link model is given
+        self.latency_paths = IncrementalShortestPaths(
+            topology, weight="latency", link_model=link_model
+        )
+
+        # Link and node criticality for risk assessment and ranking
+        self.criticality = CriticalityIndex(
+            topology, self.connectivity, self.latency_paths.weights,
+            criticality_workers, criticality_sources
+        )
+
+        # Hop-count shortest-path trees used for affected-path detection
+        if topology.node_count:
+            self.hops, self.predecessors = shortest_path(
+                topology.weight_matrix(), directed=False,
+                unweighted=True, return_predecessors=True
+            )
+        else:
+            self.hops = np.zeros((0, 0))
+            self.predecessors = np.zeros((0, 0), dtype=np.int32)
+
+        self._cost_paths: Optional[IncrementalShortestPaths] = None
+        self._traffic_models: Dict[str, TrafficModel] = {}
+
+    @property
+    def cost_paths(self) -> IncrementalShortestPaths:
+        """Cost-weighted all-pairs distances (built on first use)."""
+        if self._cost_paths is None:
+            self._cost_paths = IncrementalShortestPaths(
+                self.topology, weight="cost"
+            )
+        return self._cost_paths
+
+    def traffic_model(self, demands: List[TrafficDemand]) -> TrafficModel:
+        """Return the routed baseline for a demand matrix."""
+        key = demand_key(demands)
+        model = self._traffic_models.get(key)
+        if model is None:
+            model = TrafficModel(self.topology, demands, self.cost_paths)
+            if len(self._traffic_models) >= TRAFFIC_MODEL_CACHE_SIZE:
+                self._traffic_models.pop(next(iter(self._traffic_models)))
+            self._traffic_models[key] = model
+        return model
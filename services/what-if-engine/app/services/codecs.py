@@ -0,0 +1,157 @@
+import json
+from abc import ABC, abstractmethod
+from typing import Dict, Optional, Type, TypeVar, Union
+
+import structlog
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+logger = structlog.get_logger()
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+# Leading format byte of encoded payloads. Plain JSON is written without a
+# prefix so payloads stored before the codec layer still decode.
+FORMAT_ORJSON = 0x01
+FORMAT_MSGPACK = 0x02
+FLAG_ZSTD = 0x80
+
+
+class Codec(ABC):
+    """Serializer for one wire format."""
+
+    name = ""
+    format_id: Optional[int] = None
+
+    @abstractmethod
+    def dumps(self, model: BaseModel) -> bytes:
+        """Encode a model in this format."""
+
+    @abstractmethod
+    def loads(self, payload: bytes, model_type: Type[ModelT]) -> ModelT:
+        """Decode a payload of this format into ``model_type``."""
+
+
+class JsonCodec(Codec):
+    """Standard-library JSON, the original storage format."""
+
+    name = "json"
+
+    def dumps(self, model: BaseModel) -> bytes:
+        return json.dumps(model.model_dump(mode="json")).encode()
+
+    def loads(self, payload: bytes, model_type: Type[ModelT]) -> ModelT:
+        return model_type.model_validate(json.loads(payload))
+
+
+class OrjsonCodec(Codec):
+    """orjson serialization of the Python-mode dump."""
+
+    name = "orjson"
+    format_id = FORMAT_ORJSON
+
+    def dumps(self, model: BaseModel) -> bytes:
+        return orjson.dumps(model.model_dump())
+
+    def loads(self, payload: bytes, model_type: Type[ModelT]) -> ModelT:
+        return model_type.model_validate(orjson.loads(payload))
+
+
+class MsgpackCodec(Codec):
+    """MessagePack serialization of the JSON-mode dump."""
+
+    name = "msgpack"
+    format_id = FORMAT_MSGPACK
+
+    def dumps(self, model: BaseModel) -> bytes:
+        return msgpack.packb(model.model_dump(mode="json"))
+
+    def loads(self, payload: bytes, model_type: Type[ModelT]) -> ModelT:
+        return model_type.model_validate(msgpack.unpackb(payload))
+
+
+CODECS: Dict[str, Codec] = {"json": JsonCodec()}
+if orjson is not None:
+    CODECS["orjson"] = OrjsonCodec()
+if msgpack is not None:
+    CODECS["msgpack"] = MsgpackCodec()
+
+_BY_FORMAT = {
+    codec.format_id: codec for codec in CODECS.values()
+    if codec.format_id is not None
+}
+
+
+class PayloadCodec:
+    """Encodes models with a chosen codec and optional zstd compression.
+
+    Payloads are self-describing: a leading format byte (absent for plain
+    JSON) names the codec and whether the body is compressed, so any
+    reader decodes entries written under any configuration.
+    """
+
+    def __init__(self, codec: str = "json", compression_threshold: int = 0):
+        if codec not in CODECS:
+            logger.warning(
+                "Result codec unavailable, falling back to json", codec=codec
+            )
+            codec = "json"
+        self.codec = CODECS[codec]
+        self.compression_threshold = compression_threshold
+        self._compressor = None
+        self._decompressor = None
+
+    def encode(self, model: BaseModel) -> bytes:
+        """Serialize a model, compressing bodies above the threshold."""
+        body = self.codec.dumps(model)
+        format_id = self.codec.format_id or 0
+
+        if (zstandard is not None and self.compression_threshold > 0
+                and len(body) >= self.compression_threshold):
+            if self._compressor is None:
+                self._compressor = zstandard.ZstdCompressor(level=3)
+            return bytes([format_id | FLAG_ZSTD]) + self._compressor.compress(body)
+
+        if self.codec.format_id is None:
+            return body
+        return bytes([format_id]) + body
+
+    def decode(self, payload: Union[bytes, str], model_type: Type[ModelT]) -> ModelT:
+        """Deserialize a payload written by any codec."""
+        if isinstance(payload, str):
+            payload = payload.encode()
+
+        header = payload[0]
+        if header >= FLAG_ZSTD:
+            if zstandard is None:
+                raise ValueError("Compressed payload requires zstandard")
+            if self._decompressor is None:
+                self._decompressor = zstandard.ZstdDecompressor()
+            body = self._decompressor.decompress(payload[1:])
+            format_id = header & ~FLAG_ZSTD
+        elif header in _BY_FORMAT:
+            body = payload[1:]
+            format_id = header
+        else:
+            return CODECS["json"].loads(payload, model_type)
+
+        if format_id == 0:
+            return CODECS["json"].loads(body, model_type)
+        codec = _BY_FORMAT.get(format_id)
+        if codec is None:
+            raise ValueError(f"Unsupported payload format: {format_id}")
+        return codec.loads(body, model_type)
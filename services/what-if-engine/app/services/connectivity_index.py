@@ -0,0 +1,200 @@
+from typing import List, Optional
+
+import numpy as np
+
+from app.services.graph_core import CompactTopology
+
+
+class ConnectivityIndex:
+    """Bridges, articulation points and DFS subtrees of one topology.
+
+    Built with a single iterative Tarjan pass. Nodes are numbered in DFS
+    preorder, so every component and every DFS subtree is a contiguous
+    slice of ``order``: the groups cut off by removing a bridge or an
+    articulation point are read from those slices without traversing the
+    graph again.
+    """
+
+    def __init__(
+        self,
+        topology: CompactTopology,
+        edge_active: Optional[np.ndarray] = None
+    ):
+        self.topology = topology
+        node_count = topology.node_count
+        if edge_active is None:
+            edge_active = np.ones(topology.edge_count, dtype=bool)
+        self.edge_active = edge_active
+
+        # Preorder position, lowest reachable preorder and subtree end
+        self.tin = np.full(node_count, -1, dtype=np.int64)
+        self.tout = np.full(node_count, -1, dtype=np.int64)
+        self.labels = np.full(node_count, -1, dtype=np.int64)
+        self.order = np.empty(0, dtype=np.int64)
+        self.is_bridge = np.zeros(topology.edge_count, dtype=bool)
+        self.is_articulation = np.zeros(node_count, dtype=bool)
+        # Deeper endpoint of each tree link, -1 for non-tree links
+        self.child = np.full(topology.edge_count, -1, dtype=np.int64)
+        self._low = np.zeros(node_count, dtype=np.int64)
+        self._parent = np.full(node_count, -1, dtype=np.int64)
+        self._roots: List[int] = []
+
+        self._search()
+        self.component_sizes = np.bincount(
+            self.labels[self.labels >= 0], minlength=len(self._roots)
+        )
+
+    @property
+    def connected(self) -> bool:
+        """Whether all active nodes form one component."""
+        return len(self._roots) == 1
+
+    @property
+    def bridges(self) -> np.ndarray:
+        return np.flatnonzero(self.is_bridge)
+
+    @property
+    def articulation_points(self) -> np.ndarray:
+        return np.flatnonzero(self.is_articulation)
+
+    @property
+    def reachable_pairs(self) -> int:
+        """Ordered pairs of active nodes that can reach each other."""
+        sizes = self.component_sizes
+        return int((sizes * (sizes - 1)).sum())
+
+    def subtree(self, node: int) -> np.ndarray:
+        """Nodes in the DFS subtree of ``node``."""
+        return self.order[self.tin[node]:self.tout[node] + 1]
+
+    def groups_without_link(self, edge_id: int) -> List[np.ndarray]:
+        """Nodes cut off from their component when a link is removed.
+
+        Empty unless the link is a bridge; otherwise the smaller of the
+        two sides.
+        """
+        if not self.is_bridge[edge_id]:
+            return []
+        child = self.child[edge_id]
+        side = self.subtree(child)
+        rest = self._remainder(child, [child])
+        return [side if side.size <= rest.size else rest]
+
+    def groups_without_node(self, node: int) -> List[np.ndarray]:
+        """Groups split off a component when a node is removed.
+
+        Empty unless the node is an articulation point; otherwise every
+        remaining piece except the largest.
+        """
+        if not self.is_articulation[node]:
+            return []
+        cut = [
+            child for child in self._children(node)
+            if self._low[child] >= self.tin[node]
+        ]
+        pieces = [self.subtree(child) for child in cut]
+        pieces.append(self._remainder(node, cut, without=node))
+        pieces.sort(key=len, reverse=True)
+        return [piece for piece in pieces[1:] if piece.size]
+
+    def lost_pairs_without_link(self, edge_id: int) -> int:
+        """Ordered pairs that stop reaching each other without a link."""
+        if not self.is_bridge[edge_id]:
+            return 0
+        child = self.child[edge_id]
+        side = int(self.tout[child] - self.tin[child] + 1)
+        rest = int(self.component_sizes[self.labels[child]]) - side
+        return 2 * side * rest
+
+    def _remainder(
+        self,
+        node: int,
+        subtrees: List[int],
+        without: Optional[int] = None
+    ) -> np.ndarray:
+        """Nodes of ``node``'s component outside the given DFS subtrees."""
+        root = self._roots[self.labels[node]]
+        start = self.tin[root]
+        keep = np.ones(self.tout[root] - start + 1, dtype=bool)
+        for child in subtrees:
+            keep[self.tin[child] - start:self.tout[child] - start + 1] = False
+        if without is not None:
+            keep[self.tin[without] - start] = False
+        return self.subtree(root)[keep]
+
+    def _children(self, node: int) -> np.ndarray:
+        neighbors, _ = self.topology.incident_edges(node)
+        return np.unique(neighbors[self._parent[neighbors] == node])
+
+    def _search(self):
+        """Iterative Tarjan DFS over active nodes and links."""
+        topology = self.topology
+        indptr = topology.indptr.tolist()
+        indices = topology.indices.tolist()
+        edge_ids = topology.edge_ids.tolist()
+        edge_active = self.edge_active.tolist()
+        active_nodes = topology.active_nodes.tolist()
+
+        tin = [-1] * topology.node_count
+        low = [0] * topology.node_count
+        parent = [-1] * topology.node_count
+        parent_edge = [-1] * topology.node_count
+        order: List[int] = []
+        tout = self.tout
+        labels = self.labels
+        is_bridge = self.is_bridge
+        is_articulation = self.is_articulation
+        child_of = self.child
+
+        for root in range(topology.node_count):
+            if tin[root] >= 0 or not active_nodes[root]:
+                continue
+            component = len(self._roots)
+            self._roots.append(root)
+            root_children = 0
+
+            tin[root] = low[root] = len(order)
+            order.append(root)
+            stack = [(root, indptr[root])]
+            while stack:
+                node, position = stack[-1]
+                if position < indptr[node + 1]:
+                    stack[-1] = (node, position + 1)
+                    edge = edge_ids[position]
+                    if not edge_active[edge] or edge == parent_edge[node]:
+                        continue
+                    neighbor = indices[position]
+                    if tin[neighbor] < 0:
+                        tin[neighbor] = low[neighbor] = len(order)
+                        order.append(neighbor)
+                        parent[neighbor] = node
+                        parent_edge[neighbor] = edge
+                        child_of[edge] = neighbor
+                        if node == root:
+                            root_children += 1
+                        stack.append((neighbor, indptr[neighbor]))
+                    elif tin[neighbor] < low[node]:
+                        low[node] = tin[neighbor]
+                    continue
+
+                # Subtree finished: propagate low and classify the tree link
+                stack.pop()
+                tout[node] = len(order) - 1
+                labels[node] = component
+                above = parent[node]
+                if above < 0:
+                    continue
+                if low[node] < low[above]:
+                    low[above] = low[node]
+                if low[node] > tin[above]:
+                    is_bridge[parent_edge[node]] = True
+                if above != root and low[node] >= tin[above]:
+                    is_articulation[above] = True
+
+            if root_children > 1:
+                is_articulation[root] = True
+
+        self.order = np.asarray(order, dtype=np.int64)
+        self.tin = np.asarray(tin, dtype=np.int64)
+        self._low = np.asarray(low, dtype=np.int64)
+        self._parent = np.asarray(parent, dtype=np.int64)
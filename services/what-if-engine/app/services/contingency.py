@@ -0,0 +1,267 @@
+import itertools
+import time
+from math import comb
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.csgraph import connected_components, dijkstra
+import structlog
+
+from app.models.simulation import (
+    ContingencyRequest, ContingencyResult, FailureImpact, SRLGSweepRequest,
+    SRLGSweepResult
+)
+from app.services.baseline import BaselineAnalysis
+from app.services.connectivity_index import ConnectivityIndex
+from app.services.impact_analyzer import ImpactAnalyzer
+
+logger = structlog.get_logger()
+
+
+class ContingencySweep:
+    """N-1 / N-2 link failure sweep against a cached baseline.
+
+    Each failure is a ``REMOVE_LINK`` of one or two links, but instead of a
+    full simulation per failure the sweep uses bridge detection for
+    partitions, the baseline shortest-path DAGs to find the few sources a
+    failure affects, and vectorized deltas over only those rows. Shared-risk
+    link groups are swept the same way, one group failure per scenario.
+    """
+
+    def __init__(self, baseline: BaselineAnalysis, analyzer: ImpactAnalyzer):
+        self.baseline = baseline
+        self.analyzer = analyzer
+        self.topology = baseline.topology
+        self.paths = baseline.latency_paths
+
+        self.connectivity = baseline.connectivity
+        self.bridges = set(self.connectivity.bridges.tolist())
+        self._bridges_without: Dict[int, Set[int]] = {}
+        self.reachable_pairs = self.connectivity.reachable_pairs
+
+    def run(self, request: ContingencyRequest) -> ContingencyResult:
+        """Evaluate every failure of the requested order."""
+        start_time = time.time()
+        candidates = self._candidate_edges(request.links)
+
+        scenarios = itertools.combinations(candidates, request.order)
+        total = comb(len(candidates), request.order)
+
+        failures = [
+            self.evaluate_failure(failed)
+            for failed in itertools.islice(scenarios, request.max_scenarios)
+        ]
+        self._rank(failures)
+
+        return ContingencyResult(
+            order=request.order,
+            scenarios_evaluated=len(failures),
+            truncated=total > request.max_scenarios,
+            partitioning_failures=sum(f.disconnected for f in failures),
+            failures=failures,
+            execution_time=time.time() - start_time
+        )
+
+    def run_groups(self, request: SRLGSweepRequest) -> SRLGSweepResult:
+        """Evaluate the failure of each shared-risk link group."""
+        start_time = time.time()
+        groups = self.topology.shared_risk_groups()
+        names = list(dict.fromkeys(request.groups or groups))
+        for name in names:
+            if name not in groups:
+                raise ValueError(f"Unknown SRLG: {name}")
+
+        failures = []
+        for name in names[:request.max_scenarios]:
+            impact = self.evaluate_failure(tuple(groups[name].tolist()))
+            impact.srlg = name
+            failures.append(impact)
+        self._rank(failures)
+
+        return SRLGSweepResult(
+            groups_evaluated=len(failures),
+            truncated=len(names) > request.max_scenarios,
+            partitioning_failures=sum(f.disconnected for f in failures),
+            failures=failures,
+            execution_time=time.time() - start_time
+        )
+
+    @staticmethod
+    def _rank(failures: List[FailureImpact]):
+        """Sort failures in place, partitions and the worst losses first."""
+        failures.sort(key=lambda f: (
+            not f.disconnected, -f.connectivity_loss,
+            -f.latency_increase, -len(f.congested_links)
+        ))
+
+    def evaluate_failure(self, failed: Tuple[int, ...]) -> FailureImpact:
+        """Evaluate the simultaneous failure of one or more links."""
+        topology = self.topology
+        keep = np.ones(topology.edge_count, dtype=bool)
+        keep[list(failed)] = False
+
+        matrix = sp.csr_matrix(
+            (self.paths.weights[keep], (topology.src[keep], topology.dst[keep])),
+            shape=(topology.node_count, topology.node_count)
+        )
+
+        # Partition check from bridges; a single cut bridge is sized from
+        # the DFS subtree, a traversal is only needed for two failures or
+        # for larger groups, which bridges alone cannot rule out
+        lost_pairs = 0
+        if len(failed) == 1:
+            lost_pairs = self.connectivity.lost_pairs_without_link(failed[0])
+        elif len(failed) > 2 or self._is_partitioning(failed):
+            _, labels = connected_components(matrix, directed=False)
+            lost_pairs = self.reachable_pairs - self._ordered_pairs(labels)
+
+        # Re-run Dijkstra only for sources whose DAG used a failed link;
+        # link endpoints are included to reroute the failed links' load
+        endpoints = np.concatenate([topology.src[list(failed)],
+                                    topology.dst[list(failed)]])
+        sources = np.union1d(self.paths.affected_sources(failed), endpoints)
+        rows, predecessors = dijkstra(
+            matrix, directed=False, indices=sources, return_predecessors=True
+        )
+        rows = np.atleast_2d(rows)
+        predecessors = np.atleast_2d(predecessors)
+
+        latency_increase = self._latency_delta(sources, rows, lost_pairs)
+        utilization = self._reroute_load(failed, keep, sources, predecessors)
+
+        congested = np.flatnonzero(keep & (utilization > 0.8))
+        congested_links = [topology.edge_name(e) for e in congested]
+        packet_loss = self.analyzer._packet_loss(utilization[keep])
+
+        modified_connected = self.baseline.connected and lost_pairs == 0
+        risk_level = self.analyzer._assess_risk_level(
+            self.baseline.connected, modified_connected,
+            packet_loss, congested_links,
+            float(self.baseline.criticality.link_scores[list(failed)].max())
+        )
+
+        return FailureImpact(
+            failed_links=[topology.edge_name(e) for e in failed],
+            disconnected=lost_pairs > 0,
+            connectivity_loss=(
+                lost_pairs / self.reachable_pairs if self.reachable_pairs else 0.0
+            ),
+            latency_increase=latency_increase,
+            congested_links=congested_links,
+            packet_loss=packet_loss,
+            risk_level=risk_level
+        )
+
+    def _latency_delta(
+        self,
+        sources: np.ndarray,
+        rows: np.ndarray,
+        lost_pairs: int
+    ) -> float:
+        """Mean latency change over pairs reachable before and after."""
+        original = self.paths.distances[sources]
+        reachable = np.isfinite(rows) & np.isfinite(original)
+        delta = np.where(reachable, rows - original, 0.0)
+
+        # Rows cover (source, *) pairs; by symmetry the (*, source) pairs of
+        # non-recomputed nodes mirror them, so add those columns once more
+        recomputed = np.zeros(self.topology.node_count, dtype=bool)
+        recomputed[sources] = True
+        total = delta.sum() + delta[:, ~recomputed].sum()
+
+        pair_count = self.reachable_pairs - lost_pairs
+        return float(total / pair_count) if pair_count else 0.0
+
+    def _reroute_load(
+        self,
+        failed: Tuple[int, ...],
+        keep: np.ndarray,
+        sources: np.ndarray,
+        predecessors: np.ndarray
+    ) -> np.ndarray:
+        """Shift each failed link's load onto the surviving shortest path."""
+        topology = self.topology
+        utilization = topology.utilization.copy()
+        row_of = {int(s): i for i, s in enumerate(sources)}
+
+        for edge_id in failed:
+            src, dst = int(topology.src[edge_id]), int(topology.dst[edge_id])
+            load = topology.utilization[edge_id] * topology.capacity[edge_id]
+            tree = predecessors[row_of[src]]
+            if load <= 0 or tree[dst] < 0:
+                continue  # No load or no alternative path: traffic is lost
+            node = dst
+            while node != src:
+                previous = int(tree[node])
+                path_edge = topology.find_edge(previous, node)
+                if topology.capacity[path_edge] > 0:
+                    utilization[path_edge] += load / topology.capacity[path_edge]
+                node = previous
+
+        utilization[~keep] = 0.0
+        return utilization
+
+    def _is_partitioning(self, failed: Tuple[int, ...]) -> bool:
+        """Check whether removing the links splits a component."""
+        if any(e in self.bridges for e in failed):
+            return True
+        if len(failed) == 2:
+            first, second = failed
+            return second in self._bridges_after(first)
+        return False
+
+    def _bridges_after(self, edge_id: int) -> Set[int]:
+        """Bridges of the graph with one link removed (memoized)."""
+        bridges = self._bridges_without.get(edge_id)
+        if bridges is None:
+            keep = np.ones(self.topology.edge_count, dtype=bool)
+            keep[edge_id] = False
+            index = ConnectivityIndex(self.topology, keep)
+            bridges = set(index.bridges.tolist())
+            self._bridges_without[edge_id] = bridges
+        return bridges
+
+    def _candidate_edges(self, links: Optional[List[str]]) -> List[int]:
+        """Resolve ``src-dst`` labels to link ids (all links by default)."""
+        if not links:
+            return list(range(self.topology.edge_count))
+
+        topology = self.topology
+        by_name = {}
+        for e in range(topology.edge_count):
+            src = topology.node_ids[topology.src[e]]
+            dst = topology.node_ids[topology.dst[e]]
+            by_name[f"{src}-{dst}"] = e
+            by_name[f"{dst}-{src}"] = e
+
+        edge_ids = []
+        for label in links:
+            if label not in by_name:
+                raise ValueError(f"Unknown link: {label}")
+            edge_ids.append(by_name[label])
+        return sorted(set(edge_ids))
+
+    def _ordered_pairs(self, labels: np.ndarray) -> int:
+        """Count ordered pairs of active nodes that can reach each other."""
+        sizes = np.bincount(labels[self.topology.active_nodes])
+        return int((sizes * (sizes - 1)).sum())
+
+
+def run_contingency(
+    baseline: BaselineAnalysis,
+    request: ContingencyRequest,
+    analyzer: Optional[ImpactAnalyzer] = None
+) -> ContingencyResult:
+    """Build a sweep over the baseline and run it (executor entry point)."""
+    return ContingencySweep(baseline, analyzer or ImpactAnalyzer()).run(request)
+
+
+def run_srlg_sweep(
+    baseline: BaselineAnalysis,
+    request: SRLGSweepRequest,
+    analyzer: Optional[ImpactAnalyzer] = None
+) -> SRLGSweepResult:
+    """Sweep shared-risk link group failures (executor entry point)."""
+    sweep = ContingencySweep(baseline, analyzer or ImpactAnalyzer())
+    return sweep.run_groups(request)
@@ -0,0 +1,312 @@
+import time
+from typing import Tuple
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.csgraph import dijkstra
+
+from app.models.simulation import CriticalityReport, ElementCriticality
+from app.services.connectivity_index import ConnectivityIndex
+from app.services.executor import fan_out
+from app.services.graph_core import CompactTopology, TopologyOverlay
+
+# Score weights of the normalized betweenness, cut membership (bridge or
+# articulation point) and load
+BETWEENNESS_WEIGHT = 0.4
+CUT_WEIGHT = 0.35
+LOAD_WEIGHT = 0.25
+
+# Removing an element scored at least this raises the risk level
+HIGH_CRITICALITY = 0.6
+MEDIUM_CRITICALITY = 0.3
+
+# Source-by-link-direction entries per Brandes batch (about 32 MB each)
+BATCH_ENTRIES = 1 << 22
+
+# Fewer sources than this are counted inline, cheaper than shipping the
+# Brandes state to the compute pool
+POOL_MIN_SOURCES = 500
+
+# Per-link and per-node shortest-path pair counts
+PathCounts = Tuple[np.ndarray, np.ndarray]
+
+
+class BrandesBlock:
+    """Brandes betweenness accumulation for a block of sources.
+
+    Sources are processed in batches. For each batch, one Dijkstra call
+    gives the distance rows; the shortest-path DAG of every source is the
+    set of link directions that are tight under those distances. Path
+    counts are pushed out from the sources one hop per step, and
+    dependencies are collected back level by level, so each step is a
+    vectorized pass over a batch-wide frontier instead of a per-node
+    Python loop.
+    """
+
+    def __init__(
+        self,
+        node_count: int,
+        src: np.ndarray,
+        dst: np.ndarray,
+        weights: np.ndarray
+    ):
+        self.node_count = node_count
+        self.edge_count = len(src)
+        self.matrix = sp.csr_matrix(
+            (weights, (src, dst)), shape=(node_count, node_count)
+        )
+        # Link directions ordered by tail, so the DAG arcs of a batch come
+        # out of np.nonzero already grouped by tail
+        tails = np.concatenate([src, dst])
+        order = np.argsort(tails, kind="stable")
+        self.tails = tails[order]
+        self.heads = np.concatenate([dst, src])[order]
+        self.arc_weights = np.concatenate([weights, weights])[order]
+        self.arc_edges = np.concatenate([np.arange(self.edge_count)] * 2)[order]
+        self.batch_size = max(1, BATCH_ENTRIES // max(2 * self.edge_count, 1))
+
+    def accumulate(self, sources: np.ndarray) -> PathCounts:
+        """Ordered-pair shortest-path counts through each link and node."""
+        edge_paths = np.zeros(self.edge_count)
+        node_paths = np.zeros(self.node_count)
+        for start in range(0, len(sources), self.batch_size):
+            batch = sources[start:start + self.batch_size]
+            edges, nodes = self._accumulate_batch(batch)
+            edge_paths += edges
+            node_paths += nodes
+        return edge_paths, node_paths
+
+    def _accumulate_batch(self, batch: np.ndarray) -> PathCounts:
+        n = self.node_count
+        size = len(batch) * n
+        distances = np.atleast_2d(dijkstra(
+            self.matrix, directed=False, indices=batch
+        ))
+
+        # Tight link directions form each source's shortest-path DAG; DAG
+        # nodes are numbered row * n + node across the batch
+        to_tail = distances[:, self.tails]
+        to_head = distances[:, self.heads]
+        tight = (
+            np.isfinite(to_head) & (to_head > to_tail)
+            & np.isclose(to_tail + self.arc_weights, to_head)
+        )
+        rows, arcs = np.nonzero(tight)
+        tails = rows * n + self.tails[arcs]
+        heads = rows * n + self.heads[arcs]
+        origins = np.arange(len(batch)) * n + batch
+
+        sigma, level = self._path_counts(tails, heads, origins, size)
+
+        # Dependencies, deepest tails first so every head is final:
+        # delta_v = sum over successors w of sigma_v / sigma_w * (1 + delta_w)
+        ratio = sigma[tails] / sigma[heads]
+        delta = np.zeros(size)
+        credit = np.zeros(len(arcs))
+        tail_level = level[tails]
+        order = np.argsort(-tail_level, kind="stable")
+        bounds = np.flatnonzero(np.diff(tail_level[order])) + 1
+        for group in np.split(order, bounds):
+            credit[group] = ratio[group] * (1.0 + delta[heads[group]])
+            np.add.at(delta, tails[group], credit[group])
+
+        delta[origins] = 0.0
+        return (
+            np.bincount(self.arc_edges[arcs], weights=credit,
+                        minlength=self.edge_count),
+            delta.reshape(len(batch), n).sum(axis=0)
+        )
+
+    @staticmethod
+    def _path_counts(
+        tails: np.ndarray,
+        heads: np.ndarray,
+        origins: np.ndarray,
+        size: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Shortest-path counts and DAG depth of every node.
+
+        Path counts are the sum over k of the paths of exactly k hops,
+        pushed one hop at a time from the sources along the arcs of the
+        current frontier only. A node's depth is the longest hop count
+        that reaches it, so every arc leads to a deeper node. Arcs must be
+        sorted by tail.
+        """
+        indptr = np.concatenate([
+            [0], np.cumsum(np.bincount(tails, minlength=size))
+        ])
+
+        sigma = np.zeros(size)
+        sigma[origins] = 1.0
+        level = np.zeros(size, dtype=np.int64)
+        nodes, values = origins, np.ones(len(origins))
+        depth = 0
+        while nodes.size:
+            depth += 1
+            starts = indptr[nodes]
+            counts = indptr[nodes + 1] - starts
+            offsets = np.repeat(starts - np.cumsum(counts) + counts, counts)
+            outgoing = offsets + np.arange(counts.sum())
+            nodes, inverse = np.unique(heads[outgoing], return_inverse=True)
+            values = np.bincount(
+                inverse, weights=np.repeat(values, counts), minlength=nodes.size
+            )
+            sigma[nodes] += values
+            level[nodes] = depth
+        return sigma, level
+
+
+def _accumulate_block(brandes: BrandesBlock, sources: np.ndarray) -> PathCounts:
+    return brandes.accumulate(sources)
+
+
+def shortest_path_counts(
+    topology: CompactTopology,
+    weights: np.ndarray,
+    max_workers: int = 1,
+    max_sources: int = 0
+) -> PathCounts:
+    """Unordered node pairs whose shortest paths run over each link and node.
+
+    Pairs with several equal-cost shortest paths are split evenly between
+    them, as in Brandes' algorithm. Blocks of sources are spread across the
+    shared compute pool and their counts summed. With ``max_sources`` set and
+    exceeded, counts are estimated from that many sources drawn with a
+    seed taken from the topology, scaled up to all sources.
+    """
+    brandes = BrandesBlock(topology.node_count, topology.src, topology.dst, weights)
+    sources = np.flatnonzero(topology.active_nodes)
+    scale = 1.0
+    if 0 < max_sources < sources.size:
+        rng = np.random.default_rng(int(topology.fingerprint()[:8], 16))
+        scale = sources.size / max_sources
+        sources = np.sort(rng.choice(sources, max_sources, replace=False))
+    blocks = [
+        block for block in np.array_split(sources, max(1, max_workers) * 4)
+        if block.size
+    ]
+
+    if sources.size < POOL_MIN_SOURCES:
+        max_workers = 1
+    results = fan_out(_accumulate_block, brandes, blocks, max_workers)
+
+    edge_paths = np.zeros(topology.edge_count)
+    node_paths = np.zeros(topology.node_count)
+    for edges, nodes in results:
+        edge_paths += edges
+        node_paths += nodes
+    # Every unordered pair was counted once from each end
+    return edge_paths * scale / 2, node_paths * scale / 2
+
+
+class CriticalityIndex:
+    """Criticality scores of every link and node of one topology version.
+
+    A score combines normalized betweenness, whether the element is a
+    bridge or articulation point, and its load. Built with the baseline,
+    so it is refreshed whenever the topology changes.
+    """
+
+    def __init__(
+        self,
+        topology: CompactTopology,
+        connectivity: ConnectivityIndex,
+        weights: np.ndarray,
+        max_workers: int = 1,
+        max_sources: int = 0
+    ):
+        start_time = time.perf_counter()
+        self.topology = topology
+        node_count = int(topology.active_nodes.sum())
+
+        self.link_paths, self.node_paths = shortest_path_counts(
+            topology, weights, max_workers, max_sources
+        )
+        link_pairs = node_count * (node_count - 1) / 2
+        node_pairs = (node_count - 1) * (node_count - 2) / 2
+        self.link_betweenness = self.link_paths / max(link_pairs, 1)
+        self.node_betweenness = self.node_paths / max(node_pairs, 1)
+
+        self.link_cut = connectivity.is_bridge
+        self.node_cut = connectivity.is_articulation
+        self.link_load = np.clip(topology.utilization, 0.0, 1.0)
+        self.node_load = np.zeros(topology.node_count)
+        np.maximum.at(self.node_load, topology.src, self.link_load)
+        np.maximum.at(self.node_load, topology.dst, self.link_load)
+
+        self.link_scores = self._scores(
+            self.link_betweenness, self.link_cut, self.link_load
+        )
+        self.node_scores = self._scores(
+            self.node_betweenness, self.node_cut, self.node_load
+        )
+        self.duration = time.perf_counter() - start_time
+
+    @staticmethod
+    def _scores(
+        betweenness: np.ndarray,
+        cut: np.ndarray,
+        load: np.ndarray
+    ) -> np.ndarray:
+        peak = betweenness.max() if betweenness.size else 0.0
+        relative = betweenness / peak if peak > 0 else np.zeros_like(betweenness)
+        return (
+            BETWEENNESS_WEIGHT * relative
+            + CUT_WEIGHT * cut
+            + LOAD_WEIGHT * load
+        )
+
+    def change_score(self, overlay: TopologyOverlay) -> float:
+        """Highest score among the elements a scenario removes or shrinks.
+
+        Links that are removed or lose capacity count with their own
+        score, removed nodes with theirs.
+        """
+        topology = self.topology
+        edge_count = topology.edge_count
+        degraded = ~overlay.edge_active[:edge_count] | (
+            overlay.column("capacity")[:edge_count] < topology.capacity
+        )
+        removed = (
+            topology.active_nodes
+            & ~overlay.active_nodes[:topology.node_count]
+        )
+        scores = np.concatenate([
+            self.link_scores[degraded], self.node_scores[removed]
+        ])
+        return float(scores.max()) if scores.size else 0.0
+
+    def report(self, limit: int) -> CriticalityReport:
+        """The most critical links and nodes, highest score first."""
+        topology = self.topology
+        links = [
+            ElementCriticality(
+                element=topology.edge_name(e),
+                score=float(self.link_scores[e]),
+                betweenness=float(self.link_betweenness[e]),
+                shortest_paths=float(self.link_paths[e]),
+                cut=bool(self.link_cut[e]),
+                load=float(self.link_load[e])
+            )
+            for e in np.argsort(-self.link_scores, kind="stable")[:limit]
+        ]
+        active = np.flatnonzero(topology.active_nodes)
+        nodes = [
+            ElementCriticality(
+                element=str(topology.node_ids[i]),
+                score=float(self.node_scores[i]),
+                betweenness=float(self.node_betweenness[i]),
+                shortest_paths=float(self.node_paths[i]),
+                cut=bool(self.node_cut[i]),
+                load=float(self.node_load[i])
+            )
+            for i in active[
+                np.argsort(-self.node_scores[active], kind="stable")[:limit]
+            ]
+        ]
+        return CriticalityReport(
+            topology_version=topology.fingerprint(),
+            links=links,
+            nodes=nodes,
+            computation_time=self.duration
+        )
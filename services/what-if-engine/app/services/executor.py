@@ -0,0 +1,426 @@
+import asyncio
+import multiprocessing
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import structlog
+
+from app.core.config import settings
+
+logger = structlog.get_logger()
+
+EXECUTOR_KINDS = ("thread", "process")
+
+# Shared objects each pool worker keeps loaded, least recently used dropped
+RESIDENT_OBJECTS = 8
+
+# Chunks per requested worker when fanning items out, for load balance
+CHUNKS_PER_WORKER = 4
+
+
+class ExecutorSaturated(RuntimeError):
+    """Raised when the analysis queue is full."""
+
+
+class SharedRef:
+    """Picklable handle of an object shared with pool workers by key."""
+
+    __slots__ = ("key", "path")
+
+    def __init__(self, key: str, path: str):
+        self.key = key
+        self.path = path
+
+    def __getstate__(self):
+        return self.key, self.path
+
+    def __setstate__(self, state):
+        self.key, self.path = state
+
+
+class SharedStore:
+    """Objects pickled once to files that pool workers load by key.
+
+    A process pool would otherwise pickle large arguments, such as a
+    baseline with its n x n matrices, into every task. Workers keep what
+    they load (see :func:`resolve_shared`), so each object crosses the
+    process boundary once per worker. Entries stay until released.
+    """
+
+    def __init__(self):
+        self._directory: Optional[str] = None
+        self._refs: Dict[str, SharedRef] = {}
+        self._lock = threading.Lock()
+
+    def share(self, obj: Any, key: Optional[str] = None) -> SharedRef:
+        """Store ``obj`` under ``key`` (a new key if None) unless present."""
+        with self._lock:
+            key = key or uuid.uuid4().hex
+            ref = self._refs.get(key)
+            if ref is None:
+                if self._directory is None:
+                    self._directory = tempfile.mkdtemp(prefix="nettwin-shared-")
+                path = os.path.join(self._directory, f"{key}.pickle")
+                with open(path, "wb") as f:
+                    pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+                ref = self._refs[key] = SharedRef(key, path)
+            return ref
+
+    def release(self, key: str):
+        """Delete a stored object; workers drop it when it ages out."""
+        with self._lock:
+            ref = self._refs.pop(key, None)
+        if ref is not None:
+            try:
+                os.remove(ref.path)
+            except FileNotFoundError:
+                pass
+
+    def clear(self):
+        """Delete every stored object."""
+        with self._lock:
+            self._refs.clear()
+            directory, self._directory = self._directory, None
+        if directory is not None:
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+# Set in pool worker processes, which must not start pools of their own
+_in_worker = False
+
+# Shared objects loaded in this worker process
+_resident: "OrderedDict[str, Any]" = OrderedDict()
+
+
+def _enter_worker():
+    """Pool initializer: mark the process as a pool worker."""
+    global _in_worker
+    _in_worker = True
+
+
+def resolve_shared(value: Any) -> Any:
+    """Return the object behind a :class:`SharedRef`, loading it once."""
+    if not isinstance(value, SharedRef):
+        return value
+    obj = _resident.get(value.key)
+    if obj is None:
+        with open(value.path, "rb") as f:
+            obj = pickle.load(f)
+        _resident[value.key] = obj
+        while len(_resident) > RESIDENT_OBJECTS:
+            _resident.popitem(last=False)
+    else:
+        _resident.move_to_end(value.key)
+    return obj
+
+
+def _timed_call(
+    fn: Callable,
+    args: Tuple[Any, ...],
+    kwargs: Dict[str, Any]
+) -> Tuple[float, Any]:
+    """Run a job in a worker and report how long it ran."""
+    start_time = time.perf_counter()
+    args = tuple(resolve_shared(arg) for arg in args)
+    kwargs = {name: resolve_shared(value) for name, value in kwargs.items()}
+    result = fn(*args, **kwargs)
+    return time.perf_counter() - start_time, result
+
+
+def _map_chunk(
+    fn: Callable,
+    state: Any,
+    items: Sequence[Any],
+    args: Tuple[Any, ...]
+) -> List[Any]:
+    """Apply ``fn`` to a chunk of items in a compute pool worker."""
+    state = resolve_shared(state)
+    return [fn(state, item, *args) for item in items]
+
+
+class AnalysisExecutor:
+    """Worker pool for the CPU-bound graph-analysis stages.
+
+    Jobs beyond the worker count wait in a bounded queue in front of the
+    pool, so the event loop keeps serving health checks, auth and cache
+    reads while simulations run. When the queue is full new jobs are
+    rejected instead of piling up. Process workers avoid GIL contention
+    but receive their arguments pickled, so callables and arguments must
+    be picklable in that mode.
+
+    Jobs that split work into parallel pieces use one long-lived compute
+    pool (see :meth:`fan_out`). Its processes start from a fork server
+    or are spawned, never forked from this multithreaded process.
+    """
+
+    def __init__(
+        self,
+        kind: str = "thread",
+        max_workers: int = 4,
+        max_queue: int = 64,
+        pool_workers: int = 4,
+        start_method: str = "forkserver"
+    ):
+        if kind not in EXECUTOR_KINDS:
+            raise ValueError(f"Unknown executor kind: {kind}")
+        if start_method not in multiprocessing.get_all_start_methods():
+            start_method = "spawn"
+        self.kind = kind
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self.pool_workers = max(1, pool_workers)
+        self.start_method = start_method
+        self.shared = SharedStore()
+        self._pool: Optional[Executor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._slots_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._compute_pool: Optional[ProcessPoolExecutor] = None
+        self._compute_lock = threading.Lock()
+        self._compute_unavailable = False
+
+        # Metrics
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.total_wait_time = 0.0
+        self.max_wait_time = 0.0
+        self.total_run_time = 0.0
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run ``fn`` on a worker once a slot is free."""
+        if self.running >= self.max_workers and self.queued >= self.max_queue:
+            self.rejected += 1
+            raise ExecutorSaturated(
+                f"Analysis queue full ({self.queued} jobs waiting)"
+            )
+
+        # Wait for a worker slot in the bounded queue
+        slots = self._get_slots()
+        enqueued_at = time.perf_counter()
+        self.queued += 1
+        try:
+            await slots.acquire()
+        finally:
+            self.queued -= 1
+        wait_time = time.perf_counter() - enqueued_at
+        self.total_wait_time += wait_time
+        self.max_wait_time = max(self.max_wait_time, wait_time)
+
+        self.running += 1
+        try:
+            loop = asyncio.get_running_loop()
+            run_time, result = await loop.run_in_executor(
+                self._get_pool(), _timed_call, fn, args, kwargs
+            )
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.running -= 1
+            slots.release()
+
+        self.completed += 1
+        self.total_run_time += run_time
+        return result
+
+    def share(self, obj: Any, key: str) -> Any:
+        """``obj`` as a job argument, kept resident in process workers.
+
+        In ``process`` mode this returns a :class:`SharedRef`, so repeated
+        jobs send only the key; thread workers get the object itself.
+        """
+        if self.kind != "process":
+            return obj
+        return self.shared.share(obj, key)
+
+    def fan_out(
+        self,
+        fn: Callable,
+        state: Any,
+        items: Sequence[Any],
+        max_workers: int,
+        key: Optional[str] = None,
+        args: Tuple[Any, ...] = ()
+    ) -> List[Any]:
+        """``[fn(state, item, *args) for item in items]`` on the compute pool.
+
+        ``state`` is shared once under ``key`` and stays resident in the
+        workers for later calls with the same key; without a key it is
+        released afterwards. Items are split into about
+        ``CHUNKS_PER_WORKER * max_workers`` chunks. Errors raised by ``fn``
+        propagate; work falls back inline only when the pool cannot start
+        or breaks.
+        """
+        pool = self._get_compute_pool()
+        if pool is None:
+            return [fn(state, item, *args) for item in items]
+
+        ref = self.shared.share(state, key)
+        size = -(-len(items) // (max_workers * CHUNKS_PER_WORKER))
+        chunks = [items[i:i + size] for i in range(0, len(items), size)]
+        try:
+            try:
+                futures = [
+                    pool.submit(_map_chunk, fn, ref, chunk, args)
+                    for chunk in chunks
+                ]
+            except OSError as e:
+                logger.warning(
+                    "Compute pool cannot start, running inline", error=str(e)
+                )
+                self._compute_unavailable = True
+                self._reset_compute_pool(pool)
+                return [fn(state, item, *args) for item in items]
+            return [result for future in futures for result in future.result()]
+        except BrokenProcessPool as e:
+            logger.warning("Compute pool broke, running inline", error=str(e))
+            self._reset_compute_pool(pool)
+            return [fn(state, item, *args) for item in items]
+        finally:
+            if key is None:
+                self.shared.release(ref.key)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, worker usage and wait times for sizing the pool."""
+        finished = self.completed + self.failed
+        started = finished + self.running
+        return {
+            "kind": self.kind,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "queue_depth": self.queued,
+            "running": self.running,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "average_wait_time": self.total_wait_time / started if started else 0.0,
+            "max_wait_time": self.max_wait_time,
+            "average_run_time": (
+                self.total_run_time / self.completed if self.completed else 0.0
+            )
+        }
+
+    def shutdown(self, wait: bool = True):
+        """Stop the worker and compute pools and drop shared objects."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait)
+            self._pool = None
+        with self._compute_lock:
+            pool, self._compute_pool = self._compute_pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=True)
+        self.shared.clear()
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        # Slots belong to the event loop that waits on them
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._slots_loop is not loop:
+            self._slots = asyncio.Semaphore(self.max_workers)
+            self._slots_loop = loop
+        return self._slots
+
+    def _get_pool(self) -> Executor:
+        if self._pool is None:
+            if self.kind == "process":
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context(self.start_method),
+                    initializer=_enter_worker
+                )
+            else:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="analysis"
+                )
+            logger.info(
+                "Analysis executor started",
+                kind=self.kind,
+                workers=self.max_workers,
+                queue_size=self.max_queue
+            )
+        return self._pool
+
+    def _get_compute_pool(self) -> Optional[ProcessPoolExecutor]:
+        with self._compute_lock:
+            if self._compute_pool is None and not self._compute_unavailable:
+                self._compute_pool = ProcessPoolExecutor(
+                    max_workers=self.pool_workers,
+                    mp_context=multiprocessing.get_context(self.start_method),
+                    initializer=_enter_worker
+                )
+                logger.info(
+                    "Compute pool started",
+                    workers=self.pool_workers,
+                    start_method=self.start_method
+                )
+            return self._compute_pool
+
+    def _reset_compute_pool(self, pool: ProcessPoolExecutor):
+        """Drop a failed compute pool; the next fan-out starts a new one."""
+        with self._compute_lock:
+            if self._compute_pool is pool:
+                self._compute_pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+_executor: Optional[AnalysisExecutor] = None
+
+
+def get_executor() -> AnalysisExecutor:
+    """Get the process-wide analysis executor."""
+    global _executor
+    if _executor is None:
+        _executor = AnalysisExecutor(
+            kind=settings.ANALYSIS_EXECUTOR,
+            max_workers=settings.ANALYSIS_WORKERS,
+            max_queue=settings.ANALYSIS_QUEUE_SIZE,
+            pool_workers=settings.POOL_WORKERS,
+            start_method=settings.POOL_START_METHOD
+        )
+    return _executor
+
+
+def fan_out(
+    fn: Callable,
+    state: Any,
+    items: Sequence[Any],
+    max_workers: int,
+    key: Optional[str] = None,
+    args: Tuple[Any, ...] = ()
+) -> List[Any]:
+    """``[fn(state, item, *args) for item in items]``, in parallel if useful.
+
+    Uses the process-wide compute pool (see
+    :meth:`AnalysisExecutor.fan_out`). Runs inline for a single worker or
+    item, and inside pool workers: those cannot start processes, and in
+    ``process`` mode the calling job already runs outside this process.
+    """
+    items = list(items)
+    if max_workers <= 1 or len(items) < 2 or _in_worker:
+        return [fn(state, item, *args) for item in items]
+    return get_executor().fan_out(fn, state, items, max_workers, key, args)
+
+
+def release_shared(key: str):
+    """Drop the state shared under ``key`` by :func:`fan_out` calls."""
+    if _executor is not None:
+        _executor.shared.release(key)
+
+
+def shutdown_executor():
+    """Stop the process-wide analysis executor."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown()
+        _executor = None
@@ -0,0 +1,595 @@
+import hashlib
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Tuple, Union
+
+import networkx as nx
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.csgraph import connected_components
+
+# Numeric link attributes stored as NumPy columns
+EDGE_COLUMNS = ("capacity", "utilization", "latency", "cost")
+EDGE_DEFAULTS = {"capacity": 0.0, "utilization": 0.0, "latency": 1.0}
+
+# OSPF-style reference bandwidth (Mbps) used when a link carries no cost
+REFERENCE_BANDWIDTH = 100000
+
+
+def default_cost(capacity: np.ndarray) -> np.ndarray:
+    """Derive OSPF-style link costs from capacity."""
+    capacity = np.asarray(capacity, dtype=float)
+    cost = np.ones_like(capacity)
+    positive = capacity > 0
+    cost[positive] = np.maximum(
+        np.round(REFERENCE_BANDWIDTH / capacity[positive]), 1.0
+    )
+    return cost
+
+
+class CompactTopology:
+    """Array-backed network topology.
+
+    Node ids are interned to integers, per-link metrics live in NumPy columns
+    and adjacency is kept in CSR form. Instances are treated as immutable;
+    scenario changes are expressed with :class:`TopologyOverlay`.
+    """
+
+    def __init__(
+        self,
+        node_ids: List[Hashable],
+        src: np.ndarray,
+        dst: np.ndarray,
+        columns: Dict[str, np.ndarray],
+        node_attrs: Optional[List[Dict[str, Any]]] = None,
+        edge_attrs: Optional[List[Dict[str, Any]]] = None,
+        active_nodes: Optional[np.ndarray] = None
+    ):
+        self.node_ids = list(node_ids)
+        self.node_index: Dict[Hashable, int] = {
+            node: i for i, node in enumerate(self.node_ids)
+        }
+        self.src = np.asarray(src, dtype=np.int32)
+        self.dst = np.asarray(dst, dtype=np.int32)
+
+        edge_count = len(self.src)
+        self.capacity = self._column(columns, "capacity", edge_count)
+        self.utilization = self._column(columns, "utilization", edge_count)
+        self.latency = self._column(columns, "latency", edge_count)
+        cost = columns.get("cost")
+        if cost is None:
+            self.cost = default_cost(self.capacity)
+        else:
+            cost = np.asarray(cost, dtype=float)
+            missing = np.isnan(cost)
+            self.cost = np.where(missing, default_cost(self.capacity), cost)
+
+        self.node_attrs = node_attrs or [{} for _ in self.node_ids]
+        self.edge_attrs = edge_attrs or [{} for _ in range(edge_count)]
+        if active_nodes is None:
+            active_nodes = np.ones(len(self.node_ids), dtype=bool)
+        self.active_nodes = np.asarray(active_nodes, dtype=bool)
+
+        self._indptr: Optional[np.ndarray] = None
+        self._indices: Optional[np.ndarray] = None
+        self._edge_ids: Optional[np.ndarray] = None
+        self._fingerprint: Optional[str] = None
+        self._shared_risk_groups: Optional[Dict[str, np.ndarray]] = None
+
+    @staticmethod
+    def _column(
+        columns: Dict[str, np.ndarray],
+        name: str,
+        edge_count: int
+    ) -> np.ndarray:
+        values = columns.get(name)
+        if values is None:
+            return np.full(edge_count, EDGE_DEFAULTS[name])
+        values = np.asarray(values, dtype=float)
+        return np.where(np.isnan(values), EDGE_DEFAULTS[name], values)
+
+    @classmethod
+    def from_networkx(cls, graph: nx.Graph) -> "CompactTopology":
+        """Build a compact topology from a NetworkX graph."""
+        node_ids = list(graph.nodes())
+        index = {node: i for i, node in enumerate(node_ids)}
+        edges = list(graph.edges(data=True))
+        edge_count = len(edges)
+
+        src = np.fromiter((index[u] for u, _, _ in edges), np.int32, edge_count)
+        dst = np.fromiter((index[v] for _, v, _ in edges), np.int32, edge_count)
+        columns = {
+            name: np.fromiter(
+                (_as_float(attrs.get(name)) for _, _, attrs in edges),
+                float,
+                edge_count
+            )
+            for name in EDGE_COLUMNS
+        }
+        edge_attrs = [
+            {k: v for k, v in attrs.items() if k not in EDGE_COLUMNS}
+            for _, _, attrs in edges
+        ]
+        node_attrs = [dict(graph.nodes[node]) for node in node_ids]
+
+        return cls(node_ids, src, dst, columns, node_attrs, edge_attrs)
+
+    def to_networkx(self) -> nx.Graph:
+        """Convert back to a NetworkX graph."""
+        graph = nx.Graph()
+        for i in np.flatnonzero(self.active_nodes):
+            graph.add_node(self.node_ids[i], **self.node_attrs[i])
+        for e in range(self.edge_count):
+            graph.add_edge(
+                self.node_ids[self.src[e]],
+                self.node_ids[self.dst[e]],
+                **self.edge_data(e)
+            )
+        return graph
+
+    def overlay(self) -> "TopologyOverlay":
+        """Create a copy-on-write scenario view of this topology."""
+        return TopologyOverlay(self)
+
+    @property
+    def node_count(self) -> int:
+        return len(self.node_ids)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.src)
+
+    def fingerprint(self) -> str:
+        """Content hash of nodes, links and link metrics."""
+        if self._fingerprint is None:
+            digest = hashlib.sha256()
+            digest.update("\x1f".join(map(str, self.node_ids)).encode())
+            for array in (
+                self.active_nodes, self.src, self.dst,
+                self.capacity, self.utilization, self.latency, self.cost
+            ):
+                digest.update(np.ascontiguousarray(array).tobytes())
+            for group, edge_ids in self.shared_risk_groups().items():
+                digest.update(group.encode())
+                digest.update(edge_ids.tobytes())
+            self._fingerprint = digest.hexdigest()
+        return self._fingerprint
+
+    def column(self, name: str) -> np.ndarray:
+        """Return a numeric link attribute column."""
+        if name not in EDGE_COLUMNS:
+            raise KeyError(f"Unknown link attribute: {name}")
+        return getattr(self, name)
+
+    def edge_data(self, edge_id: int) -> Dict[str, Any]:
+        """Return all attributes of a link as a dict."""
+        data = dict(self.edge_attrs[edge_id])
+        for name in EDGE_COLUMNS:
+            data[name] = float(getattr(self, name)[edge_id])
+        return data
+
+    def edge_name(self, edge_id: int) -> str:
+        """Return the ``src-dst`` label of a link."""
+        return (
+            f"{self.node_ids[self.src[edge_id]]}-"
+            f"{self.node_ids[self.dst[edge_id]]}"
+        )
+
+    def shared_risk_groups(self) -> Dict[str, np.ndarray]:
+        """Link ids of every shared-risk link group (SRLG), by group name.
+
+        Groups come from the ``srlg`` link attribute, one name or a list
+        of names. Links of a group share a conduit or line card and fail
+        together.
+        """
+        if self._shared_risk_groups is None:
+            members: Dict[str, List[int]] = {}
+            for edge_id, attrs in enumerate(self.edge_attrs):
+                groups = attrs.get("srlg") or ()
+                if isinstance(groups, str):
+                    groups = (groups,)
+                for group in groups:
+                    members.setdefault(str(group), []).append(edge_id)
+            self._shared_risk_groups = {
+                group: np.asarray(edge_ids, dtype=np.int32)
+                for group, edge_ids in sorted(members.items())
+            }
+        return self._shared_risk_groups
+
+    def _build_adjacency(self):
+        """Build CSR adjacency listing every link in both directions."""
+        edge_ids = np.arange(self.edge_count, dtype=np.int32)
+        heads = np.concatenate([self.src, self.dst])
+        tails = np.concatenate([self.dst, self.src])
+        both_ids = np.concatenate([edge_ids, edge_ids])
+
+        order = np.argsort(heads, kind="stable")
+        counts = np.bincount(heads, minlength=self.node_count)
+        self._indptr = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        self._indices = tails[order]
+        self._edge_ids = both_ids[order]
+
+    @property
+    def indptr(self) -> np.ndarray:
+        if self._indptr is None:
+            self._build_adjacency()
+        return self._indptr
+
+    @property
+    def indices(self) -> np.ndarray:
+        if self._indices is None:
+            self._build_adjacency()
+        return self._indices
+
+    @property
+    def edge_ids(self) -> np.ndarray:
+        if self._edge_ids is None:
+            self._build_adjacency()
+        return self._edge_ids
+
+    def incident_edges(self, node: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Return ``(neighbors, edge_ids)`` of a node index."""
+        start, end = self.indptr[node], self.indptr[node + 1]
+        return self.indices[start:end], self.edge_ids[start:end]
+
+    def find_edge(self, src: int, dst: int) -> int:
+        """Return the id of the link between two node indices, or -1."""
+        if not (0 <= src < self.node_count and 0 <= dst < self.node_count):
+            return -1
+        neighbors, edge_ids = self.incident_edges(src)
+        match = np.flatnonzero(neighbors == dst)
+        return int(edge_ids[match[0]]) if match.size else -1
+
+    def weight_matrix(self, weight: Optional[str] = None) -> sp.csr_matrix:
+        """Sparse adjacency weighted by a link column (1.0 if ``None``)."""
+        values = (
+            np.ones(self.edge_count) if weight is None else self.column(weight)
+        )
+        return sp.csr_matrix(
+            (values, (self.src, self.dst)),
+            shape=(self.node_count, self.node_count)
+        )
+
+    def connected_components(self) -> Tuple[int, np.ndarray]:
+        """Return the number of components among active nodes and labels."""
+        _, labels = connected_components(
+            self.weight_matrix(), directed=False
+        )
+        return len(np.unique(labels[self.active_nodes])), labels
+
+    def is_connected(self) -> bool:
+        """Check whether all active nodes belong to one component."""
+        if not self.active_nodes.any():
+            return False
+        component_count, _ = self.connected_components()
+        return component_count == 1
+
+
+class TopologyOverlay:
+    """Copy-on-write scenario view over a :class:`CompactTopology`.
+
+    The base arrays are shared; a column or the link activity mask is only
+    copied the first time a change touches it. Added nodes and links are
+    appended after the base indices, so base node and link ids stay valid.
+    The view implements the small part of the NetworkX graph API used by
+    callers (``has_edge``, ``has_node``, ``graph[u][v]``). Merged columns
+    are cached until the next change and, like the columns of a
+    :class:`CompactTopology`, must not be modified by callers.
+    """
+
+    def __init__(self, base: CompactTopology):
+        self.base = base
+        self._edge_active: Optional[np.ndarray] = None
+        self._columns: Dict[str, np.ndarray] = {}
+        self._edge_attrs: Dict[int, Dict[str, Any]] = {}
+
+        self._node_ids: List[Hashable] = []
+        self._node_attrs: List[Dict[str, Any]] = []
+        self._node_index: Dict[Hashable, int] = {}
+        self._removed_nodes: set = set()
+
+        self._added_src: List[int] = []
+        self._added_dst: List[int] = []
+        self._added_columns: Dict[str, List[float]] = {
+            name: [] for name in EDGE_COLUMNS
+        }
+        self._added_attrs: List[Dict[str, Any]] = []
+        self._added_active: List[bool] = []
+        # Added link ids by (low, high) endpoint pair and by endpoint
+        self._added_index: Dict[Tuple[int, int], int] = {}
+        self._added_by_node: Dict[int, List[int]] = {}
+
+        self._merged: Dict[str, np.ndarray] = {}
+
+    # Index helpers
+
+    @property
+    def node_count(self) -> int:
+        return self.base.node_count + len(self._node_ids)
+
+    @property
+    def edge_count(self) -> int:
+        return self.base.edge_count + len(self._added_src)
+
+    @property
+    def node_ids(self) -> List[Hashable]:
+        return self.base.node_ids + self._node_ids
+
+    def node_position(self, node: Hashable) -> int:
+        """Return the index of a node, or -1 if it never existed."""
+        index = self.base.node_index.get(node)
+        if index is None:
+            index = self._node_index.get(node, -1)
+        return index
+
+    def find_edge(self, src: int, dst: int) -> int:
+        """Return the id of the link between two node indices, or -1."""
+        edge_id = self.base.find_edge(src, dst)
+        if edge_id >= 0:
+            return edge_id
+        offset = self._added_index.get((min(src, dst), max(src, dst)))
+        return -1 if offset is None else self.base.edge_count + offset
+
+    def _is_edge_active(self, edge_id: int) -> bool:
+        if edge_id < self.base.edge_count:
+            if self._edge_active is None:
+                return True
+            return bool(self._edge_active[edge_id])
+        return self._added_active[edge_id - self.base.edge_count]
+
+    def _set_edge_active(self, edge_id: int, active: bool):
+        if edge_id < self.base.edge_count:
+            if self._edge_active is None:
+                self._edge_active = np.ones(self.base.edge_count, dtype=bool)
+            self._edge_active[edge_id] = active
+        else:
+            self._added_active[edge_id - self.base.edge_count] = active
+
+    def _set_edge_value(self, edge_id: int, name: str, value: float):
+        self._merged.clear()
+        if edge_id < self.base.edge_count:
+            if name not in self._columns:
+                self._columns[name] = self.base.column(name).copy()
+            self._columns[name][edge_id] = value
+        else:
+            self._added_columns[name][edge_id - self.base.edge_count] = value
+
+    # Mutations
+
+    def add_node(self, node: Hashable, **attrs):
+        """Add a node, or re-activate a removed one."""
+        index = self.node_position(node)
+        if index < 0:
+            self._node_index[node] = self.node_count
+            self._node_ids.append(node)
+            self._node_attrs.append(dict(attrs))
+            return
+        self._removed_nodes.discard(index)
+        if index >= self.base.node_count:
+            self._node_attrs[index - self.base.node_count].update(attrs)
+
+    def remove_node(self, node: Hashable):
+        """Remove a node and every link attached to it."""
+        index = self.node_position(node)
+        if index < 0 or index in self._removed_nodes:
+            return
+        self._removed_nodes.add(index)
+        if index < self.base.node_count:
+            _, edge_ids = self.base.incident_edges(index)
+            for edge_id in edge_ids:
+                self._set_edge_active(int(edge_id), False)
+        for offset in self._added_by_node.get(index, ()):
+            self._added_active[offset] = False
+
+    def add_edge(self, src: Hashable, dst: Hashable, **attrs):
+        """Add a link, or update the attributes of an existing one."""
+        for node in (src, dst):
+            if not self.has_node(node):
+                self.add_node(node)
+        a, b = self.node_position(src), self.node_position(dst)
+
+        edge_id = self.find_edge(a, b)
+        if edge_id >= 0:
+            if not self._is_edge_active(edge_id):
+                # A re-added link starts from defaults like a new edge
+                self._set_edge_active(edge_id, True)
+                for name in EDGE_COLUMNS:
+                    self._set_edge_value(
+                        edge_id, name, EDGE_DEFAULTS.get(name, np.nan)
+                    )
+                self._edge_attrs[edge_id] = {}
+            self.set_edge_attrs(src, dst, **attrs)
+            return
+
+        offset = len(self._added_src)
+        self._added_index[(min(a, b), max(a, b))] = offset
+        self._added_by_node.setdefault(a, []).append(offset)
+        self._added_by_node.setdefault(b, []).append(offset)
+        self._merged.clear()
+        self._added_src.append(a)
+        self._added_dst.append(b)
+        for name in EDGE_COLUMNS:
+            self._added_columns[name].append(
+                _as_float(attrs.get(name), EDGE_DEFAULTS.get(name, np.nan))
+            )
+        self._added_attrs.append(
+            {k: v for k, v in attrs.items() if k not in EDGE_COLUMNS}
+        )
+        self._added_active.append(True)
+
+    def remove_edge(self, src: Hashable, dst: Hashable):
+        """Remove a link if it exists."""
+        edge_id = self.find_edge(self.node_position(src), self.node_position(dst))
+        if edge_id >= 0:
+            self._set_edge_active(edge_id, False)
+
+    def set_edge_attrs(self, src: Hashable, dst: Hashable, **attrs):
+        """Update attributes of an existing link."""
+        edge_id = self.find_edge(self.node_position(src), self.node_position(dst))
+        if edge_id < 0 or not self._is_edge_active(edge_id):
+            raise KeyError(f"No link between {src} and {dst}")
+        extra = {}
+        for name, value in attrs.items():
+            if name in EDGE_COLUMNS:
+                self._set_edge_value(edge_id, name, _as_float(value))
+            else:
+                extra[name] = value
+        if extra:
+            if edge_id < self.base.edge_count:
+                merged = dict(self._edge_attrs.get(
+                    edge_id, self.base.edge_attrs[edge_id]
+                ))
+                merged.update(extra)
+                self._edge_attrs[edge_id] = merged
+            else:
+                self._added_attrs[edge_id - self.base.edge_count].update(extra)
+
+    # Read access
+
+    @property
+    def edge_active(self) -> np.ndarray:
+        """Activity mask over base and added links."""
+        base_active = (
+            self._edge_active if self._edge_active is not None
+            else np.ones(self.base.edge_count, dtype=bool)
+        )
+        return np.concatenate([
+            base_active, np.asarray(self._added_active, dtype=bool)
+        ])
+
+    @property
+    def active_nodes(self) -> np.ndarray:
+        """Activity mask over base and added nodes."""
+        active = np.concatenate([
+            self.base.active_nodes, np.ones(len(self._node_ids), dtype=bool)
+        ])
+        if self._removed_nodes:
+            active[list(self._removed_nodes)] = False
+        return active
+
+    def column(self, name: str) -> np.ndarray:
+        """Return a read-only link column over base and added links."""
+        values = self._merged.get(name)
+        if values is not None:
+            return values
+        if name not in EDGE_COLUMNS:
+            raise KeyError(f"Unknown link attribute: {name}")
+
+        base = self._columns.get(name)
+        if base is None:
+            base = self.base.column(name)
+        added = np.asarray(self._added_columns[name], dtype=float)
+        values = np.concatenate([base, added])
+        if name == "cost":
+            missing = np.isnan(values)
+            if missing.any():
+                values[missing] = default_cost(self.column("capacity"))[missing]
+        values.flags.writeable = False
+        self._merged[name] = values
+        return values
+
+    @property
+    def added_edges(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return ``(src, dst)`` index arrays of added links."""
+        return (
+            np.asarray(self._added_src, dtype=np.int32),
+            np.asarray(self._added_dst, dtype=np.int32)
+        )
+
+    def has_node(self, node: Hashable) -> bool:
+        index = self.node_position(node)
+        return index >= 0 and index not in self._removed_nodes
+
+    def has_edge(self, src: Hashable, dst: Hashable) -> bool:
+        if not (self.has_node(src) and self.has_node(dst)):
+            return False
+        edge_id = self.find_edge(self.node_position(src), self.node_position(dst))
+        return edge_id >= 0 and self._is_edge_active(edge_id)
+
+    def _edge_data(self, edge_id: int) -> Dict[str, Any]:
+        if edge_id < self.base.edge_count:
+            data = dict(self._edge_attrs.get(
+                edge_id, self.base.edge_attrs[edge_id]
+            ))
+        else:
+            data = dict(self._added_attrs[edge_id - self.base.edge_count])
+        for name in EDGE_COLUMNS:
+            data[name] = float(self.column(name)[edge_id])
+        return data
+
+    def __getitem__(self, node: Hashable) -> Dict[Hashable, Dict[str, Any]]:
+        """Return ``{neighbor: link attributes}`` like ``nx.Graph[node]``."""
+        if not self.has_node(node):
+            raise KeyError(node)
+        index = self.node_position(node)
+        node_ids = self.node_ids
+        adjacency = {}
+        if index < self.base.node_count:
+            neighbors, edge_ids = self.base.incident_edges(index)
+            for neighbor, edge_id in zip(neighbors, edge_ids):
+                if self._is_edge_active(int(edge_id)):
+                    adjacency[node_ids[neighbor]] = self._edge_data(int(edge_id))
+        for offset in self._added_by_node.get(index, ()):
+            if self._added_active[offset]:
+                a, b = self._added_src[offset], self._added_dst[offset]
+                neighbor = b if a == index else a
+                adjacency[node_ids[neighbor]] = self._edge_data(
+                    self.base.edge_count + offset
+                )
+        return adjacency
+
+    def edges(self) -> Iterator[Tuple[Hashable, Hashable]]:
+        """Iterate over active links as ``(src, dst)`` pairs."""
+        materialized = self.materialize()
+        for e in range(materialized.edge_count):
+            yield (
+                materialized.node_ids[materialized.src[e]],
+                materialized.node_ids[materialized.dst[e]]
+            )
+
+    def materialize(self) -> CompactTopology:
+        """Flatten the overlay into a standalone compact topology.
+
+        Node indices are preserved (removed nodes stay as inactive entries);
+        only active links are kept, base links first.
+        """
+        active = self.edge_active
+        added_src, added_dst = self.added_edges
+        src = np.concatenate([self.base.src, added_src])[active]
+        dst = np.concatenate([self.base.dst, added_dst])[active]
+        columns = {name: self.column(name)[active] for name in EDGE_COLUMNS}
+
+        base_attrs = [
+            self._edge_attrs.get(e, attrs)
+            for e, attrs in enumerate(self.base.edge_attrs)
+        ]
+        all_attrs = base_attrs + self._added_attrs
+        edge_attrs = [all_attrs[e] for e in np.flatnonzero(active)]
+
+        return CompactTopology(
+            self.node_ids,
+            src,
+            dst,
+            columns,
+            node_attrs=self.base.node_attrs + self._node_attrs,
+            edge_attrs=edge_attrs,
+            active_nodes=self.active_nodes
+        )
+
+    def to_networkx(self) -> nx.Graph:
+        """Convert the scenario to a NetworkX graph."""
+        return self.materialize().to_networkx()
+
+
+GraphLike = Union[nx.Graph, CompactTopology, TopologyOverlay]
+
+
+def as_compact(graph: GraphLike) -> CompactTopology:
+    """Return a compact topology for any supported graph representation."""
+    if isinstance(graph, CompactTopology):
+        return graph
+    if isinstance(graph, TopologyOverlay):
+        return graph.materialize()
+    return CompactTopology.from_networkx(graph)
+
+
+def _as_float(value: Any, default: float = np.nan) -> float:
+    return default if value is None else float(value)
@@ -0,0 +1,151 @@
+import hashlib
+import time
+from typing import List, Optional, Tuple
+
+import structlog
+
+from app.models.simulation import (
+    SimulationAction, SimulationResult, SimulationStatus
+)
+from app.services.codecs import PayloadCodec
+
+logger = structlog.get_logger()
+
+RESULT_KEY = "simulation:{simulation_id}"
+
+# Sorted sets of simulation ids scored by created_at
+HISTORY_KEY = "simulations:index"
+ACTION_INDEX = "simulations:index:action:{value}"
+RISK_INDEX = "simulations:index:risk:{value}"
+STATUS_INDEX = "simulations:index:status:{value}"
+
+# Scratch key for multi-filter intersections
+QUERY_KEY = "simulations:query:{digest}"
+QUERY_TTL = 10  # seconds
+
+RISK_LEVELS = ("low", "medium", "high", "critical")
+
+
+class SimulationHistory:
+    """Redis sorted-set index over cached simulation results.
+
+    Every stored result is indexed by ``created_at`` in a global sorted set
+    and in one set per action, risk level and status. A page is a single
+    ``ZREVRANGE`` on the matching set (an intersection when several
+    filters are combined), so listing never scans the keyspace. Entries
+    older than the result TTL are trimmed as new results are recorded.
+    """
+
+    def __init__(
+        self,
+        redis_client,
+        retention: int = 3600,
+        result_client=None,
+        codec: Optional[PayloadCodec] = None
+    ):
+        self.redis_client = redis_client
+        self.retention = retention
+        self.result_client = result_client or redis_client
+        self.codec = codec or PayloadCodec()
+
+    async def record(self, result: SimulationResult):
+        """Index a result under its current status and risk level."""
+        simulation_id = result.simulation_id
+        score = result.created_at.timestamp()
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.zadd(HISTORY_KEY, {simulation_id: score})
+            pipe.zadd(
+                ACTION_INDEX.format(value=result.request.action.value),
+                {simulation_id: score}
+            )
+
+            # A result moves between status sets as it progresses
+            for status in SimulationStatus:
+                key = STATUS_INDEX.format(value=status.value)
+                if status == result.status:
+                    pipe.zadd(key, {simulation_id: score})
+                else:
+                    pipe.zrem(key, simulation_id)
+
+            if result.impact_analysis is not None:
+                pipe.zadd(
+                    RISK_INDEX.format(value=result.impact_analysis.risk_level),
+                    {simulation_id: score}
+                )
+
+            # Drop entries whose results have expired
+            cutoff = time.time() - self.retention
+            for key in self._index_keys():
+                pipe.zremrangebyscore(key, "-inf", cutoff)
+
+            await pipe.execute()
+        except Exception as e:
+            logger.error("Failed to index simulation", error=str(e))
+
+    async def page(
+        self,
+        limit: int = 10,
+        offset: int = 0,
+        action: Optional[SimulationAction] = None,
+        risk_level: Optional[str] = None,
+        status: Optional[SimulationStatus] = None
+    ) -> Tuple[List[SimulationResult], int]:
+        """Return one page of results, newest first, and the match count."""
+        keys = []
+        if action is not None:
+            keys.append(ACTION_INDEX.format(value=action.value))
+        if risk_level is not None:
+            keys.append(RISK_INDEX.format(value=risk_level))
+        if status is not None:
+            keys.append(STATUS_INDEX.format(value=status.value))
+
+        pipe = self.redis_client.pipeline(transaction=False)
+        if len(keys) > 1:
+            key = QUERY_KEY.format(
+                digest=hashlib.sha1("\x00".join(sorted(keys)).encode()).hexdigest()
+            )
+            pipe.zinterstore(key, keys, aggregate="MAX")
+            pipe.expire(key, QUERY_TTL)
+        else:
+            key = keys[0] if keys else HISTORY_KEY
+        pipe.zcard(key)
+        pipe.zrevrange(key, offset, offset + limit - 1)
+        total, simulation_ids = (await pipe.execute())[-2:]
+
+        if not simulation_ids:
+            return [], total
+
+        cached = await self.result_client.mget([
+            RESULT_KEY.format(simulation_id=simulation_id)
+            for simulation_id in simulation_ids
+        ])
+
+        results, expired = [], []
+        for simulation_id, data in zip(simulation_ids, cached):
+            if data is None:
+                expired.append(simulation_id)
+            else:
+                results.append(self.codec.decode(data, SimulationResult))
+
+        if expired:
+            await self._forget(expired)
+        return results, total
+
+    async def _forget(self, simulation_ids: List[str]):
+        """Remove ids whose results expired before the index was trimmed."""
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for key in self._index_keys():
+                pipe.zrem(key, *simulation_ids)
+            await pipe.execute()
+        except Exception as e:
+            logger.warning("Failed to prune simulation index", error=str(e))
+
+    @staticmethod
+    def _index_keys() -> List[str]:
+        keys = [HISTORY_KEY]
+        keys += [ACTION_INDEX.format(value=a.value) for a in SimulationAction]
+        keys += [RISK_INDEX.format(value=r) for r in RISK_LEVELS]
+        keys += [STATUS_INDEX.format(value=s.value) for s in SimulationStatus]
+        return keys
@@ -0,0 +1,803 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+from scipy.sparse.csgraph import shortest_path
+
+from app.models.simulation import (
+    ImpactAnalysis, ScenarioStep, SimulationAction, SimulationRequest,
+    StepImpact
+)
+from app.services.availability import CONFIDENCE_Z, estimate_availability
+from app.services.baseline import BaselineAnalysis
+from app.services.connectivity_index import ConnectivityIndex
+from app.services.criticality import HIGH_CRITICALITY, MEDIUM_CRITICALITY
+from app.services.graph_core import (
+    CompactTopology, GraphLike, TopologyOverlay, as_compact
+)
+from app.services.link_models import LinkPerformanceModel, ThresholdModel
+from app.services.metrics import StageTimer
+from app.services.pair_sampling import SourceSampler
+from app.services.shortest_paths import IncrementalShortestPaths
+
+# Receives partial ImpactAnalysis fields as each part of the analysis finishes
+FragmentReporter = Callable[[Dict[str, Any]], None]
+
+# A request is the first step of its own scenario
+Step = Union[SimulationRequest, ScenarioStep]
+
+
+class ImpactAnalyzer:
+    """Impact analysis of scenario changes against a baseline topology.
+
+    Holds no connections or I/O state, so it can run in worker processes.
+    """
+    
+    # Processes sampling availability trials (1 samples inline)
+    sampling_workers = 1
+    
+    # Per-link loss and queueing delay; the threshold model adds no delay
+    link_model: LinkPerformanceModel = ThresholdModel()
+    
+    def evaluate(
+        self,
+        baseline: BaselineAnalysis,
+        request: SimulationRequest
+    ) -> ImpactAnalysis:
+        """Apply a request to the baseline topology and analyze its impact."""
+        modified_graph = self._apply_simulation_changes(
+            baseline.topology, request
+        )
+        return self._evaluate_impact(
+            baseline.topology, modified_graph, request, baseline
+        )
+    
+    def _apply_simulation_changes(
+        self, 
+        graph: GraphLike, 
+        request: SimulationRequest
+    ) -> TopologyOverlay:
+        """Apply simulation changes to network graph."""
+        modified_graph = as_compact(graph).overlay()
+        for step in self._scenario_steps(request):
+            self._apply_step(modified_graph, step)
+        return modified_graph
+    
+    @staticmethod
+    def _scenario_steps(request: SimulationRequest) -> List[Step]:
+        """The request's own change followed by its additional steps."""
+        return [request] + list(request.steps or [])
+    
+    def _apply_step(self, modified_graph: TopologyOverlay, step: Step):
+        """Apply one change to a scenario overlay in place."""
+        if step.action == SimulationAction.ADD_LINK:
+            if step.src and step.dst:
+                modified_graph.add_edge(
+                    step.src,
+                    step.dst,
+                    capacity=step.capacity or 1000,
+                    utilization=0.0,
+                    latency=step.latency or 3,
+                    cost=step.cost
+                )
+        
+        elif step.action == SimulationAction.REMOVE_LINK:
+            if step.src and step.dst:
+                if modified_graph.has_edge(step.src, step.dst):
+                    modified_graph.remove_edge(step.src, step.dst)
+        
+        elif step.action == SimulationAction.CHANGE_CAPACITY:
+            if step.src and step.dst:
+                if modified_graph.has_edge(step.src, step.dst):
+                    modified_graph.set_edge_attrs(
+                        step.src,
+                        step.dst,
+                        capacity=step.capacity or 1000
+                    )
+        
+        elif step.action == SimulationAction.ADD_NODE:
+            node = self._step_node(step)
+            parameters = step.parameters or {}
+            modified_graph.add_node(node, **parameters.get("attributes", {}))
+            
+            # Links to "neighbors", or to dst for a single uplink
+            neighbors = parameters.get("neighbors") or ([step.dst] if step.dst else [])
+            for neighbor in neighbors:
+                if not modified_graph.has_node(neighbor):
+                    raise ValueError(f"Unknown node: {neighbor}")
+                modified_graph.add_edge(
+                    node,
+                    neighbor,
+                    capacity=step.capacity or 1000,
+                    utilization=0.0,
+                    latency=step.latency or 3,
+                    cost=step.cost
+                )
+        
+        elif step.action == SimulationAction.REMOVE_NODE:
+            node = self._step_node(step)
+            if not modified_graph.has_node(node):
+                raise ValueError(f"Unknown node: {node}")
+            modified_graph.remove_node(node)
+        
+        elif step.action == SimulationAction.CHANGE_QOS:
+            self._apply_qos(modified_graph, step)
+        
+        elif step.action == SimulationAction.FAIL_SRLG:
+            self._apply_srlg_failure(modified_graph, step)
+    
+    @staticmethod
+    def _step_node(step: Step) -> str:
+        node = step.node_id or step.src
+        if not node:
+            raise ValueError(f"{step.action.value} requires node_id")
+        return node
+    
+    @staticmethod
+    def _apply_srlg_failure(modified_graph: TopologyOverlay, step: Step):
+        """Remove every link of the shared-risk link group ``parameters["srlg"]``."""
+        group = (step.parameters or {}).get("srlg")
+        if not group:
+            raise ValueError("fail_srlg requires parameters.srlg")
+        base = modified_graph.base
+        edge_ids = base.shared_risk_groups().get(str(group))
+        if edge_ids is None:
+            raise ValueError(f"Unknown SRLG: {group}")
+        for edge_id in edge_ids:
+            src = base.node_ids[base.src[edge_id]]
+            dst = base.node_ids[base.dst[edge_id]]
+            if modified_graph.has_edge(src, dst):
+                modified_graph.remove_edge(src, dst)
+    
+    def _apply_qos(self, modified_graph: TopologyOverlay, step: Step):
+        """Confine the simulated traffic to its class's share of links.
+        
+        Applies to the ``src``-``dst`` link, or every link of ``node_id``.
+        The class keeps its load but may only use ``bandwidth_share`` of
+        the link capacity, so its utilization rises accordingly.
+        """
+        share = float((step.parameters or {}).get("bandwidth_share", 1.0))
+        if not 0 < share <= 1:
+            raise ValueError("bandwidth_share must be in (0, 1]")
+        
+        if step.src and step.dst:
+            if not modified_graph.has_edge(step.src, step.dst):
+                raise ValueError(f"No link between {step.src} and {step.dst}")
+            links = [(step.src, step.dst, modified_graph[step.src][step.dst])]
+        else:
+            node = self._step_node(step)
+            if not modified_graph.has_node(node):
+                raise ValueError(f"Unknown node: {node}")
+            links = [
+                (node, neighbor, data)
+                for neighbor, data in modified_graph[node].items()
+            ]
+        
+        for src, dst, data in links:
+            modified_graph.set_edge_attrs(
+                src,
+                dst,
+                capacity=data["capacity"] * share,
+                utilization=data["utilization"] / share,
+                qos_class=step.qos_class,
+                bandwidth_share=share
+            )
+    
+    def _evaluate_impact(
+        self,
+        original_graph: GraphLike,
+        modified_graph: GraphLike,
+        request: SimulationRequest,
+        baseline: BaselineAnalysis,
+        report: Optional[FragmentReporter] = None,
+        timer: Optional[StageTimer] = None
+    ) -> ImpactAnalysis:
+        """Analyze impact of network changes against the cached baseline.
+
+        The baseline must describe ``original_graph``; building one here
+        would repeat the per-version work (criticality, all-pairs paths)
+        for a single request.
+        """
+        report = report or (lambda fragment: None)
+        timer = timer or StageTimer()
+        original_topology = as_compact(original_graph)
+        modified_topology = as_compact(modified_graph)
+        if (
+            baseline.topology is not original_topology
+            and baseline.version != original_topology.fingerprint()
+        ):
+            raise RuntimeError("Baseline analysis is for another topology version")
+        
+        if request.action == SimulationAction.AVAILABILITY:
+            with timer.stage("availability"):
+                return self._availability_impact(modified_topology, request)
+        
+        # Demand routing needs the change as an overlay over the baseline
+        if request.traffic_matrix and not (
+            isinstance(modified_graph, TopologyOverlay)
+            and modified_graph.base is original_topology
+        ):
+            modified_graph = baseline.latency_paths.overlay_for(modified_topology)
+            modified_topology = as_compact(modified_graph)
+        
+        # Multi-step scenarios are also walked one change at a time
+        steps, modified_distances = None, None
+        if request.steps:
+            with timer.stage("apsp"):
+                steps, modified_distances = self._step_impacts(request, baseline)
+            report({"steps": [step.model_dump(mode="json") for step in steps]})
+        
+        # Opt-in sampled estimates of latency and affected paths
+        sampler = self._source_sampler(
+            request, baseline, modified_graph, modified_topology
+        )
+        
+        # Calculate connectivity changes
+        original_connected = baseline.connected
+        with timer.stage("connectivity"):
+            modified_connected, disconnected_groups = self._connectivity_after(
+                baseline, modified_graph, modified_topology
+            )
+        
+        # Link utilization after the change, shifted by rerouted demands
+        with timer.stage("utilization"):
+            utilization, unrouted_traffic = self._calculate_utilization(
+                modified_graph, modified_topology, request, baseline
+            )
+        
+        # Find congested links (utilization > 0.8)
+        congested_links = [
+            modified_topology.edge_name(e)
+            for e in np.flatnonzero(utilization > 0.8)
+        ]
+        
+        # Calculate packet loss estimate
+        packet_loss = self._packet_loss(utilization)
+        report({
+            "congested_links": congested_links,
+            "packet_loss": packet_loss,
+            "unrouted_traffic": unrouted_traffic,
+            "disconnected_groups": disconnected_groups
+        })
+        
+        # Calculate latency impact
+        with timer.stage("apsp"):
+            latency_increase = self._calculate_latency_impact(
+                original_topology, modified_graph, baseline,
+                modified_distances, sampler
+            )
+        latency_interval = (
+            sampler.latency.interval
+            if sampler is not None and sampler.latency is not None else None
+        )
+        report({
+            "latency_increase": latency_increase,
+            "latency_interval": latency_interval
+        })
+        
+        # Determine risk level
+        risk_level = self._assess_risk_level(
+            original_connected, modified_connected, 
+            packet_loss, congested_links,
+            self._change_criticality(baseline, modified_graph)
+        )
+        
+        # Generate recommendations
+        recommendations = self._generate_recommendations(
+            request, risk_level, congested_links
+        )
+        report({"risk_level": risk_level, "recommendations": recommendations})
+        
+        with timer.stage("affected_paths"):
+            affected_paths = self._find_affected_paths(
+                original_topology, modified_topology, baseline, sampler
+            )
+        report({"affected_paths": affected_paths})
+        
+        approximation = {}
+        if sampler is not None:
+            approximation = {
+                "latency_interval": latency_interval,
+                "affected_pair_fraction": sampler.paths.mean,
+                "affected_pair_interval": sampler.paths.interval,
+                "sampled_sources": max(
+                    sampler.paths.sources,
+                    sampler.latency.sources if sampler.latency else 0
+                )
+            }
+        
+        return ImpactAnalysis(
+            affected_paths=affected_paths,
+            congested_links=congested_links,
+            packet_loss=packet_loss,
+            latency_increase=latency_increase,
+            redundancy_impact="improved" if modified_topology.edge_count > original_topology.edge_count else "reduced",
+            risk_level=risk_level,
+            recommendations=recommendations,
+            unrouted_traffic=unrouted_traffic,
+            steps=steps,
+            disconnected_groups=disconnected_groups,
+            **approximation
+        )
+    
+    def _connectivity_after(
+        self,
+        baseline: BaselineAnalysis,
+        modified_graph: GraphLike,
+        modified_topology: CompactTopology
+    ) -> Tuple[bool, List[List[str]]]:
+        """Whether the changed network is connected, and the groups it cut off.
+        
+        Attribute changes and the removal of a single link or node are
+        answered from the baseline's bridge and articulation-point index;
+        anything else falls back to labelling the changed topology.
+        """
+        index = baseline.connectivity
+        base = baseline.topology
+        if (
+            isinstance(modified_graph, TopologyOverlay)
+            and modified_graph.base is base
+            and modified_graph.node_count == base.node_count
+            and not modified_graph.edge_active[base.edge_count:].any()
+        ):
+            removed_links = np.flatnonzero(
+                ~modified_graph.edge_active[:base.edge_count]
+            )
+            removed_nodes = np.flatnonzero(
+                base.active_nodes & ~modified_graph.active_nodes
+            )
+            groups = None
+            if removed_nodes.size == 0 and removed_links.size <= 1:
+                groups = [
+                    group for e in removed_links
+                    for group in index.groups_without_link(e)
+                ]
+            elif removed_nodes.size == 1 and (
+                base.active_nodes.sum() > 1
+                and np.isin(removed_links, base.incident_edges(removed_nodes[0])[1]).all()
+            ):
+                groups = index.groups_without_node(removed_nodes[0])
+            if groups is not None:
+                return index.connected and not groups, [
+                    sorted(str(base.node_ids[i]) for i in group)
+                    for group in groups
+                ]
+        
+        return (
+            modified_topology.is_connected(),
+            self._new_components(index, modified_topology)
+        )
+    
+    @staticmethod
+    def _new_components(
+        index: ConnectivityIndex,
+        modified: CompactTopology
+    ) -> List[List[str]]:
+        """Components of a changed topology that did not exist before it.
+        
+        The largest new component is taken as the surviving network, so
+        only the groups split off from it are returned.
+        """
+        _, labels = modified.connected_components()
+        active = np.flatnonzero(modified.active_nodes)
+        known = active < index.labels.size
+        before = np.full(active.size, -1)
+        before[known] = index.labels[active[known]]
+        
+        groups = []
+        for label in np.unique(labels[active]):
+            members = active[labels[active] == label]
+            origin = before[labels[active] == label]
+            unchanged = (
+                (origin == origin[0]).all() and origin[0] >= 0
+                and index.component_sizes[origin[0]] == members.size
+            )
+            if not unchanged:
+                groups.append(members)
+        
+        groups.sort(key=len, reverse=True)
+        return [
+            sorted(str(modified.node_ids[i]) for i in group)
+            for group in groups[1:]
+        ]
+    
+    @staticmethod
+    def _source_sampler(
+        request: SimulationRequest,
+        baseline: BaselineAnalysis,
+        modified_graph: GraphLike,
+        modified_topology: CompactTopology
+    ) -> Optional[SourceSampler]:
+        """Sampler for requests with ``approximate`` set, else None.
+        
+        Sampling compares rows by node index, so it needs the change as an
+        overlay over the baseline; other graphs are analyzed exactly.
+        """
+        parameters = request.parameters or {}
+        if not parameters.get("approximate"):
+            return None
+        if not (
+            isinstance(modified_graph, TopologyOverlay)
+            and modified_graph.base is baseline.topology
+        ):
+            return None
+        return SourceSampler.from_parameters(
+            baseline, modified_graph, modified_topology, parameters
+        )
+    
+    def _timed_simulate_impact(
+        self,
+        baseline: BaselineAnalysis,
+        request: SimulationRequest,
+        report: Optional[FragmentReporter] = None
+    ) -> Tuple[ImpactAnalysis, Dict[str, float]]:
+        """Apply a request and analyze it, with the seconds spent per stage."""
+        timer = StageTimer()
+        with timer.stage("apply"):
+            modified_graph = self._apply_simulation_changes(
+                baseline.topology, request
+            )
+        impact = self._evaluate_impact(
+            baseline.topology, modified_graph, request, baseline, report, timer
+        )
+        return impact, timer.timings
+    
+    def _timed_evaluate_impact(
+        self,
+        original_graph: GraphLike,
+        modified_graph: GraphLike,
+        request: SimulationRequest,
+        baseline: BaselineAnalysis,
+        report: Optional[FragmentReporter] = None
+    ) -> Tuple[ImpactAnalysis, Dict[str, float]]:
+        """Analyze impact and return it with the seconds spent per stage."""
+        timer = StageTimer()
+        impact = self._evaluate_impact(
+            original_graph, modified_graph, request, baseline, report, timer
+        )
+        return impact, timer.timings
+    
+    def _availability_impact(
+        self,
+        topology: CompactTopology,
+        request: SimulationRequest
+    ) -> ImpactAnalysis:
+        """Monte Carlo availability under random link and node failures."""
+        estimate = estimate_availability(
+            topology, request, self.sampling_workers
+        )
+        margin = CONFIDENCE_Z * estimate.availability_stderr
+        
+        unavailability = 1.0 - estimate.availability
+        if unavailability > 0.01:
+            risk_level = "critical"
+        elif unavailability > 0.001:
+            risk_level = "high"
+        elif unavailability > 0.0001:
+            risk_level = "medium"
+        else:
+            risk_level = "low"
+        
+        recommendations = []
+        if risk_level in ("high", "critical"):
+            recommendations.append(
+                "Add redundant links or nodes to raise availability"
+            )
+        if estimate.expected_lost_traffic > 0:
+            recommendations.append(
+                f"Expected {estimate.expected_lost_traffic:.1f} Mbps of "
+                "traffic lost to failures"
+            )
+        if not recommendations:
+            recommendations.append("Network tolerates the failure model")
+        
+        return ImpactAnalysis(
+            risk_level=risk_level,
+            recommendations=recommendations,
+            availability=estimate.availability,
+            availability_interval=[
+                max(0.0, estimate.availability - margin),
+                min(1.0, estimate.availability + margin)
+            ],
+            expected_lost_traffic=estimate.expected_lost_traffic,
+            failure_trials=estimate.trials
+        )
+    
+    def _calculate_utilization(
+        self,
+        modified_graph: GraphLike,
+        modified_topology: CompactTopology,
+        request: SimulationRequest,
+        baseline: BaselineAnalysis
+    ) -> Tuple[np.ndarray, Optional[float]]:
+        """Calculate link utilization of the modified topology."""
+        if not request.traffic_matrix:
+            return modified_topology.utilization, None
+        
+        # Route the demand matrix over the scenario overlay
+        model = baseline.traffic_model(request.traffic_matrix)
+        utilization, unrouted = model.utilization_after(modified_graph)
+        
+        # Materialized links are the active overlay links in id order
+        return utilization[modified_graph.edge_active], unrouted
+    
+    def _calculate_packet_loss(self, graph: GraphLike) -> float:
+        """Calculate estimated packet loss."""
+        return self._packet_loss(as_compact(graph).utilization)
+    
+    def _packet_loss(self, utilization: np.ndarray) -> float:
+        """Average packet loss over links from their utilization."""
+        loss = self.link_model.loss(utilization)
+        
+        return float(loss.sum()) / max(utilization.size, 1)
+    
+    def _calculate_latency_impact(
+        self, 
+        original_graph: GraphLike, 
+        modified_graph: GraphLike,
+        baseline: Optional[BaselineAnalysis] = None,
+        modified_distances: Optional[np.ndarray] = None,
+        sampler: Optional[SourceSampler] = None
+    ) -> float:
+        """Calculate latency impact.
+        
+        With a ``sampler`` and no precomputed distances, the mean is
+        estimated from sampled sources instead of all pairs.
+        """
+        try:
+            if sampler is not None and modified_distances is None:
+                return sampler.latency_change().mean
+            
+            # Baseline APSP once, then update only the affected source trees
+            if baseline is not None:
+                engine = baseline.latency_paths
+            else:
+                engine = IncrementalShortestPaths(
+                    original_graph, weight="latency", link_model=self.link_model
+                )
+            if modified_distances is None:
+                modified_distances = engine.distances_after(modified_graph)
+            return self._mean_latency_change(engine.distances, modified_distances)
+        
+        except Exception:
+            return 0.0
+    
+    @staticmethod
+    def _mean_latency_change(before: np.ndarray, after: np.ndarray) -> float:
+        """Mean distance change over pairs reachable before and after."""
+        node_count = before.shape[0]
+        after = after[:node_count, :node_count]
+        
+        # Only compare pairs reachable before and after the change
+        reachable = np.isfinite(before) & np.isfinite(after)
+        np.fill_diagonal(reachable, False)
+        
+        path_count = int(reachable.sum())
+        if path_count == 0:
+            return 0.0
+        
+        total_latency_change = float((after[reachable] - before[reachable]).sum())
+        return total_latency_change / path_count
+    
+    def _step_impacts(
+        self,
+        request: SimulationRequest,
+        baseline: BaselineAnalysis
+    ) -> Tuple[List[StepImpact], np.ndarray]:
+        """Apply scenario steps one at a time and report each step's delta.
+        
+        Shortest paths are carried from step to step, so a step only
+        recomputes the sources its own change affects. Returns the step
+        impacts and the distances after the last step.
+        """
+        engine = baseline.latency_paths
+        overlay = baseline.topology.overlay()
+        distances = engine.distances
+        active, weights = overlay.edge_active, engine.weights
+        reachable_before = np.isfinite(engine.distances)
+        traffic = (
+            baseline.traffic_model(request.traffic_matrix)
+            if request.traffic_matrix else None
+        )
+        previous_congested = {
+            baseline.topology.edge_name(e)
+            for e in np.flatnonzero(baseline.topology.utilization > 0.8)
+        }
+        
+        impacts = []
+        for number, step in enumerate(self._scenario_steps(request), start=1):
+            self._apply_step(overlay, step)
+            updated = engine.update(distances, active, weights, overlay)
+            active = overlay.edge_active
+            
+            if traffic is None:
+                utilization = overlay.column("utilization")
+            else:
+                utilization, _ = traffic.utilization_after(overlay)
+            congested = {
+                self._overlay_edge_name(overlay, e)
+                for e in np.flatnonzero(active & (utilization > 0.8))
+            }
+            
+            nodes = overlay.active_nodes
+            connected = bool(nodes.any()) and bool(
+                np.isfinite(updated[np.ix_(nodes, nodes)]).all()
+            )
+            base_nodes = reachable_before.shape[0]
+            lost_pairs = reachable_before & ~np.isfinite(
+                updated[:base_nodes, :base_nodes]
+            )
+            risk_level = self._assess_risk_level(
+                baseline.connected, connected,
+                self._packet_loss(utilization[active]), sorted(congested),
+                baseline.criticality.change_score(overlay)
+            )
+            
+            impacts.append(StepImpact(
+                step=number,
+                action=step.action,
+                target=(
+                    f"{step.src}-{step.dst}" if step.src and step.dst
+                    else step.node_id or step.src
+                    or str((step.parameters or {}).get("srlg", ""))
+                ),
+                latency_increase=self._mean_latency_change(distances, updated),
+                cumulative_latency_increase=self._mean_latency_change(
+                    engine.distances, updated
+                ),
+                disconnected_pairs=int(lost_pairs.sum()),
+                congested_links=sorted(congested),
+                new_congested_links=sorted(congested - previous_congested),
+                risk_level=risk_level
+            ))
+            
+            distances, weights = updated, engine.link_weights(overlay)
+            previous_congested = congested
+        
+        return impacts, distances
+    
+    @staticmethod
+    def _overlay_edge_name(overlay: TopologyOverlay, edge_id: int) -> str:
+        """Return the ``src-dst`` label of a base or added overlay link."""
+        base = overlay.base
+        if edge_id < base.edge_count:
+            return base.edge_name(edge_id)
+        added_src, added_dst = overlay.added_edges
+        offset = edge_id - base.edge_count
+        node_ids = overlay.node_ids
+        return f"{node_ids[added_src[offset]]}-{node_ids[added_dst[offset]]}"
+    
+    def _find_affected_paths(
+        self, 
+        original_graph: GraphLike, 
+        modified_graph: GraphLike,
+        baseline: Optional[BaselineAnalysis] = None,
+        sampler: Optional[SourceSampler] = None
+    ) -> List[str]:
+        """Find paths affected by the change.
+        
+        With a ``sampler``, only the sampled sources' paths are compared
+        and the share of changed paths is estimated on the sampler.
+        """
+        original_topology = as_compact(original_graph)
+        modified_topology = as_compact(modified_graph)
+        node_count = original_topology.node_count
+        if sampler is not None:
+            sampler.affected_pairs()
+            return sampler.affected_paths
+        if node_count < 2:
+            return []
+        
+        # Hop-count shortest-path trees for every source
+        if baseline is not None:
+            original_hops, original_pred = baseline.hops, baseline.predecessors
+        else:
+            original_hops, original_pred = shortest_path(
+                original_topology.weight_matrix(), directed=False,
+                unweighted=True, return_predecessors=True
+            )
+        modified_hops, modified_pred = shortest_path(
+            modified_topology.weight_matrix(), directed=False,
+            unweighted=True, return_predecessors=True
+        )
+        modified_hops = modified_hops[:node_count, :node_count]
+        
+        # A path is unchanged when its last hop and the path to that hop are
+        # unchanged, so resolve pairs level by level in hop order
+        same = original_pred == modified_pred[:node_count, :node_count]
+        reachable = np.isfinite(original_hops) & np.isfinite(modified_hops)
+        if reachable.any():
+            max_hops = int(original_hops[reachable].max())
+            for hops in range(2, max_hops + 1):
+                src, dst = np.nonzero(original_hops == hops)
+                same[src, dst] &= same[src, original_pred[src, dst]]
+        
+        affected = np.triu(reachable & ~same, k=1)
+        node_ids = modified_topology.node_ids
+        affected_paths = []
+        for src, dst in zip(*np.nonzero(affected)):
+            path = [dst]
+            while path[-1] != src:
+                path.append(modified_pred[src, path[-1]])
+            affected_paths.append(
+                " -> ".join(str(node_ids[i]) for i in reversed(path))
+            )
+            if len(affected_paths) == 10:  # Limit to first 10 paths
+                break
+        
+        return affected_paths
+    
+    def _assess_risk_level(
+        self,
+        original_connected: bool,
+        modified_connected: bool,
+        packet_loss: float,
+        congested_links: List[str],
+        criticality: float = 0.0
+    ) -> str:
+        """Assess risk level of the change.
+        
+        ``criticality`` is the highest criticality score among the links
+        and nodes the change removes or shrinks.
+        """
+        if not modified_connected and original_connected:
+            return "critical"
+        
+        if (
+            packet_loss > 0.05 or len(congested_links) > 3
+            or criticality >= HIGH_CRITICALITY
+        ):
+            return "high"
+        
+        if (
+            packet_loss > 0.01 or len(congested_links) > 1
+            or criticality >= MEDIUM_CRITICALITY
+        ):
+            return "medium"
+        
+        return "low"
+    
+    @staticmethod
+    def _change_criticality(
+        baseline: BaselineAnalysis,
+        modified_graph: GraphLike
+    ) -> float:
+        """Criticality score of the most critical element a change degrades."""
+        if not (
+            isinstance(modified_graph, TopologyOverlay)
+            and modified_graph.base is baseline.topology
+        ):
+            modified_graph = baseline.latency_paths.overlay_for(
+                as_compact(modified_graph)
+            )
+        return baseline.criticality.change_score(modified_graph)
+    
+    def _generate_recommendations(
+        self,
+        request: SimulationRequest,
+        risk_level: str,
+        congested_links: List[str]
+    ) -> List[str]:
+        """Generate recommendations based on simulation results."""
+        recommendations = []
+        
+        if risk_level == "critical":
+            recommendations.append("Change causes network partitioning - not recommended")
+        
+        if risk_level == "high":
+            recommendations.append("Consider implementing QoS policies")
+            recommendations.append("Monitor traffic patterns closely")
+        
+        if congested_links:
+            recommendations.append(f"Consider upgrading capacity on: {', '.join(congested_links[:3])}")
+        
+        if request.action == SimulationAction.ADD_LINK:
+            recommendations.append("New link improves redundancy")
+            recommendations.append("Configure appropriate routing metrics")
+        
+        if request.action == SimulationAction.FAIL_SRLG and risk_level in ("critical", "high"):
+            recommendations.append("Route protection paths outside the shared-risk group")
+        
+        if not recommendations:
+            recommendations.append("Change appears safe to implement")
+        
+        return recommendations
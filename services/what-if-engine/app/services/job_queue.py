@@ -0,0 +1,354 @@
+import asyncio
+import os
+import socket
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+import structlog
+
+from app.core.config import settings
+from app.core.logging import log_simulation_event
+from app.models.simulation import (
+    SimulationRequest, SimulationResult, SimulationStatus
+)
+from app.services.simulation_engine import (
+    FINAL_STATES, NetworkSimulator, SimulationCancelled, get_simulator
+)
+
+logger = structlog.get_logger()
+
+# Redis stream of submitted simulations and its consumer group
+JOB_STREAM_KEY = "simulation:jobs"
+JOB_CONSUMER_GROUP = "what-if-engine"
+
+# Cancellation flag visible to workers on every replica
+CANCEL_KEY = "simulation:{simulation_id}:cancel"
+
+# Abandoned jobs taken over per XAUTOCLAIM call
+RECLAIM_BATCH = 100
+
+
+class SimulationJobQueue:
+    """Asynchronous simulation jobs with cancellation and timeouts.
+
+    Submission stores a PENDING result and enqueues the request, either on
+    a Redis stream consumed by every what-if replica through a consumer
+    group, or on an in-process queue. Workers move jobs through RUNNING to
+    a final state, stop cancelled jobs at the next stage boundary and fail
+    jobs that exceed ``MAX_SIMULATION_TIME``.
+
+    The stream is trimmed to about ``max_length`` entries. Jobs left
+    unacknowledged for ``claim_idle`` seconds, because the replica running
+    them died, are reclaimed on start-up and every ``reclaim_interval``
+    seconds: jobs that never started are queued again, started ones are
+    marked FAILED rather than re-run.
+    """
+
+    def __init__(
+        self,
+        simulator: NetworkSimulator,
+        backend: str = "redis",
+        workers: int = 2,
+        timeout: float = 300,
+        max_length: int = 10000,
+        claim_idle: float = 600,
+        reclaim_interval: float = 60
+    ):
+        if backend not in ("redis", "memory"):
+            raise ValueError(f"Unknown job queue backend: {backend}")
+        self.simulator = simulator
+        self.redis_client = simulator.redis_client
+        self.backend = backend
+        self.worker_count = max(1, workers)
+        self.timeout = timeout
+        self.max_length = max_length
+        self.claim_idle = claim_idle
+        self.reclaim_interval = reclaim_interval
+        self.consumer = f"{socket.gethostname()}-{os.getpid()}"
+
+        self._local_queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._running: Dict[str, asyncio.Task] = {}
+        self._cancel_requested: Set[str] = set()
+
+    async def submit(self, request: SimulationRequest) -> SimulationResult:
+        """Enqueue a simulation and return its PENDING result."""
+        await self.start()
+        result = SimulationResult(
+            status=SimulationStatus.PENDING,
+            request=request
+        )
+        await self.simulator._cache_simulation(result)
+
+        if self.backend == "redis":
+            await self._enqueue(result.simulation_id, request)
+        else:
+            await self._local_queue.put((None, result.simulation_id, request))
+
+        log_simulation_event(
+            "simulation_queued",
+            simulation_id=result.simulation_id,
+            action=request.action.value
+        )
+        return result
+
+    async def cancel(self, simulation_id: str) -> Optional[SimulationResult]:
+        """Request cancellation; returns the job's result, None if unknown."""
+        result = await self.simulator.get_simulation_result(simulation_id)
+        if result is None or result.status in FINAL_STATES:
+            return result
+
+        # Flag for workers on any replica, checked at stage boundaries
+        await self.redis_client.setex(
+            CANCEL_KEY.format(simulation_id=simulation_id),
+            settings.SIMULATION_CACHE_TTL,
+            "1"
+        )
+
+        if result.status == SimulationStatus.PENDING:
+            # Not picked up yet: the worker skips it on dequeue
+            result.status = SimulationStatus.CANCELLED
+            await self.simulator._cache_simulation(result)
+        elif simulation_id in self._running:
+            # Running here: stop waiting on the analysis right away
+            self._cancel_requested.add(simulation_id)
+            self._running[simulation_id].cancel()
+
+        log_simulation_event("simulation_cancel_requested", simulation_id=simulation_id)
+        return result
+
+    async def start(self):
+        """Start the worker tasks (idempotent)."""
+        if self._workers:
+            return
+        if self.backend == "redis":
+            await self._ensure_group()
+        else:
+            self._local_queue = asyncio.Queue()
+        self._workers = [
+            asyncio.create_task(self._worker(index))
+            for index in range(self.worker_count)
+        ]
+        if self.backend == "redis":
+            self._workers.append(asyncio.create_task(self._reclaimer()))
+        logger.info(
+            "Simulation job workers started",
+            backend=self.backend,
+            workers=self.worker_count
+        )
+
+    async def stop(self):
+        """Stop the worker tasks."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def _worker(self, index: int):
+        """Pull jobs and run them until stopped."""
+        while True:
+            try:
+                job = await self._next_job()
+                if job is None:
+                    continue
+                message_id, simulation_id, request = job
+                await self._run_job(simulation_id, request)
+
+                # Ack only once a final state is stored; a job interrupted
+                # by a stopping worker stays pending for the reclaimer
+                if message_id is not None:
+                    await self.redis_client.xack(
+                        JOB_STREAM_KEY, JOB_CONSUMER_GROUP, message_id
+                    )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Simulation job worker error", worker=index, error=str(e))
+                await asyncio.sleep(1)
+
+    async def _reclaimer(self):
+        """Reclaim abandoned jobs now and then periodically until stopped."""
+        while True:
+            try:
+                reclaimed = await self._reclaim_stale_jobs()
+                if reclaimed:
+                    logger.info("Reclaimed abandoned simulation jobs", jobs=reclaimed)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Failed to reclaim simulation jobs", error=str(e))
+            await asyncio.sleep(self.reclaim_interval)
+
+    async def _reclaim_stale_jobs(self) -> int:
+        """Take over jobs pending longer than ``claim_idle``; returns the count."""
+        reclaimed = 0
+        start_id = "0-0"
+        while True:
+            response = await self.redis_client.xautoclaim(
+                JOB_STREAM_KEY, JOB_CONSUMER_GROUP, self.consumer,
+                min_idle_time=int(self.claim_idle * 1000),
+                start_id=start_id, count=RECLAIM_BATCH
+            )
+            start_id, messages = response[0], response[1]
+            for message_id, fields in messages:
+                # Entries trimmed from the stream come back without fields
+                if fields:
+                    await self._recover_job(fields)
+                    reclaimed += 1
+                await self.redis_client.xack(
+                    JOB_STREAM_KEY, JOB_CONSUMER_GROUP, message_id
+                )
+            if start_id in ("0-0", b"0-0"):
+                return reclaimed
+
+    async def _recover_job(self, fields: Dict[str, str]):
+        """Queue a reclaimed job again, or fail it if it had started."""
+        simulation_id = fields["simulation_id"]
+        request = SimulationRequest.model_validate_json(fields["request"])
+        result = await self.simulator.get_simulation_result(simulation_id)
+        if result is None or result.status == SimulationStatus.PENDING:
+            await self._enqueue(simulation_id, request)
+        elif result.status == SimulationStatus.RUNNING:
+            # It may be what brought the worker down, so do not run it again
+            await self._finish(
+                simulation_id, request, SimulationStatus.FAILED,
+                error_message="Simulation worker stopped before finishing"
+            )
+        log_simulation_event(
+            "simulation_reclaimed",
+            simulation_id=simulation_id,
+            status=result.status.value if result else None
+        )
+
+    async def _enqueue(self, simulation_id: str, request: SimulationRequest):
+        """Append a job to the stream, trimming old entries."""
+        await self.redis_client.xadd(
+            JOB_STREAM_KEY,
+            {
+                "simulation_id": simulation_id,
+                "request": request.model_dump_json()
+            },
+            maxlen=self.max_length,
+            approximate=True
+        )
+
+    async def _run_job(self, simulation_id: str, request: SimulationRequest):
+        """Run one job through RUNNING to a final state."""
+        if await self._is_cancelled(simulation_id):
+            await self._finish(simulation_id, request, SimulationStatus.CANCELLED)
+            return
+
+        async def checkpoint():
+            if await self._is_cancelled(simulation_id):
+                raise SimulationCancelled(simulation_id)
+
+        # The timeout stops waiting on the job; an analysis stage already
+        # on a worker finishes in the background and its result is dropped
+        start_time = time.time()
+        task = asyncio.create_task(asyncio.wait_for(
+            self.simulator.simulate(request, simulation_id, checkpoint),
+            timeout=self.timeout
+        ))
+        self._running[simulation_id] = task
+        try:
+            await task
+        except asyncio.TimeoutError:
+            log_simulation_event(
+                "simulation_timed_out",
+                simulation_id=simulation_id,
+                timeout=self.timeout
+            )
+            await self._finish(
+                simulation_id, request, SimulationStatus.FAILED,
+                error_message=f"Simulation exceeded {self.timeout:g}s time limit",
+                execution_time=time.time() - start_time
+            )
+        except asyncio.CancelledError:
+            if simulation_id not in self._cancel_requested:
+                raise  # The worker itself is stopping
+            await self._finish(
+                simulation_id, request, SimulationStatus.CANCELLED,
+                execution_time=time.time() - start_time
+            )
+        finally:
+            self._running.pop(simulation_id, None)
+            self._cancel_requested.discard(simulation_id)
+
+    async def _finish(
+        self,
+        simulation_id: str,
+        request: SimulationRequest,
+        status: SimulationStatus,
+        **fields
+    ):
+        """Store a final result for a job that did not complete normally."""
+        await self.simulator._cache_simulation(SimulationResult(
+            simulation_id=simulation_id,
+            status=status,
+            request=request,
+            **fields
+        ))
+
+    async def _is_cancelled(self, simulation_id: str) -> bool:
+        try:
+            return bool(await self.redis_client.get(
+                CANCEL_KEY.format(simulation_id=simulation_id)
+            ))
+        except Exception as e:
+            logger.warning("Failed to read cancellation flag", error=str(e))
+            return False
+
+    async def _next_job(self) -> Optional[Tuple[Optional[str], str, SimulationRequest]]:
+        """Wait for the next job from the configured backend."""
+        if self.backend == "memory":
+            return await self._local_queue.get()
+
+        response = await self.redis_client.xreadgroup(
+            JOB_CONSUMER_GROUP, self.consumer,
+            {JOB_STREAM_KEY: ">"}, count=1, block=5000
+        )
+        for _, messages in response or []:
+            for message_id, fields in messages:
+                return (
+                    message_id,
+                    fields["simulation_id"],
+                    SimulationRequest.model_validate_json(fields["request"])
+                )
+        return None
+
+    async def _ensure_group(self):
+        """Create the consumer group and stream if missing."""
+        try:
+            await self.redis_client.xgroup_create(
+                JOB_STREAM_KEY, JOB_CONSUMER_GROUP, id="0", mkstream=True
+            )
+        except Exception as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+
+_job_queue: Optional[SimulationJobQueue] = None
+
+
+def get_job_queue() -> SimulationJobQueue:
+    """Get the process-wide simulation job queue."""
+    global _job_queue
+    if _job_queue is None:
+        _job_queue = SimulationJobQueue(
+            get_simulator(),
+            backend=settings.JOB_QUEUE_BACKEND,
+            workers=settings.JOB_WORKERS,
+            timeout=settings.MAX_SIMULATION_TIME,
+            max_length=settings.JOB_STREAM_MAXLEN,
+            claim_idle=settings.JOB_CLAIM_IDLE,
+            reclaim_interval=settings.JOB_RECLAIM_INTERVAL
+        )
+    return _job_queue
+
+
+async def shutdown_job_queue():
+    """Stop the process-wide job queue workers."""
+    global _job_queue
+    if _job_queue is not None:
+        await _job_queue.stop()
+        _job_queue = None
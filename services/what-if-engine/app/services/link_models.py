@@ -0,0 +1,174 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Type
+
+import numpy as np
+
+# Mean packet size used to turn link capacity (Mbps) into service time
+DEFAULT_PACKET_BYTES = 1500
+
+# Queue depth of the finite-buffer model (packets)
+DEFAULT_BUFFER_PACKETS = 64
+
+# Queueing delay reported for saturated links without a finite buffer (ms)
+SATURATED_DELAY_MS = 1000.0
+
+
+class LinkPerformanceModel(ABC):
+    """Per-link loss and queueing delay from utilization.
+
+    Every method takes whole link columns and returns one value per link,
+    so a model costs a few NumPy passes whatever the topology size.
+    """
+
+    name = ""
+
+    def __init__(self, packet_bytes: float = DEFAULT_PACKET_BYTES):
+        self.packet_bytes = packet_bytes
+
+    def config(self) -> Dict[str, Any]:
+        """Name and parameters, everything the model's results depend on."""
+        return {"name": self.name, "packet_bytes": self.packet_bytes}
+
+    @abstractmethod
+    def loss(self, utilization: np.ndarray) -> np.ndarray:
+        """Fraction of offered packets dropped on each link."""
+
+    @abstractmethod
+    def delay(self, utilization: np.ndarray, capacity: np.ndarray) -> np.ndarray:
+        """Mean queueing delay (ms) on each link, excluding propagation."""
+
+    def service_time(self, capacity: np.ndarray) -> np.ndarray:
+        """Transmission time of one packet (ms); 0 where capacity is unknown."""
+        capacity = np.asarray(capacity, dtype=float)
+        known = np.isfinite(capacity) & (capacity > 0)
+        return np.divide(
+            self.packet_bytes * 8 / 1000.0, capacity,
+            out=np.zeros_like(capacity), where=known
+        )
+
+    @staticmethod
+    def _load(utilization: np.ndarray) -> np.ndarray:
+        return np.clip(np.nan_to_num(np.asarray(utilization, dtype=float)), 0.0, None)
+
+
+class ThresholdModel(LinkPerformanceModel):
+    """Loss rising linearly above 80% utilization, no queueing delay."""
+
+    name = "threshold"
+
+    def loss(self, utilization: np.ndarray) -> np.ndarray:
+        # Linear increase in loss above 80% utilization, capped at 10%
+        return np.clip((self._load(utilization) - 0.8) * 0.5, 0.0, 0.1)
+
+    def delay(self, utilization: np.ndarray, capacity: np.ndarray) -> np.ndarray:
+        return np.zeros(np.shape(utilization))
+
+
+class MM1Model(LinkPerformanceModel):
+    """M/M/1 queue: Poisson arrivals, exponential packet sizes.
+
+    The buffer is unbounded, so only offered load above capacity is lost,
+    and saturated links report ``SATURATED_DELAY_MS``.
+    """
+
+    name = "mm1"
+
+    # Waiting time relative to M/M/1 (M/D/1 halves it)
+    wait_factor = 1.0
+
+    def loss(self, utilization: np.ndarray) -> np.ndarray:
+        load = self._load(utilization)
+        return np.divide(
+            load - 1.0, load, out=np.zeros_like(load), where=load > 1.0
+        )
+
+    def delay(self, utilization: np.ndarray, capacity: np.ndarray) -> np.ndarray:
+        load = self._load(utilization)
+        service = self.service_time(capacity)
+        stable = load < 1.0
+        wait = np.divide(
+            self.wait_factor * service * load, 1.0 - load,
+            out=np.zeros_like(load), where=stable
+        )
+        return np.where(stable | (service == 0), wait, SATURATED_DELAY_MS)
+
+
+class MD1Model(MM1Model):
+    """M/D/1 queue: constant packet sizes halve the M/M/1 waiting time."""
+
+    name = "md1"
+    wait_factor = 0.5
+
+
+class MM1KModel(LinkPerformanceModel):
+    """M/M/1/K queue: a finite buffer of ``buffer_packets`` packets.
+
+    Loss is the probability of arriving to a full buffer, and delay stays
+    bounded by the buffer drain time even past saturation.
+    """
+
+    name = "mm1k"
+
+    def __init__(
+        self,
+        packet_bytes: float = DEFAULT_PACKET_BYTES,
+        buffer_packets: int = DEFAULT_BUFFER_PACKETS
+    ):
+        super().__init__(packet_bytes)
+        self.buffer_packets = buffer_packets
+
+    def config(self) -> Dict[str, Any]:
+        return {**super().config(), "buffer_packets": self.buffer_packets}
+
+    def loss(self, utilization: np.ndarray) -> np.ndarray:
+        return self._blocking(self._load(utilization))
+
+    def delay(self, utilization: np.ndarray, capacity: np.ndarray) -> np.ndarray:
+        load = self._load(utilization)
+        service = self.service_time(capacity)
+        k = self.buffer_packets
+
+        # Mean number in system, in a form that stays finite for load > 1
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            below = load / (1.0 - load) - (k + 1) * load ** (k + 1) / (1.0 - load ** (k + 1))
+            r = 1.0 / load
+            above = (k + 1) / (1.0 - r ** (k + 1)) - 1.0 / (1.0 - r)
+        in_system = np.where(load < 1.0, below, above)
+        in_system = np.where(np.isclose(load, 1.0), k / 2.0, in_system)
+
+        # Little's law over the admitted rate, minus the packet's own service
+        admitted = load * (1.0 - self._blocking(load))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sojourn = in_system * service / admitted
+        wait = np.where(admitted > 0, sojourn - service, 0.0)
+        return np.clip(np.nan_to_num(wait), 0.0, None)
+
+    def _blocking(self, load: np.ndarray) -> np.ndarray:
+        """Probability that the buffer is full."""
+        k = self.buffer_packets
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            below = (1.0 - load) * load ** k / (1.0 - load ** (k + 1))
+            r = 1.0 / load
+            above = (1.0 - r) / (1.0 - r ** (k + 1))
+        blocking = np.where(load < 1.0, below, above)
+        blocking = np.where(np.isclose(load, 1.0), 1.0 / (k + 1), blocking)
+        return np.where(load > 0, blocking, 0.0)
+
+
+LINK_MODELS: Dict[str, Type[LinkPerformanceModel]] = {
+    model.name: model
+    for model in (ThresholdModel, MM1Model, MD1Model, MM1KModel)
+}
+
+
+def create_link_model(
+    name: str,
+    buffer_packets: int = DEFAULT_BUFFER_PACKETS
+) -> LinkPerformanceModel:
+    """Instantiate a link performance model by name."""
+    model = LINK_MODELS.get(name)
+    if model is None:
+        raise ValueError(f"Unknown link performance model: {name}")
+    if model is MM1KModel:
+        return MM1KModel(buffer_packets=buffer_packets)
+    return model()
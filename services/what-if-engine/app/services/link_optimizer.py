@@ -0,0 +1,381 @@
+import time
+import uuid
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+from app.models.simulation import (
+    LinkAddition, LinkOptimizationRequest, LinkOptimizationResult,
+    OptimizationObjective, ScenarioStep, SimulationAction, SimulationRequest,
+    TrafficDemand
+)
+from app.services.baseline import BaselineAnalysis
+from app.services.executor import fan_out, release_shared
+from app.services.impact_analyzer import ImpactAnalyzer
+from app.services.shortest_paths import IncrementalShortestPaths
+
+# Improvements at or below this are ties
+TOLERANCE = 1e-9
+
+# Candidate ids, in the order they are added
+Selection = Tuple[int, ...]
+
+
+class LatencyObjective:
+    """Mean latency over the pairs reachable in the baseline.
+
+    The state of a selection is its distance matrix. Adding a link relaxes
+    every pair through it once, so each step of the search is one O(n^2)
+    pass instead of a new all-pairs computation.
+    """
+
+    def __init__(
+        self,
+        distances: np.ndarray,
+        src: np.ndarray,
+        dst: np.ndarray,
+        weights: np.ndarray
+    ):
+        self.distances = distances
+        self.src = src
+        self.dst = dst
+        self.weights = weights
+        self.reachable = np.isfinite(distances)
+        self.connected = bool(self.reachable.all())
+        self.pairs = max(
+            int(np.count_nonzero(self.reachable)) - distances.shape[0], 1
+        )
+
+    def initial(self) -> np.ndarray:
+        return self.distances
+
+    def extend(self, state: np.ndarray, candidate: int) -> np.ndarray:
+        extended = state.copy()
+        IncrementalShortestPaths._relax_edge(
+            extended, int(self.src[candidate]), int(self.dst[candidate]),
+            float(self.weights[candidate])
+        )
+        return extended
+
+    def value(self, state: np.ndarray) -> float:
+        if self.connected:
+            return float(state.sum() / self.pairs)
+        return float(np.where(self.reachable, state, 0.0).sum() / self.pairs)
+
+    def bound(self, state: np.ndarray, remaining: List[int]) -> float:
+        """Value with every remaining candidate added.
+
+        Distances only shrink as links are added, so no subset of the
+        remaining candidates can do better.
+        """
+        relaxed = state.copy()
+        for candidate in remaining:
+            IncrementalShortestPaths._relax_edge(
+                relaxed, int(self.src[candidate]), int(self.dst[candidate]),
+                float(self.weights[candidate])
+            )
+        return self.value(relaxed)
+
+
+class PeakUtilizationObjective:
+    """Peak link utilization with a demand matrix routed over the links.
+
+    The state of a selection is the selection itself; each value re-routes
+    only the demands whose ECMP DAG the new links can change. Peak
+    utilization is not monotone in the added links, so the bound is the
+    floor set by background traffic, which no new link can move.
+    """
+
+    def __init__(
+        self,
+        baseline: BaselineAnalysis,
+        analyzer: ImpactAnalyzer,
+        scenario: Callable[[Selection], SimulationRequest],
+        demands: List[TrafficDemand]
+    ):
+        self.topology = baseline.topology
+        self.analyzer = analyzer
+        self.scenario = scenario
+        self.model = baseline.traffic_model(demands)
+
+        capacity = self.topology.capacity
+        floor = np.divide(
+            self.model.background, capacity,
+            out=np.zeros_like(self.model.background), where=capacity > 0
+        )
+        self.floor = float(floor.max()) if floor.size else 0.0
+
+    def initial(self) -> Selection:
+        return ()
+
+    def extend(self, state: Selection, candidate: int) -> Selection:
+        return state + (candidate,)
+
+    def value(self, state: Selection) -> float:
+        if state:
+            overlay = self.analyzer._apply_simulation_changes(
+                self.topology, self.scenario(state)
+            )
+        else:
+            overlay = self.topology.overlay()
+        utilization, _ = self.model.utilization_after(overlay)
+        active = utilization[overlay.edge_active]
+        return float(active.max()) if active.size else 0.0
+
+    def bound(self, state: Selection, remaining: List[int]) -> float:
+        return self.floor
+
+
+class LinkOptimizer:
+    """Budgeted search for the link additions that best improve an objective.
+
+    A greedy pass adds the candidate with the largest improvement per unit
+    of price until the budget, ``max_links`` or the improvements run out.
+    Its result is the incumbent of a depth-first branch-and-bound over
+    candidate subsets, which drops a branch when even adding every
+    remaining affordable candidate cannot beat the incumbent. Candidate
+    values of the greedy rounds are evaluated across a process pool.
+    """
+
+    def __init__(
+        self,
+        baseline: BaselineAnalysis,
+        request: LinkOptimizationRequest,
+        analyzer: Optional[ImpactAnalyzer] = None
+    ):
+        self.baseline = baseline
+        self.request = request
+        self.analyzer = analyzer or ImpactAnalyzer()
+        self.topology = baseline.topology
+        self.candidates = request.candidates
+        self._validate_candidates()
+        self.prices = np.array([c.price for c in self.candidates], dtype=float)
+
+        if request.objective == OptimizationObjective.LATENCY:
+            # Every candidate as one ADD_LINK scenario, for the link weights
+            overlay = self.analyzer._apply_simulation_changes(
+                self.topology, self._scenario(tuple(range(len(self.candidates))))
+            )
+            engine = baseline.latency_paths
+            added_src, added_dst = overlay.added_edges
+            self.objective = LatencyObjective(
+                engine.distances, added_src, added_dst,
+                engine.link_weights(overlay)[self.topology.edge_count:]
+            )
+        else:
+            if not request.traffic_matrix:
+                raise ValueError("peak_utilization objective needs a traffic_matrix")
+            self.objective = PeakUtilizationObjective(
+                baseline, self.analyzer, self._scenario, request.traffic_matrix
+            )
+
+        self.baseline_value = self.objective.value(self.objective.initial())
+        self.best: Selection = ()
+        self.best_value = self.baseline_value
+        self.evaluations = 0
+        self.pruned = 0
+        self.truncated = False
+        self._cached: Tuple[Optional[Selection], object] = (None, None)
+
+    def run(self, max_workers: int = 1) -> LinkOptimizationResult:
+        """Greedy incumbent, then branch-and-bound towards the optimum."""
+        start_time = time.time()
+
+        # Greedy rounds fan candidates out to the shared compute pool,
+        # which keeps this optimizer resident for the whole run
+        key = f"link-optimizer-{uuid.uuid4().hex}"
+        try:
+            greedy, order = self._greedy(
+                lambda selection, options: np.array(fan_out(
+                    _evaluate_option, self, options, max_workers,
+                    key=key, args=(selection,)
+                ))
+            )
+        finally:
+            release_shared(key)
+
+        greedy_value = self._selection_values(greedy)[-1]
+        self.best, self.best_value = greedy, greedy_value
+        self._branch((), self.objective.initial(), order, 0, 0.0)
+
+        values = self._selection_values(self.best)
+        links = [
+            LinkAddition(
+                src=self.candidates[c].src,
+                dst=self.candidates[c].dst,
+                price=self.candidates[c].price,
+                improvement=before - after
+            )
+            for c, before, after in zip(self.best, values, values[1:])
+        ]
+        return LinkOptimizationResult(
+            objective=self.request.objective,
+            links=links,
+            baseline_value=self.baseline_value,
+            optimized_value=values[-1],
+            greedy_value=greedy_value,
+            total_price=float(self.prices[list(self.best)].sum()),
+            optimal=not self.truncated,
+            evaluations=self.evaluations,
+            pruned=self.pruned,
+            execution_time=time.time() - start_time
+        )
+
+    def evaluate(self, selection: Selection, options: List[int]) -> np.ndarray:
+        """Objective value of the selection extended by each option."""
+        state = self._state(selection)
+        return np.array([
+            self.objective.value(self.objective.extend(state, c))
+            for c in options
+        ])
+
+    def _greedy(
+        self,
+        evaluate: Callable[[Selection, List[int]], np.ndarray]
+    ) -> Tuple[Selection, List[int]]:
+        """Greedy selection, and all candidates ordered by their first-round value."""
+        selection: Selection = ()
+        value = self.baseline_value
+        spent = 0.0
+        order = list(range(len(self.candidates)))
+
+        while len(selection) < self.request.max_links:
+            options = [
+                c for c in range(len(self.candidates))
+                if c not in selection and self._affordable(spent, c)
+            ]
+            if not options:
+                break
+            values = evaluate(selection, options)
+            self.evaluations += len(options)
+            if not selection:
+                ranked = sorted(zip(values.tolist(), options))
+                order = [c for _, c in ranked]
+                order += [c for c in range(len(self.candidates)) if c not in options]
+
+            gains = (value - values) / self.prices[options]
+            best = int(np.argmax(gains))
+            if not gains[best] > TOLERANCE:
+                break
+            selection += (options[best],)
+            value = float(values[best])
+            spent += self.prices[options[best]]
+        return selection, order
+
+    def _branch(
+        self,
+        selection: Selection,
+        state: object,
+        order: List[int],
+        position: int,
+        spent: float
+    ):
+        """Depth-first search over candidates after ``position`` in ``order``."""
+        if len(selection) == self.request.max_links:
+            return
+        remaining = [
+            i for i in range(position, len(order))
+            if self._affordable(spent, order[i])
+        ]
+        if not remaining:
+            return
+        if self.evaluations >= self.request.max_evaluations:
+            self.truncated = True
+            return
+
+        self.evaluations += 1
+        bound = self.objective.bound(state, [order[i] for i in remaining])
+        if bound >= self.best_value - TOLERANCE:
+            self.pruned += 1
+            return
+
+        for i in remaining:
+            if self.evaluations >= self.request.max_evaluations:
+                self.truncated = True
+                return
+            candidate = order[i]
+            child = self.objective.extend(state, candidate)
+            value = self.objective.value(child)
+            self.evaluations += 1
+            if value < self.best_value - TOLERANCE:
+                self.best, self.best_value = selection + (candidate,), value
+            self._branch(
+                selection + (candidate,), child, order, i + 1,
+                spent + self.prices[candidate]
+            )
+
+    def _state(self, selection: Selection) -> object:
+        """State of a selection, remembering the last one built."""
+        cached_selection, cached_state = self._cached
+        if cached_selection == selection:
+            return cached_state
+        state = self.objective.initial()
+        for candidate in selection:
+            state = self.objective.extend(state, candidate)
+        self._cached = (selection, state)
+        return state
+
+    def _selection_values(self, selection: Selection) -> List[float]:
+        """Objective values as the selected links are added one by one."""
+        state = self.objective.initial()
+        values = [self.baseline_value]
+        for candidate in selection:
+            state = self.objective.extend(state, candidate)
+            values.append(self.objective.value(state))
+        return values
+
+    def _affordable(self, spent: float, candidate: int) -> bool:
+        return spent + self.prices[candidate] <= self.request.budget + TOLERANCE
+
+    def _scenario(self, selection: Selection) -> SimulationRequest:
+        """ADD_LINK scenario adding the selected candidates in order."""
+        steps = [
+            ScenarioStep(
+                action=SimulationAction.ADD_LINK,
+                src=self.candidates[c].src,
+                dst=self.candidates[c].dst,
+                capacity=self.request.capacity,
+                latency=self.candidates[c].latency,
+                cost=self.candidates[c].cost
+            )
+            for c in selection
+        ]
+        return SimulationRequest(**steps[0].model_dump(), steps=steps[1:])
+
+    def _validate_candidates(self):
+        """Candidates must join two known, not yet linked nodes."""
+        topology = self.topology
+        seen = set()
+        for candidate in self.candidates:
+            for node in (candidate.src, candidate.dst):
+                if node not in topology.node_index:
+                    raise ValueError(f"Unknown node: {node}")
+            pair = frozenset((candidate.src, candidate.dst))
+            label = f"{candidate.src}-{candidate.dst}"
+            if len(pair) == 1 or pair in seen:
+                raise ValueError(f"Invalid or duplicate candidate: {label}")
+            if topology.find_edge(
+                topology.node_index[candidate.src],
+                topology.node_index[candidate.dst]
+            ) >= 0:
+                raise ValueError(f"Link already exists: {label}")
+            seen.add(pair)
+
+
+# Optimizer installed once per worker process by the pool initializer
+def _evaluate_option(
+    optimizer: LinkOptimizer,
+    option: int,
+    selection: Selection
+) -> float:
+    return float(optimizer.evaluate(selection, [option])[0])
+
+
+def run_link_optimization(
+    baseline: BaselineAnalysis,
+    request: LinkOptimizationRequest,
+    analyzer: Optional[ImpactAnalyzer] = None,
+    max_workers: int = 1
+) -> LinkOptimizationResult:
+    """Build an optimizer over the baseline and run it (executor entry point)."""
+    return LinkOptimizer(baseline, request, analyzer).run(max_workers)
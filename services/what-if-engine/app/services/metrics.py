@@ -0,0 +1,60 @@
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+from prometheus_client import Histogram
+
+# Stage durations span sub-millisecond overlay edits to multi-second APSP
+STAGE_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+    0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+)
+
+SIMULATION_STAGE_SECONDS = Histogram(
+    "whatif_simulation_stage_seconds",
+    "Time spent in each stage of a simulation",
+    ["action", "stage"],
+    buckets=STAGE_BUCKETS
+)
+
+SIMULATION_SECONDS = Histogram(
+    "whatif_simulation_seconds",
+    "End-to-end simulation time",
+    ["action", "status"],
+    buckets=STAGE_BUCKETS
+)
+
+
+class StageTimer:
+    """Accumulates wall-clock seconds per named simulation stage.
+
+    Timings are a plain dict so a worker process can return them next to
+    its result and the caller can ``merge`` them.
+    """
+
+    def __init__(self):
+        self.timings: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the enclosed block, adding to earlier time of the stage."""
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start_time)
+
+    def add(self, name: str, seconds: float):
+        self.timings[name] = self.timings.get(name, 0.0) + seconds
+
+    def merge(self, timings: Dict[str, float]):
+        for name, seconds in timings.items():
+            self.add(name, seconds)
+
+    def observe(self, action: str, status: str, total: float):
+        """Export the stages and the total to the Prometheus histograms."""
+        for name, seconds in self.timings.items():
+            SIMULATION_STAGE_SECONDS.labels(action=action, stage=name).observe(
+                seconds
+            )
+        SIMULATION_SECONDS.labels(action=action, status=status).observe(total)
@@ -0,0 +1,287 @@
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from pydantic import BaseModel
+import scipy.sparse as sp
+from scipy.sparse.csgraph import dijkstra, shortest_path
+
+from app.services.availability import CONFIDENCE_Z
+from app.services.baseline import BaselineAnalysis
+from app.services.graph_core import CompactTopology, TopologyOverlay
+
+# Target 95% half-width: a fraction of the mean baseline path latency for
+# latency deltas, an absolute fraction for affected pairs
+DEFAULT_ACCURACY = 0.01
+
+# Seconds of sampling per request, shared by latency and affected paths
+DEFAULT_TIME_BUDGET = 1.0
+
+# Sources in the first batch; later batches double the sample
+INITIAL_SOURCES = 16
+
+# Sampled sources needed before the interval is trusted
+MIN_SOURCES = 64
+
+# Nodes nearest to each changed link endpoint that are always evaluated,
+# at most CERTAIN_FRACTION of all nodes
+CERTAIN_PER_ENDPOINT = 32
+CERTAIN_FRACTION = 0.05
+
+MAX_AFFECTED_PATHS = 10
+
+# Per sampled source: (sum of the measured values, number of pairs)
+RowTotals = Tuple[np.ndarray, np.ndarray]
+
+
+class SampledEstimate(BaseModel):
+    """Pair average estimated from a sample of source nodes."""
+    mean: float
+    interval: List[float]  # 95% confidence bounds
+    sources: int  # sources evaluated
+    exact: bool  # every source was evaluated
+
+
+class SourceSampler:
+    """Estimates all-pairs averages from rows of randomly chosen sources.
+
+    Per-source deltas are heavy-tailed: a few sources next to the change
+    carry most of it. Those ``certain`` sources form a take-all stratum
+    that is always evaluated; the others are drawn without replacement in
+    doubling batches until the confidence interval is narrow enough or the
+    time budget is spent. Each source contributes a whole row of pairs, so
+    the mean is a ratio estimator over clusters whose variance comes from
+    the sampled stratum's residuals, with a finite-population correction
+    that reaches zero once every source is evaluated.
+    """
+
+    def __init__(
+        self,
+        baseline: BaselineAnalysis,
+        modified: CompactTopology,
+        accuracy: float = DEFAULT_ACCURACY,
+        time_budget: float = DEFAULT_TIME_BUDGET,
+        seed: Optional[int] = None,
+        certain: Optional[np.ndarray] = None
+    ):
+        self.baseline = baseline
+        self.modified = modified
+        self.accuracy = accuracy
+        self.time_budget = time_budget
+        self.node_count = baseline.topology.node_count
+
+        certain = np.unique(
+            np.asarray([] if certain is None else certain, dtype=np.int64)
+        )
+        rest = np.setdiff1d(np.arange(self.node_count), certain)
+        self.certain_count = certain.size
+        self.order = np.concatenate([
+            certain, np.random.default_rng(seed).permutation(rest)
+        ])
+
+        # Filled in by latency_change and affected_pairs
+        self.latency: Optional[SampledEstimate] = None
+        self.paths: Optional[SampledEstimate] = None
+        self.affected_paths: List[str] = []
+
+    @classmethod
+    def from_parameters(
+        cls,
+        baseline: BaselineAnalysis,
+        overlay: TopologyOverlay,
+        modified: CompactTopology,
+        parameters: Dict[str, Any]
+    ) -> "SourceSampler":
+        """Build a sampler from ``accuracy``, ``time_budget`` and ``seed``."""
+        accuracy = float(parameters.get("accuracy", DEFAULT_ACCURACY))
+        time_budget = float(parameters.get("time_budget", DEFAULT_TIME_BUDGET))
+        if accuracy <= 0:
+            raise ValueError("accuracy must be positive")
+        if time_budget <= 0:
+            raise ValueError("time_budget must be positive")
+        return cls(
+            baseline, modified, accuracy, time_budget, parameters.get("seed"),
+            certain=nodes_near_change(baseline, overlay)
+        )
+
+    def latency_change(self) -> SampledEstimate:
+        """Mean latency change over pairs reachable before and after."""
+        engine = self.baseline.latency_paths
+        modified = self.modified
+        matrix = sp.csr_matrix(
+            (engine.link_weights(modified), (modified.src, modified.dst)),
+            shape=(modified.node_count, modified.node_count)
+        )
+        scale = []
+
+        def rows(sources: np.ndarray) -> RowTotals:
+            before = engine.distances[sources]
+            after = np.atleast_2d(dijkstra(
+                matrix, directed=False, indices=sources
+            ))[:, :self.node_count]
+            reachable = np.isfinite(before) & np.isfinite(after)
+            reachable[np.arange(sources.size), sources] = False
+            scale.append(before[reachable].sum() / max(reachable.sum(), 1))
+            delta = np.where(reachable, after - before, 0.0)
+            return delta.sum(axis=1), reachable.sum(axis=1)
+
+        # The target width scales with the typical baseline path latency,
+        # taken from the first batch
+        self.latency = self._estimate(
+            rows, lambda: self.accuracy * scale[0], self.time_budget / 2
+        )
+        return self.latency
+
+    def affected_pairs(self) -> SampledEstimate:
+        """Fraction of reachable pairs whose hop-count path changed.
+
+        Also collects up to ``MAX_AFFECTED_PATHS`` changed paths from the
+        sampled sources into ``affected_paths``.
+        """
+        baseline = self.baseline
+        matrix = self.modified.weight_matrix()
+        node_ids = self.modified.node_ids
+        self.affected_paths = []
+
+        def rows(sources: np.ndarray) -> RowTotals:
+            hops = baseline.hops[sources]
+            predecessors = baseline.predecessors[sources]
+            modified_hops, modified_pred = shortest_path(
+                matrix, directed=False, unweighted=True,
+                return_predecessors=True, indices=sources
+            )
+            modified_hops = np.atleast_2d(modified_hops)[:, :self.node_count]
+            modified_pred = np.atleast_2d(modified_pred)
+
+            # Same level-by-level resolution as the exact search, per row
+            same = predecessors == modified_pred[:, :self.node_count]
+            reachable = np.isfinite(hops) & np.isfinite(modified_hops)
+            reachable[np.arange(sources.size), sources] = False
+            if reachable.any():
+                for level in range(2, int(hops[reachable].max()) + 1):
+                    row, dst = np.nonzero(hops == level)
+                    same[row, dst] &= same[row, predecessors[row, dst]]
+            affected = reachable & ~same
+
+            for row, dst in zip(*np.nonzero(affected)):
+                if len(self.affected_paths) == MAX_AFFECTED_PATHS:
+                    break
+                path = [dst]
+                while path[-1] != sources[row]:
+                    path.append(modified_pred[row, path[-1]])
+                self.affected_paths.append(
+                    " -> ".join(str(node_ids[i]) for i in reversed(path))
+                )
+            return affected.sum(axis=1), reachable.sum(axis=1)
+
+        self.paths = self._estimate(
+            rows, lambda: self.accuracy, self.time_budget / 2
+        )
+        return self.paths
+
+    def _estimate(
+        self,
+        rows: Callable[[np.ndarray], RowTotals],
+        target: Callable[[], float],
+        time_budget: float
+    ) -> SampledEstimate:
+        """Sample doubling batches of sources until accurate or out of time."""
+        deadline = time.perf_counter() + time_budget
+        totals: List[np.ndarray] = []
+        counts: List[np.ndarray] = []
+        sampled = 0
+        batch = self.certain_count + INITIAL_SOURCES
+
+        while sampled < self.node_count:
+            sources = self.order[sampled:sampled + batch]
+            row_totals, row_counts = rows(sources)
+            totals.append(row_totals)
+            counts.append(row_counts)
+            sampled += sources.size
+            batch = 2 * (sampled - self.certain_count)
+
+            mean, half_width = self._ratio(
+                np.concatenate(totals), np.concatenate(counts)
+            )
+            accurate = half_width <= target() and (
+                sampled - self.certain_count >= MIN_SOURCES
+                or sampled == self.node_count
+            )
+            if accurate or time.perf_counter() >= deadline:
+                break
+
+        if not totals:
+            return SampledEstimate(
+                mean=0.0, interval=[0.0, 0.0], sources=0, exact=True
+            )
+        return SampledEstimate(
+            mean=mean,
+            interval=[mean - half_width, mean + half_width],
+            sources=sampled,
+            exact=sampled == self.node_count
+        )
+
+    def _ratio(
+        self,
+        totals: np.ndarray,
+        counts: np.ndarray
+    ) -> Tuple[float, float]:
+        """Ratio estimate of the pair mean and its 95% half-width."""
+        certain = self.certain_count
+        population = self.node_count - certain
+        sampled = totals.size - certain
+
+        # Stratum totals: take-all sources as is, sampled ones scaled up
+        weight = population / sampled if sampled else 0.0
+        total = totals[:certain].sum() + weight * totals[certain:].sum()
+        pairs = counts[:certain].sum() + weight * counts[certain:].sum()
+        if pairs == 0:
+            return 0.0, 0.0
+        mean = float(total / pairs)
+
+        if sampled == population:
+            return mean, 0.0
+        if sampled < 2:
+            return mean, float("inf")
+        residuals = totals[certain:] - mean * counts[certain:]
+        correction = 1.0 - sampled / population
+        variance = (
+            population ** 2 * correction * residuals.var(ddof=1)
+            / (sampled * pairs ** 2)
+        )
+        return mean, float(CONFIDENCE_Z * np.sqrt(variance))
+
+
+def nodes_near_change(
+    baseline: BaselineAnalysis,
+    overlay: TopologyOverlay
+) -> np.ndarray:
+    """Baseline nodes closest in latency to a removed, re-weighted or added link.
+
+    Detours are longest for sources next to the change, so these carry
+    most of the latency delta and are worth evaluating without sampling.
+    """
+    topology = baseline.topology
+    engine = baseline.latency_paths
+    base_count = topology.edge_count
+
+    active = overlay.edge_active
+    weights = engine.link_weights(overlay)
+    changed = ~active[:base_count] | (weights[:base_count] != engine.weights)
+    added_src, added_dst = overlay.added_edges
+    added = active[base_count:]
+    endpoints = np.concatenate([
+        topology.src[changed], topology.dst[changed],
+        added_src[added], added_dst[added]
+    ])
+    endpoints = np.unique(endpoints[endpoints < topology.node_count])
+    if endpoints.size == 0:
+        return endpoints
+
+    distance = engine.distances[endpoints].min(axis=0)
+    limit = min(
+        CERTAIN_PER_ENDPOINT * endpoints.size,
+        max(CERTAIN_PER_ENDPOINT, int(CERTAIN_FRACTION * topology.node_count))
+    )
+    nearest = np.argsort(distance, kind="stable")[:limit]
+    return nearest[np.isfinite(distance[nearest])]
@@ -0,0 +1,107 @@
+import asyncio
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional, Set
+
+import structlog
+
+from app.models.simulation import SimulationProgress
+
+logger = structlog.get_logger()
+
+# Pub/sub channel carrying the progress events of one simulation
+PROGRESS_CHANNEL = "simulation:{simulation_id}:progress"
+
+
+class ProgressSubscription:
+    """Events of one simulation, received in publication order."""
+
+    def __init__(self, queue: Optional[asyncio.Queue] = None, pubsub=None):
+        self._queue = queue
+        self._pubsub = pubsub
+
+    async def get(self, timeout: float) -> Optional[SimulationProgress]:
+        """Return the next event, or None if none arrived within ``timeout``."""
+        if self._pubsub is None:
+            try:
+                return await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                return None
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return None
+            message = await self._pubsub.get_message(
+                ignore_subscribe_messages=True, timeout=remaining
+            )
+            if message and message.get("type") == "message":
+                return SimulationProgress.model_validate_json(message["data"])
+
+
+class ProgressBroker:
+    """Fan-out of simulation progress to stream subscribers.
+
+    With the ``redis`` backend events go through a per-simulation pub/sub
+    channel, so a client streaming from one replica sees progress of a job
+    running on another. The ``memory`` backend delivers to subscribers in
+    this process only. Publishing never fails a simulation.
+    """
+
+    def __init__(self, redis_client=None, backend: str = "redis"):
+        if backend not in ("redis", "memory"):
+            raise ValueError(f"Unknown progress backend: {backend}")
+        self.redis_client = redis_client
+        self.backend = backend if redis_client is not None else "memory"
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+
+    async def publish(self, event: SimulationProgress):
+        """Deliver an event to every subscriber of its simulation."""
+        if self.backend == "memory":
+            subscribers = self._subscribers.get(event.simulation_id)
+            if subscribers:
+                # Snapshot, since the publisher keeps mutating its result
+                event = event.model_copy(deep=True)
+                for queue in subscribers:
+                    queue.put_nowait(event)
+            return
+
+        try:
+            await self.redis_client.publish(
+                PROGRESS_CHANNEL.format(simulation_id=event.simulation_id),
+                event.model_dump_json()
+            )
+        except Exception as e:
+            logger.warning(
+                "Failed to publish simulation progress",
+                simulation_id=event.simulation_id,
+                error=str(e)
+            )
+
+    @asynccontextmanager
+    async def subscribe(self, simulation_id: str) -> AsyncIterator[ProgressSubscription]:
+        """Receive the events published for a simulation from now on."""
+        if self.backend == "memory":
+            queue: asyncio.Queue = asyncio.Queue()
+            self._subscribers[simulation_id].add(queue)
+            try:
+                yield ProgressSubscription(queue=queue)
+            finally:
+                self._subscribers[simulation_id].discard(queue)
+                if not self._subscribers[simulation_id]:
+                    del self._subscribers[simulation_id]
+            return
+
+        pubsub = self.redis_client.pubsub()
+        channel = PROGRESS_CHANNEL.format(simulation_id=simulation_id)
+        await pubsub.subscribe(channel)
+        try:
+            yield ProgressSubscription(pubsub=pubsub)
+        finally:
+            try:
+                await pubsub.unsubscribe(channel)
+                await pubsub.reset()
+            except Exception as e:
+                logger.warning("Failed to close progress subscription", error=str(e))
@@ -0,0 +1,274 @@
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.csgraph import dijkstra
+import structlog
+
+from app.models.simulation import (
+    LinkCongestion, ReplayRequest, ReplayResult
+)
+from app.services.baseline import BaselineAnalysis
+from app.services.graph_core import CompactTopology, TopologyOverlay
+from app.services.impact_analyzer import ImpactAnalyzer
+
+logger = structlog.get_logger()
+
+# Replay resolution, matching the collector's polling buckets
+INTERVAL_SECONDS = 300
+
+# Utilization above which a link counts as congested
+CONGESTION_THRESHOLD = 0.8
+
+# Links reported per replay, most congested first
+MAX_REPORTED_LINKS = 20
+
+# Busiest reading per interface and interval, oldest first
+REPLAY_QUERY = """
+SELECT toStartOfInterval(timestamp, INTERVAL {step:UInt32} SECOND) AS interval,
+       device_id,
+       interface,
+       max(utilization) AS utilization
+FROM interface_metrics
+WHERE timestamp >= now() - INTERVAL {days:UInt32} DAY
+  AND device_id IN {devices:Array(String)}
+GROUP BY interval, device_id, interface
+ORDER BY interval
+"""
+
+# (interval start times, intervals x links utilization matrix)
+UtilizationHistory = Tuple[List[datetime], np.ndarray]
+
+
+def load_utilization_history(
+    client,
+    topology: CompactTopology,
+    days: int,
+    step: int = INTERVAL_SECONDS
+) -> UtilizationHistory:
+    """Read link utilization per interval from ``interface_metrics``.
+
+    Interfaces are matched to links through the ``interface_src`` and
+    ``interface_dst`` link attributes; a link takes the busier of its two
+    ends. Intervals without a sample repeat the previous one, and links
+    never sampled keep their topology utilization.
+    """
+    ports: Dict[Tuple[str, str], List[int]] = {}
+    for e, attrs in enumerate(topology.edge_attrs):
+        for end, key in ((topology.src[e], "interface_src"),
+                         (topology.dst[e], "interface_dst")):
+            interface = attrs.get(key)
+            if interface:
+                device = str(topology.node_ids[end])
+                ports.setdefault((device, interface), []).append(e)
+
+    if not ports:
+        return [], np.zeros((0, topology.edge_count))
+
+    result = client.query(REPLAY_QUERY, parameters={
+        "step": step,
+        "days": days,
+        "devices": sorted({device for device, _ in ports})
+    })
+    rows = result.result_rows
+    if not rows:
+        return [], np.zeros((0, topology.edge_count))
+
+    timestamps = sorted({row[0] for row in rows})
+    position = {timestamp: t for t, timestamp in enumerate(timestamps)}
+
+    history = np.full((len(timestamps), topology.edge_count), np.nan)
+    for timestamp, device, interface, utilization in rows:
+        for e in ports.get((device, interface), ()):
+            t = position[timestamp]
+            history[t, e] = np.fmax(history[t, e], utilization)
+
+    # Carry the last sample forward, then fall back to the topology value
+    sampled = ~np.isnan(history)
+    last = np.where(sampled, np.arange(len(timestamps))[:, None], 0)
+    np.maximum.accumulate(last, axis=0, out=last)
+    history = history[last, np.arange(topology.edge_count)]
+    missing = np.isnan(history)
+    history[missing] = np.broadcast_to(topology.utilization, history.shape)[missing]
+
+    logger.info(
+        "Utilization history loaded",
+        intervals=len(timestamps),
+        links_sampled=int(sampled.any(axis=0).sum()),
+        links=topology.edge_count
+    )
+    return timestamps, history
+
+
+class HistoricalReplay:
+    """A scenario change evaluated against every interval of history.
+
+    The change becomes a sparse load-transfer matrix from baseline links to
+    scenario links: surviving links keep their load and a removed link's
+    load moves onto the shortest surviving latency path between its
+    endpoints. Loads of all intervals then go through one sparse product
+    instead of one analysis per interval.
+    """
+
+    def __init__(self, baseline: BaselineAnalysis, overlay: TopologyOverlay):
+        self.baseline = baseline
+        self.overlay = overlay
+        self.modified = overlay.materialize()
+        self.transfer, self.lost = self._transfer_matrix()
+
+    def run(
+        self,
+        request: ReplayRequest,
+        timestamps: List[datetime],
+        history: np.ndarray
+    ) -> ReplayResult:
+        """Summarize congestion before and after the change per interval."""
+        start_time = time.time()
+        if not timestamps:
+            return ReplayResult(execution_time=time.time() - start_time)
+
+        base = self.baseline.topology
+        loads = history * base.capacity
+        utilization = self._utilization(
+            np.asarray((self.transfer @ loads.T).T), self.modified.capacity
+        )
+        unrouted = loads[:, self.lost].sum(axis=1)
+
+        peaks = self._interval_peaks(utilization)
+        baseline_peaks = self._interval_peaks(history)
+        busiest = int(np.argmax(peaks))
+
+        return ReplayResult(
+            intervals=len(timestamps),
+            start=timestamps[0],
+            end=timestamps[-1],
+            peak_utilization=float(peaks.max()),
+            percentile_utilization=float(np.percentile(peaks, request.percentile)),
+            baseline_peak_utilization=float(baseline_peaks.max()),
+            baseline_percentile_utilization=float(
+                np.percentile(baseline_peaks, request.percentile)
+            ),
+            congested_intervals=int((peaks > CONGESTION_THRESHOLD).sum()),
+            baseline_congested_intervals=int(
+                (baseline_peaks > CONGESTION_THRESHOLD).sum()
+            ),
+            busiest_interval=timestamps[busiest],
+            peak_unrouted_traffic=float(unrouted.max()),
+            links=self._link_congestion(utilization, history, request.percentile),
+            execution_time=time.time() - start_time
+        )
+
+    def _transfer_matrix(self) -> Tuple[sp.csr_matrix, np.ndarray]:
+        """Map baseline link loads onto scenario links.
+
+        Returns the ``(scenario links x baseline links)`` transfer matrix
+        and the mask of baseline links whose load has no surviving path.
+        """
+        base = self.baseline.topology
+        modified = self.modified
+        active_ids = np.flatnonzero(self.overlay.edge_active)
+        base_active = self.overlay.edge_active[:base.edge_count]
+
+        # Surviving links carry their own load
+        kept = np.flatnonzero(base_active)
+        rows = [np.searchsorted(active_ids, kept)]
+        cols = [kept]
+
+        lost = np.zeros(base.edge_count, dtype=bool)
+        removed = np.flatnonzero(~base_active)
+        if removed.size:
+            sources = np.unique(base.src[removed])
+            _, predecessors = dijkstra(
+                modified.weight_matrix("latency"), directed=False,
+                indices=sources, return_predecessors=True
+            )
+            row_of = {int(s): i for i, s in enumerate(sources)}
+
+            path_rows, path_cols = [], []
+            for edge_id in removed:
+                src, dst = int(base.src[edge_id]), int(base.dst[edge_id])
+                tree = predecessors[row_of[src]]
+                if tree[dst] < 0:
+                    lost[edge_id] = True
+                    continue
+                node = dst
+                while node != src:
+                    previous = int(tree[node])
+                    path_rows.append(modified.find_edge(previous, node))
+                    path_cols.append(edge_id)
+                    node = previous
+            rows.append(np.asarray(path_rows, dtype=np.int64))
+            cols.append(np.asarray(path_cols, dtype=np.int64))
+
+        rows = np.concatenate(rows)
+        cols = np.concatenate(cols)
+        transfer = sp.csr_matrix(
+            (np.ones(rows.size), (rows, cols)),
+            shape=(modified.edge_count, base.edge_count)
+        )
+        return transfer, lost
+
+    @staticmethod
+    def _utilization(loads: np.ndarray, capacity: np.ndarray) -> np.ndarray:
+        return np.divide(
+            loads, capacity,
+            out=np.zeros_like(loads, dtype=float),
+            where=capacity > 0
+        )
+
+    @staticmethod
+    def _interval_peaks(utilization: np.ndarray) -> np.ndarray:
+        if utilization.shape[1] == 0:
+            return np.zeros(utilization.shape[0])
+        return utilization.max(axis=1)
+
+    def _link_congestion(
+        self,
+        utilization: np.ndarray,
+        history: np.ndarray,
+        percentile: float
+    ) -> List[LinkCongestion]:
+        """Per-link figures for the most congested scenario links."""
+        modified = self.modified
+        if modified.edge_count == 0:
+            return []
+
+        peaks = utilization.max(axis=0)
+        percentiles = np.percentile(utilization, percentile, axis=0)
+        congested = (utilization > CONGESTION_THRESHOLD).sum(axis=0)
+
+        # Scenario links that exist in the baseline, by baseline link id
+        base_count = self.baseline.topology.edge_count
+        origin = np.flatnonzero(self.overlay.edge_active)
+        baseline_peaks = np.zeros(modified.edge_count)
+        from_base = origin < base_count
+        baseline_peaks[from_base] = history[:, origin[from_base]].max(axis=0)
+
+        order = np.lexsort((-percentiles, -peaks))[:MAX_REPORTED_LINKS]
+        return [
+            LinkCongestion(
+                link=modified.edge_name(e),
+                peak_utilization=float(peaks[e]),
+                percentile_utilization=float(percentiles[e]),
+                baseline_peak_utilization=float(baseline_peaks[e]),
+                congested_intervals=int(congested[e])
+            )
+            for e in order
+        ]
+
+
+def run_replay(
+    baseline: BaselineAnalysis,
+    request: ReplayRequest,
+    timestamps: List[datetime],
+    history: np.ndarray,
+    analyzer: Optional[ImpactAnalyzer] = None
+) -> ReplayResult:
+    """Apply the scenario and replay it over history (executor entry point)."""
+    analyzer = analyzer or ImpactAnalyzer()
+    overlay = analyzer._apply_simulation_changes(
+        baseline.topology, request.scenario
+    )
+    return HistoricalReplay(baseline, overlay).run(request, timestamps, history)
@@ -0,0 +1,156 @@
+import asyncio
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import structlog
+
+from app.models.simulation import (
+    ImpactAnalysis, SimulationAction, SimulationRequest
+)
+from app.services.codecs import PayloadCodec
+
+logger = structlog.get_logger()
+
+RESULT_KEY = "simulation:result:{key}"
+
+
+def request_key(
+    topology_version: str,
+    request: SimulationRequest,
+    link_model: Dict[str, Any]
+) -> str:
+    """Content address of a request against one topology version.
+
+    ``link_model`` is the link performance model's config, so replicas
+    running different models never share entries.
+    """
+    digest = hashlib.sha256()
+    digest.update(topology_version.encode())
+    for part in (link_model, request.model_dump(mode="json")):
+        digest.update(b"\x00")
+        digest.update(
+            json.dumps(part, sort_keys=True, separators=(",", ":")).encode()
+        )
+    return digest.hexdigest()
+
+
+def is_reproducible(request: SimulationRequest) -> bool:
+    """Whether running ``request`` again gives the same analysis.
+
+    Sampled (``approximate``) runs stop on a time budget, and unseeded
+    Monte Carlo availability draws new trials, so neither is memoized.
+    """
+    parameters = request.parameters or {}
+    if parameters.get("approximate"):
+        return False
+    if request.action == SimulationAction.AVAILABILITY:
+        return parameters.get("seed") is not None
+    return True
+
+
+class ResultCache:
+    """Memoized impact analyses keyed by topology version and request.
+
+    Lookups go to a local LRU first, then Redis. Concurrent misses for the
+    same key share one computation (single flight): the first caller runs
+    it and the others await its result. Only the first caller's
+    ``compute`` runs, so stage timings and progress it records are its own.
+
+    Entries are stored through ``codec``, so ``redis_client`` should
+    return raw bytes; plain JSON entries still decode.
+    """
+
+    def __init__(
+        self,
+        redis_client,
+        max_entries: int = 1024,
+        ttl: int = 3600,
+        codec: Optional[PayloadCodec] = None
+    ):
+        self.redis_client = redis_client
+        self.codec = codec or PayloadCodec()
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._local: "OrderedDict[str, ImpactAnalysis]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[ImpactAnalysis]]
+    ) -> ImpactAnalysis:
+        """Return the cached analysis for ``key``, computing it at most once."""
+        impact = await self.get(key)
+        if impact is not None:
+            self.hits += 1
+            return impact
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = asyncio.ensure_future(self._compute(key, compute))
+            self._inflight[key] = task
+
+        # A cancelled caller must not cancel the computation others await
+        impact = await asyncio.shield(task)
+        return impact.model_copy(deep=True)
+
+    async def get(self, key: str) -> Optional[ImpactAnalysis]:
+        """Look up a cached analysis locally, then in Redis."""
+        impact = self._local.get(key)
+        if impact is not None:
+            self._local.move_to_end(key)
+            return impact.model_copy(deep=True)
+
+        try:
+            cached_data = await self.redis_client.get(RESULT_KEY.format(key=key))
+            if not cached_data:
+                return None
+            impact = self.codec.decode(cached_data, ImpactAnalysis)
+        except Exception as e:
+            logger.warning("Failed to read cached result", error=str(e))
+            return None
+
+        self._remember(key, impact)
+        return impact.model_copy(deep=True)
+
+    async def put(self, key: str, impact: ImpactAnalysis):
+        """Store an analysis locally and in Redis."""
+        self._remember(key, impact)
+        try:
+            await self.redis_client.setex(
+                RESULT_KEY.format(key=key), self.ttl, self.codec.encode(impact)
+            )
+        except Exception as e:
+            logger.warning("Failed to cache simulation result", error=str(e))
+
+    def clear(self):
+        """Drop the local entries."""
+        self._local.clear()
+
+    async def _compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[ImpactAnalysis]]
+    ) -> ImpactAnalysis:
+        try:
+            impact = await compute()
+            await self.put(key, impact)
+            return impact
+        finally:
+            self._inflight.pop(key, None)
+
+    def _remember(self, key: str, impact: ImpactAnalysis):
+        self._local[key] = impact
+        self._local.move_to_end(key)
+        while len(self._local) > self.max_entries:
+            self._local.popitem(last=False)
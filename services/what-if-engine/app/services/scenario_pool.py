@@ -0,0 +1,44 @@
+import time
+from typing import List, Optional, Tuple
+
+from app.models.simulation import ImpactAnalysis, SimulationRequest
+from app.services.baseline import BaselineAnalysis
+from app.services.executor import fan_out
+from app.services.impact_analyzer import ImpactAnalyzer
+
+# (impact analysis, error message, execution time)
+ScenarioOutcome = Tuple[Optional[ImpactAnalysis], Optional[str], float]
+
+
+def evaluate_scenario(
+    baseline: BaselineAnalysis,
+    request: SimulationRequest,
+    analyzer: Optional[ImpactAnalyzer] = None
+) -> ScenarioOutcome:
+    """Evaluate one scenario, capturing failures instead of raising."""
+    analyzer = analyzer or ImpactAnalyzer()
+    start_time = time.time()
+    try:
+        impact = analyzer.evaluate(baseline, request)
+        return impact, None, time.time() - start_time
+    except Exception as e:
+        return None, str(e), time.time() - start_time
+
+
+def evaluate_scenarios(
+    baseline: BaselineAnalysis,
+    requests: List[SimulationRequest],
+    max_workers: int,
+    analyzer: Optional[ImpactAnalyzer] = None,
+    key: Optional[str] = None
+) -> List[ScenarioOutcome]:
+    """Evaluate scenarios against one baseline on the shared compute pool.
+
+    The baseline is shared with the workers once per batch, or once per
+    ``key`` if given, so only the small requests and results cross the
+    process boundary per scenario.
+    """
+    return fan_out(
+        evaluate_scenario, baseline, requests, max_workers, key=key,
+        args=(analyzer,)
+    )
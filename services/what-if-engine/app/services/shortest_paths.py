@@ -0,0 +1,226 @@
+from typing import Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.csgraph import dijkstra
+
+from app.services.graph_core import (
+    EDGE_COLUMNS, CompactTopology, GraphLike, TopologyOverlay, as_compact
+)
+from app.services.link_models import LinkPerformanceModel
+
+EdgeChange = Tuple[int, int, float]
+
+
+class IncrementalShortestPaths:
+    """All-pairs shortest-path engine with incremental edge updates.
+
+    The baseline distance matrix is computed once. Distances for a modified
+    graph are derived from it by re-running Dijkstra only for the sources
+    whose shortest-path tree uses a removed or heavier edge, and by relaxing
+    every pair through added or lighter edges in a single vectorized pass.
+
+    With a ``link_model``, latency weights include each link's queueing
+    delay at its current utilization.
+    """
+
+    def __init__(
+        self,
+        graph: GraphLike,
+        weight: str = "latency",
+        link_model: Optional[LinkPerformanceModel] = None
+    ):
+        self.weight = weight
+        self.link_model = link_model
+        self.topology: CompactTopology = as_compact(graph)
+        self.nodes = self.topology.node_ids
+        self.index = self.topology.node_index
+        self.weights = self.link_weights(self.topology)
+
+        if self.topology.node_count == 0:
+            self.distances = np.zeros((0, 0))
+        else:
+            self.distances = dijkstra(
+                sp.csr_matrix(
+                    (self.weights, (self.topology.src, self.topology.dst)),
+                    shape=(self.topology.node_count, self.topology.node_count)
+                ),
+                directed=False
+            )
+
+    def link_weights(
+        self,
+        graph: Union[CompactTopology, TopologyOverlay]
+    ) -> np.ndarray:
+        """Per-link path weights, queueing delay included for latency."""
+        weights = graph.column(self.weight)
+        if self.link_model is None or self.weight != "latency":
+            return weights
+        return weights + self.link_model.delay(
+            graph.column("utilization"), graph.column("capacity")
+        )
+
+    def distances_after(self, modified_graph: GraphLike) -> np.ndarray:
+        """Return the distance matrix of a modified graph.
+
+        Rows and columns follow ``self.nodes`` followed by any nodes that only
+        exist in ``modified_graph``. Nodes removed from the graph are kept as
+        isolated rows so that indices stay stable.
+        """
+        if (
+            isinstance(modified_graph, TopologyOverlay)
+            and modified_graph.base is self.topology
+        ):
+            overlay = modified_graph
+        else:
+            overlay = self.overlay_for(as_compact(modified_graph))
+        return self.apply_overlay(overlay)
+
+    def apply_overlay(self, overlay: TopologyOverlay) -> np.ndarray:
+        """Derive the distance matrix for a scenario over the baseline."""
+        return self.update(
+            self.distances,
+            np.ones(self.topology.edge_count, dtype=bool),
+            self.weights,
+            overlay
+        )
+
+    def update(
+        self,
+        distances: np.ndarray,
+        active_before: np.ndarray,
+        weights_before: np.ndarray,
+        overlay: TopologyOverlay
+    ) -> np.ndarray:
+        """Derive the distances of an overlay from an earlier state of it.
+
+        ``distances``, ``active_before`` and ``weights_before`` describe the
+        overlay before its latest changes; links added since then are
+        missing from the shorter arrays. Chaining calls applies a sequence of
+        changes step by step, each step paying only for its own change.
+        """
+        active = overlay.edge_active
+        new_weights = self.link_weights(overlay)
+        edge_count = len(active)
+
+        was_active = np.zeros(edge_count, dtype=bool)
+        was_active[:len(active_before)] = active_before
+        old_weights = np.full(edge_count, np.inf)
+        old_weights[:len(weights_before)] = weights_before
+
+        worsened_mask = was_active & (~active | (new_weights > old_weights))
+        improved_mask = active & (~was_active | (new_weights < old_weights))
+
+        added_src, added_dst = overlay.added_edges
+        src = np.concatenate([self.topology.src, added_src])
+        dst = np.concatenate([self.topology.dst, added_dst])
+        worsened: List[EdgeChange] = [
+            (int(src[e]), int(dst[e]), float(old_weights[e]))
+            for e in np.flatnonzero(worsened_mask)
+        ]
+        improved: List[EdgeChange] = [
+            (int(src[e]), int(dst[e]), float(new_weights[e]))
+            for e in np.flatnonzero(improved_mask)
+        ]
+
+        node_count = overlay.node_count
+        known_nodes = distances.shape[0]
+        updated = np.full((node_count, node_count), np.inf)
+        updated[:known_nodes, :known_nodes] = distances
+        np.fill_diagonal(updated, 0.0)
+
+        if worsened:
+            affected = self._affected_sources(worsened, distances)
+            if affected.size:
+                # Intermediate graph: removals and increases applied, while
+                # added or lighter edges are relaxed afterwards.
+                kept = was_active & active
+                intermediate = sp.csr_matrix(
+                    (
+                        np.maximum(new_weights, old_weights)[kept],
+                        (src[kept], dst[kept])
+                    ),
+                    shape=(node_count, node_count)
+                )
+                rows = np.atleast_2d(dijkstra(
+                    intermediate, directed=False, indices=affected
+                ))
+                updated[affected, :] = rows
+                updated[:, affected] = rows.T
+
+        for edge_src, edge_dst, weight in improved:
+            self._relax_edge(updated, edge_src, edge_dst, weight)
+
+        return updated
+
+    def affected_sources(self, edge_ids: Iterable[int]) -> np.ndarray:
+        """Sources whose shortest-path DAG contains any of the baseline links."""
+        return self._affected_sources([
+            (int(self.topology.src[e]), int(self.topology.dst[e]),
+             float(self.weights[e]))
+            for e in edge_ids
+        ])
+
+    def _affected_sources(
+        self,
+        worsened: List[EdgeChange],
+        distances: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Find sources whose shortest-path tree may use a worsened edge."""
+        base = self.distances if distances is None else distances
+        affected = np.zeros(base.shape[0], dtype=bool)
+        for src, dst, weight in worsened:
+            to_src = base[:, src]
+            to_dst = base[:, dst]
+            finite = np.isfinite(to_src) & np.isfinite(to_dst)
+            affected |= finite & (
+                np.isclose(to_src + weight, to_dst)
+                | np.isclose(to_dst + weight, to_src)
+            )
+        return np.flatnonzero(affected)
+
+    def overlay_for(self, modified: CompactTopology) -> TopologyOverlay:
+        """Express an unrelated topology as an overlay over the baseline."""
+        overlay = self.topology.overlay()
+        present = np.zeros(self.topology.edge_count, dtype=bool)
+        modified_columns = {
+            name: modified.column(name) for name in EDGE_COLUMNS
+        }
+
+        for node in modified.node_ids:
+            if node not in self.index:
+                overlay.add_node(node)
+
+        for e in range(modified.edge_count):
+            src = modified.node_ids[modified.src[e]]
+            dst = modified.node_ids[modified.dst[e]]
+            edge_id = self.topology.find_edge(
+                self.index.get(src, -1), self.index.get(dst, -1)
+            )
+            values = {
+                name: column[e] for name, column in modified_columns.items()
+            }
+            if edge_id >= 0:
+                present[edge_id] = True
+                changed = {
+                    name: value for name, value in values.items()
+                    if value != self.topology.column(name)[edge_id]
+                }
+                if changed:
+                    overlay.set_edge_attrs(src, dst, **changed)
+            else:
+                overlay.add_edge(src, dst, **values)
+
+        for e in np.flatnonzero(~present):
+            overlay.remove_edge(
+                self.nodes[self.topology.src[e]],
+                self.nodes[self.topology.dst[e]]
+            )
+        return overlay
+
+    @staticmethod
+    def _relax_edge(distances: np.ndarray, src: int, dst: int, weight: float):
+        """Relax every pair through an added or lighter undirected edge."""
+        via_edge = distances[:, src, None] + weight + distances[None, dst, :]
+        np.minimum(distances, via_edge, out=distances)
+        np.minimum(distances, via_edge.T, out=distances)
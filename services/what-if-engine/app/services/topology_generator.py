@@ -0,0 +1,136 @@
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.services.graph_core import CompactTopology
+
+MIN_NODES = 4
+MAX_NODES = 1000000
+
+# Per-tier link capacity (Mbps) and latency range (ms)
+TIER_LINKS: Dict[str, Tuple[float, Tuple[float, float]]] = {
+    "core": (100000, (5.0, 20.0)),
+    "uplink": (40000, (1.0, 5.0)),
+    "ring": (10000, (1.0, 5.0)),
+    "access": (1000, (0.2, 1.0)),
+}
+
+
+def generate_isp_topology(
+    nodes: int,
+    ring_size: int = 8,
+    core_degree: int = 3,
+    mean_utilization: float = 0.45,
+    seed: Optional[int] = None
+) -> CompactTopology:
+    """Generate a tiered ring-and-mesh ISP topology.
+
+    A partial-mesh core (a ring plus ``core_degree`` random chords per
+    router) carries aggregation rings of ``ring_size`` routers, each ring
+    dual-homed to two core routers. Every remaining node is an access
+    router dual-homed to two neighbouring routers of one ring. Arrays are
+    built directly, so 100k-node topologies take well under a second.
+    """
+    if not MIN_NODES <= nodes <= MAX_NODES:
+        raise ValueError(f"nodes must be between {MIN_NODES} and {MAX_NODES}")
+    if ring_size < 1:
+        raise ValueError("ring_size must be positive")
+    rng = np.random.default_rng(seed)
+
+    core = max(3, int(round(np.sqrt(nodes) / 2)))
+    aggregation = max(1, (nodes - core) // 4)
+    access = nodes - core - aggregation
+    agg_start = core
+    access_start = core + aggregation
+
+    links: List[Tuple[str, np.ndarray, np.ndarray]] = []
+
+    # Core ring with random chords
+    core_ids = np.arange(core)
+    chords = rng.integers(0, core, size=(core, core_degree))
+    links.append(("core", np.concatenate([
+        core_ids, np.repeat(core_ids, core_degree)
+    ]), np.concatenate([
+        (core_ids + 1) % core, chords.ravel()
+    ])))
+
+    # Aggregation rings, each anchored to two adjacent core routers
+    position = np.arange(aggregation)
+    ring = position // ring_size
+    ring_start = ring * ring_size
+    ring_length = np.minimum(ring_size, aggregation - ring_start)
+    following = ring_start + (position - ring_start + 1) % ring_length
+    links.append(("ring", agg_start + position, agg_start + following))
+
+    rings = np.arange(int(ring[-1]) + 1)
+    first = rings * ring_size
+    last = np.minimum(first + ring_size, aggregation) - 1
+    links.append(("uplink", np.concatenate([
+        agg_start + first, agg_start + last
+    ]), np.concatenate([
+        rings % core, (rings + 1) % core
+    ])))
+
+    # Access routers homed to a ring router and its ring neighbour
+    if access:
+        home = rng.integers(0, aggregation, size=access)
+        access_ids = access_start + np.arange(access)
+        links.append(("access", np.concatenate([
+            access_ids, access_ids
+        ]), np.concatenate([
+            agg_start + home, agg_start + following[home]
+        ])))
+
+    src, dst, tiers = _unique_links(links)
+
+    capacity = np.empty(src.size)
+    latency = np.empty(src.size)
+    tier_names = list(TIER_LINKS)
+    for t, (tier_capacity, (low, high)) in enumerate(TIER_LINKS.values()):
+        in_tier = tiers == t
+        capacity[in_tier] = tier_capacity
+        latency[in_tier] = np.round(rng.uniform(low, high, in_tier.sum()), 2)
+
+    # Skewed loads: most links moderately used, a tail near saturation
+    shape = 4.0
+    utilization = rng.beta(
+        shape * mean_utilization / (1 - mean_utilization), shape, src.size
+    )
+
+    node_ids = (
+        [f"core-{i}" for i in range(core)]
+        + [f"agg-{i}" for i in range(aggregation)]
+        + [f"access-{i}" for i in range(access)]
+    )
+    roles = ["core"] * core + ["aggregation"] * aggregation + ["access"] * access
+    node_attrs = [{"type": "router", "role": role} for role in roles]
+    edge_attrs = [{"tier": tier_names[t]} for t in tiers]
+
+    return CompactTopology(
+        node_ids, src, dst,
+        {
+            "capacity": capacity,
+            "utilization": np.round(utilization, 3),
+            "latency": latency,
+        },
+        node_attrs, edge_attrs
+    )
+
+
+def _unique_links(
+    links: List[Tuple[str, np.ndarray, np.ndarray]]
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Drop self-loops and parallel links, keeping the first tier seen."""
+    tier_index = {tier: t for t, tier in enumerate(TIER_LINKS)}
+    src = np.concatenate([s for _, s, _ in links])
+    dst = np.concatenate([d for _, _, d in links])
+    tiers = np.concatenate([
+        np.full(s.size, tier_index[tier]) for tier, s, _ in links
+    ])
+
+    low, high = np.minimum(src, dst), np.maximum(src, dst)
+    keep = low != high
+    low, high, tiers = low[keep], high[keep], tiers[keep]
+    _, first = np.unique(low * (high.max() + 1) + high, return_index=True)
+    first.sort()
+    return low[first], high[first], tiers[first]
@@ -0,0 +1,184 @@
+import json
+import os
+import shutil
+import tempfile
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import structlog
+
+from app.services.graph_core import EDGE_COLUMNS, CompactTopology
+
+logger = structlog.get_logger()
+
+# One round trip: every node with its outgoing links, streamed row by row
+TOPOLOGY_QUERY = """
+MATCH (n:NetworkNode)
+OPTIONAL MATCH (n)-[r:CONNECTED_TO]->(m:NetworkNode)
+RETURN n.id AS id,
+       n {.name, .type, .vendor, .model, .ip_address} AS attrs,
+       collect(CASE WHEN m IS NULL THEN NULL ELSE {
+           target: m.id,
+           id: r.id,
+           capacity: r.capacity,
+           utilization: r.utilization,
+           latency: r.latency,
+           cost: r.cost,
+           interface_src: r.interface_src,
+           interface_dst: r.interface_dst,
+           srlg: r.srlg
+       } END) AS links
+"""
+
+LINK_ATTRS = ("id", "interface_src", "interface_dst", "srlg")
+
+SNAPSHOT_POINTER = "CURRENT"
+SNAPSHOT_META = "meta.json"
+SNAPSHOT_ARRAYS = ("src", "dst", "active_nodes") + EDGE_COLUMNS
+
+
+def load_topology_from_neo4j(driver) -> CompactTopology:
+    """Build a compact topology from Neo4j with a single streamed query."""
+    node_ids: List[str] = []
+    node_attrs: List[Dict[str, Any]] = []
+    index: Dict[str, int] = {}
+
+    def intern(node_id: str) -> int:
+        position = index.get(node_id)
+        if position is None:
+            position = index[node_id] = len(node_ids)
+            node_ids.append(node_id)
+            node_attrs.append({})
+        return position
+
+    src: List[int] = []
+    dst: List[int] = []
+    columns: Dict[str, List[float]] = {name: [] for name in EDGE_COLUMNS}
+    edge_attrs: List[Dict[str, Any]] = []
+    seen = set()
+
+    with driver.session() as session:
+        for record in session.run(TOPOLOGY_QUERY):
+            u = intern(record["id"])
+            node_attrs[u] = {
+                k: v for k, v in (record["attrs"] or {}).items() if v is not None
+            }
+            for link in record["links"] or []:
+                v = intern(link["target"])
+
+                # Links are undirected; keep the first of parallel entries
+                pair = (u, v) if u < v else (v, u)
+                if u == v or pair in seen:
+                    continue
+                seen.add(pair)
+
+                src.append(u)
+                dst.append(v)
+                for name in EDGE_COLUMNS:
+                    value = link.get(name)
+                    columns[name].append(np.nan if value is None else float(value))
+                edge_attrs.append({
+                    k: link[k] for k in LINK_ATTRS if link.get(k) is not None
+                })
+
+    return CompactTopology(
+        node_ids,
+        np.asarray(src, dtype=np.int32),
+        np.asarray(dst, dtype=np.int32),
+        {name: np.asarray(values, dtype=float) for name, values in columns.items()},
+        node_attrs,
+        edge_attrs
+    )
+
+
+def save_snapshot(topology: CompactTopology, directory: str, version: str):
+    """Persist a topology as memory-mappable ``.npy`` arrays plus metadata.
+
+    Each version is written to its own subdirectory and published by
+    atomically replacing the ``CURRENT`` pointer, so readers never see a
+    partial snapshot.
+    """
+    os.makedirs(directory, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=".snapshot-", dir=directory)
+    try:
+        arrays = {
+            "src": topology.src,
+            "dst": topology.dst,
+            "active_nodes": topology.active_nodes
+        }
+        arrays.update({name: topology.column(name) for name in EDGE_COLUMNS})
+        for name, values in arrays.items():
+            np.save(os.path.join(staging, f"{name}.npy"), values)
+
+        with open(os.path.join(staging, SNAPSHOT_META), "w") as f:
+            json.dump({
+                "version": version,
+                "fingerprint": topology.fingerprint(),
+                "node_ids": topology.node_ids,
+                "node_attrs": topology.node_attrs,
+                "edge_attrs": topology.edge_attrs
+            }, f, default=str)
+
+        name = _snapshot_name(version)
+        target = os.path.join(directory, name)
+        shutil.rmtree(target, ignore_errors=True)
+        os.rename(staging, target)
+    except Exception:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    pointer = os.path.join(directory, f".{SNAPSHOT_POINTER}.tmp")
+    with open(pointer, "w") as f:
+        f.write(name)
+    os.replace(pointer, os.path.join(directory, SNAPSHOT_POINTER))
+
+    # Keep only the published snapshot
+    for entry in os.listdir(directory):
+        path = os.path.join(directory, entry)
+        if entry != name and os.path.isdir(path) and not entry.startswith("."):
+            shutil.rmtree(path, ignore_errors=True)
+
+    logger.info(
+        "Topology snapshot saved",
+        directory=target,
+        topology_version=version,
+        nodes=topology.node_count,
+        links=topology.edge_count
+    )
+
+
+def load_snapshot(
+    directory: str,
+    mmap: bool = True
+) -> Optional[Tuple[CompactTopology, str]]:
+    """Load the published snapshot and its version, or None if absent."""
+    try:
+        with open(os.path.join(directory, SNAPSHOT_POINTER)) as f:
+            path = os.path.join(directory, f.read().strip())
+        with open(os.path.join(path, SNAPSHOT_META)) as f:
+            meta = json.load(f)
+        mmap_mode = "r" if mmap else None
+        arrays = {
+            name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mmap_mode)
+            for name in SNAPSHOT_ARRAYS
+        }
+    except (OSError, ValueError):
+        return None
+
+    topology = CompactTopology(
+        meta["node_ids"],
+        arrays["src"],
+        arrays["dst"],
+        {name: arrays[name] for name in EDGE_COLUMNS},
+        meta["node_attrs"],
+        meta["edge_attrs"],
+        arrays["active_nodes"]
+    )
+    return topology, meta["version"]
+
+
+def _snapshot_name(version: str) -> str:
+    """Directory name for a version (versions are discovery ids)."""
+    return "snapshot-" + "".join(
+        c if c.isalnum() or c in "-_" else "_" for c in version
+    )
@@ -0,0 +1,295 @@
+import hashlib
+from typing import Hashable, List, Optional, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.csgraph import dijkstra
+from scipy.sparse.linalg import spsolve
+
+from app.models.simulation import TrafficDemand
+from app.services.graph_core import CompactTopology, TopologyOverlay
+from app.services.shortest_paths import IncrementalShortestPaths
+
+
+class TrafficRouter:
+    """ECMP shortest-path routing of demands by OSPF cost.
+
+    Produces a sparse path-edge incidence matrix with one row per link
+    direction (``e`` for ``src->dst``, ``E + e`` for ``dst->src``) and one
+    column per demand, holding the fraction of the demand on that direction.
+    Link loads for any volume vector are then one sparse mat-vec.
+    """
+
+    def __init__(
+        self,
+        node_count: int,
+        src: np.ndarray,
+        dst: np.ndarray,
+        cost: np.ndarray,
+        active: Optional[np.ndarray] = None
+    ):
+        self.node_count = node_count
+        self.src = src
+        self.dst = dst
+        self.cost = cost
+        self.active = (
+            np.ones(len(src), dtype=bool) if active is None else active
+        )
+        self.edge_count = len(src)
+        self.matrix = sp.csr_matrix(
+            (cost[self.active], (src[self.active], dst[self.active])),
+            shape=(node_count, node_count)
+        )
+
+    @classmethod
+    def from_topology(cls, topology: CompactTopology) -> "TrafficRouter":
+        return cls(topology.node_count, topology.src, topology.dst, topology.cost)
+
+    @classmethod
+    def from_overlay(cls, overlay: TopologyOverlay) -> "TrafficRouter":
+        """Route over an overlay, keeping its link ids (inactive links unused)."""
+        added_src, added_dst = overlay.added_edges
+        return cls(
+            overlay.node_count,
+            np.concatenate([overlay.base.src, added_src]),
+            np.concatenate([overlay.base.dst, added_dst]),
+            overlay.column("cost"),
+            overlay.edge_active
+        )
+
+    def incidence(
+        self,
+        demand_src: np.ndarray,
+        demand_dst: np.ndarray,
+        columns: Optional[np.ndarray] = None
+    ) -> sp.csc_matrix:
+        """Build the incidence matrix for the selected demand columns."""
+        demand_count = len(demand_src)
+        if columns is None:
+            columns = np.arange(demand_count)
+
+        rows, cols, values = [], [], []
+        for target in np.unique(demand_dst[columns]):
+            selected = columns[demand_dst[columns] == target]
+            block_rows, block_cols, block_values = self._route_to(
+                int(target), demand_src[selected]
+            )
+            rows.append(block_rows)
+            cols.append(selected[block_cols])
+            values.append(block_values)
+
+        if not rows:
+            return sp.csc_matrix((2 * self.edge_count, demand_count))
+        return sp.csc_matrix(
+            (np.concatenate(values), (np.concatenate(rows), np.concatenate(cols))),
+            shape=(2 * self.edge_count, demand_count)
+        )
+
+    def _route_to(
+        self,
+        target: int,
+        sources: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Split demands from ``sources`` to ``target`` over the ECMP DAG."""
+        distance = dijkstra(self.matrix, directed=False, indices=target)
+
+        # Directed next hops towards the target on equal-cost shortest paths
+        finite = self.active & np.isfinite(distance[self.src]) & np.isfinite(
+            distance[self.dst]
+        )
+        forward = finite & (distance[self.src] > distance[self.dst]) & np.isclose(
+            distance[self.src], self.cost + distance[self.dst]
+        )
+        backward = finite & (distance[self.dst] > distance[self.src]) & np.isclose(
+            distance[self.dst], self.cost + distance[self.src]
+        )
+        edge_ids = np.arange(self.edge_count)
+        tails = np.concatenate([self.src[forward], self.dst[backward]])
+        heads = np.concatenate([self.dst[forward], self.src[backward]])
+        rows = np.concatenate([edge_ids[forward], self.edge_count + edge_ids[backward]])
+
+        # Equal split over next hops at every node
+        next_hops = np.bincount(tails, minlength=self.node_count)
+        split = 1.0 / next_hops[tails] if tails.size else np.zeros(0)
+
+        # Node throughput f solves f = e_s + P^T f on the acyclic DAG
+        transfer = sp.csr_matrix(
+            (split, (heads, tails)), shape=(self.node_count, self.node_count)
+        )
+        system = (sp.identity(self.node_count, format="csc") - transfer).tocsc()
+        injections = np.zeros((self.node_count, len(sources)))
+        injections[sources, np.arange(len(sources))] = 1.0
+        throughput = spsolve(system, injections)
+        throughput = throughput.reshape(self.node_count, len(sources))
+
+        # Demands whose source cannot reach the target carry nothing
+        throughput[:, ~np.isfinite(distance[sources])] = 0.0
+
+        block = throughput[tails, :] * split[:, None]
+        nonzero_rows, nonzero_cols = np.nonzero(block)
+        return rows[nonzero_rows], nonzero_cols, block[nonzero_rows, nonzero_cols]
+
+
+class TrafficModel:
+    """Demand-matrix routing stage for what-if analysis.
+
+    The incidence matrix of the baseline is built once per demand set.
+    For a scenario, only demands towards destinations whose ECMP DAG can
+    change are re-routed; every link load then comes from one sparse
+    mat-vec. Load not explained by the demands is kept as background
+    traffic from the measured utilization.
+    """
+
+    def __init__(
+        self,
+        topology: CompactTopology,
+        demands: List[TrafficDemand],
+        cost_paths: IncrementalShortestPaths
+    ):
+        self.topology = topology
+        self.cost_paths = cost_paths
+        self.demands = demands
+        self.volumes = np.array([d.volume for d in demands], dtype=float)
+        self.node_ids: List[Hashable] = [d.src for d in demands]
+        self.node_ids += [d.dst for d in demands]
+
+        src = [topology.node_index.get(d.src, -1) for d in demands]
+        dst = [topology.node_index.get(d.dst, -1) for d in demands]
+        self.demand_src = np.array(src, dtype=np.int64)
+        self.demand_dst = np.array(dst, dtype=np.int64)
+        routable = (self.demand_src >= 0) & (self.demand_dst >= 0)
+
+        router = TrafficRouter.from_topology(topology)
+        self.incidence = router.incidence(
+            self.demand_src, self.demand_dst, np.flatnonzero(routable)
+        )
+        self.directed_loads = self.incidence @ self.volumes
+        self.link_loads = self._link_loads(self.directed_loads, topology.edge_count)
+
+        # Measured load not covered by the demand matrix
+        self.background = np.maximum(
+            topology.utilization * topology.capacity - self.link_loads, 0.0
+        )
+
+    def utilization_after(
+        self,
+        overlay: TopologyOverlay
+    ) -> Tuple[np.ndarray, float]:
+        """Return post-change utilization per overlay link and unrouted volume."""
+        base_edges = self.topology.edge_count
+        edge_count = overlay.edge_count
+
+        # Demands may reference nodes that only exist in the scenario
+        demand_src = self._resolve(overlay, 0)
+        demand_dst = self._resolve(overlay, len(self.demands))
+        routable = (demand_src >= 0) & (demand_dst >= 0)
+
+        affected = routable & (
+            self._affected_destinations(overlay)[np.maximum(demand_dst, 0)]
+            | (self.demand_dst < 0) | (self.demand_src < 0)
+        )
+
+        # Keep baseline columns of unaffected demands, padded to new link ids
+        incidence = self._pad_rows(self.incidence, base_edges, edge_count)
+        incidence = incidence @ sp.diags((~affected).astype(float))
+        if affected.any():
+            router = TrafficRouter.from_overlay(overlay)
+            incidence = incidence + router.incidence(
+                demand_src, demand_dst, np.flatnonzero(affected)
+            )
+
+        directed_loads = incidence @ self.volumes
+        loads = self._link_loads(directed_loads, edge_count)
+        loads[:base_edges] += self.background
+        loads[~overlay.edge_active] = 0.0
+
+        capacity = overlay.column("capacity")
+        utilization = np.divide(
+            loads, capacity,
+            out=np.where(loads > 0, np.inf, 0.0),
+            where=capacity > 0
+        )
+
+        # Demand volume with no path after the change
+        unrouted = float(self.volumes[~routable].sum())
+        same_node = routable & (demand_src == demand_dst)
+        reached = np.asarray(incidence.sum(axis=0)).ravel() > 0
+        unrouted += float(self.volumes[routable & ~reached & ~same_node].sum())
+
+        return utilization, unrouted
+
+    def _affected_destinations(self, overlay: TopologyOverlay) -> np.ndarray:
+        """Destinations whose ECMP DAG may differ in the scenario."""
+        node_count = overlay.node_count
+        base_nodes = self.topology.node_count
+        distances = self.cost_paths.distances
+        affected = np.zeros(node_count, dtype=bool)
+        affected[base_nodes:] = True
+
+        base_edges = self.topology.edge_count
+        active = overlay.edge_active
+        cost = overlay.column("cost")
+        old_cost = self.topology.cost
+
+        # Removed or heavier links: destinations whose DAG used the link
+        worsened = ~active[:base_edges] | (cost[:base_edges] > old_cost)
+        affected[:base_nodes][
+            self.cost_paths.affected_sources(np.flatnonzero(worsened))
+        ] = True
+
+        # Added or lighter links: destinations they would be a shortest
+        # (or equal-cost) path towards
+        improved = np.flatnonzero(active[:base_edges] & (cost[:base_edges] < old_cost))
+        added_src, added_dst = overlay.added_edges
+        candidates = [
+            (self.topology.src[e], self.topology.dst[e], cost[e]) for e in improved
+        ]
+        candidates += [
+            (added_src[i], added_dst[i], cost[base_edges + i])
+            for i in np.flatnonzero(active[base_edges:])
+        ]
+        for src, dst, weight in candidates:
+            if src >= base_nodes or dst >= base_nodes:
+                affected[:] = True
+                break
+            to_src, to_dst = distances[src], distances[dst]
+            affected[:base_nodes] |= (
+                (to_src + weight <= to_dst + 1e-9)
+                | (to_dst + weight <= to_src + 1e-9)
+            )
+        return affected
+
+    def _resolve(self, overlay: TopologyOverlay, offset: int) -> np.ndarray:
+        ids = self.node_ids[offset:offset + len(self.demands)]
+        return np.array([overlay.node_position(n) for n in ids], dtype=np.int64)
+
+    @staticmethod
+    def _link_loads(directed_loads: np.ndarray, edge_count: int) -> np.ndarray:
+        """Per-link load as the busier of its two directions."""
+        return np.maximum(directed_loads[:edge_count], directed_loads[edge_count:])
+
+    @staticmethod
+    def _pad_rows(
+        incidence: sp.csc_matrix,
+        base_edges: int,
+        edge_count: int
+    ) -> sp.csc_matrix:
+        """Re-index directed rows from ``base_edges`` to ``edge_count`` links."""
+        if edge_count == base_edges:
+            return incidence
+        coo = incidence.tocoo()
+        rows = np.where(
+            coo.row < base_edges, coo.row, coo.row - base_edges + edge_count
+        )
+        return sp.csc_matrix(
+            (coo.data, (rows, coo.col)),
+            shape=(2 * edge_count, incidence.shape[1])
+        )
+
+
+def demand_key(demands: List[TrafficDemand]) -> str:
+    """Content hash of a demand matrix."""
+    digest = hashlib.sha256()
+    for demand in demands:
+        digest.update(f"{demand.src}\x1f{demand.dst}\x1f{demand.volume}\x1e".encode())
+    return digest.hexdigest()
@@ -0,0 +1,125 @@
+"""Compare result codecs against the original JSON storage path.
+
+Run from the service directory:
+
+    python -m benchmarks.bench_codecs [--paths 10 200 2000] [--redis-url URL]
+
+Reports encode/decode throughput and payload size per codec. With
+``--redis-url`` it also stores each payload and reads back Redis
+``MEMORY USAGE`` for the key.
+"""
+import argparse
+import json
+import time
+from typing import Callable, List, Optional
+
+from app.models.simulation import (
+    ImpactAnalysis, SimulationAction, SimulationRequest, SimulationResult,
+    SimulationStatus
+)
+from app.services.codecs import CODECS, PayloadCodec
+
+
+def build_result(path_count: int) -> SimulationResult:
+    """A completed result with ``path_count`` affected paths."""
+    return SimulationResult(
+        status=SimulationStatus.COMPLETED,
+        request=SimulationRequest(
+            action=SimulationAction.REMOVE_LINK, src="R1", dst="R2"
+        ),
+        impact_analysis=ImpactAnalysis(
+            affected_paths=[
+                f"R{i} -> R{i + 7} -> R{i + 13} -> R{i + 21}"
+                for i in range(path_count)
+            ],
+            congested_links=["R2-R3", "R3-R5"],
+            packet_loss=0.012,
+            latency_increase=1.75,
+            risk_level="medium",
+            recommendations=["Consider upgrading capacity on: R2-R3, R3-R5"]
+        ),
+        execution_time=0.042
+    )
+
+
+def ops_per_second(fn: Callable[[], object], min_time: float = 0.3) -> float:
+    """Repeat ``fn`` for at least ``min_time`` seconds and return its rate."""
+    count = 0
+    start_time = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < min_time:
+        for _ in range(50):
+            fn()
+        count += 50
+        elapsed = time.perf_counter() - start_time
+    return count / elapsed
+
+
+def redis_memory(client, payload: bytes) -> Optional[int]:
+    key = "bench:codec"
+    client.set(key, payload)
+    try:
+        return client.memory_usage(key)
+    finally:
+        client.delete(key)
+
+
+def run(path_counts: List[int], redis_url: Optional[str]):
+    client = None
+    if redis_url:
+        import redis
+        client = redis.from_url(redis_url)
+
+    variants = [("baseline json.dumps", None)]
+    for name in sorted(CODECS):
+        variants.append((name, PayloadCodec(name)))
+        variants.append((f"{name}+zstd", PayloadCodec(name, compression_threshold=1)))
+
+    header = f"{'codec':<22}{'bytes':>9}{'encode/s':>12}{'decode/s':>12}"
+    if client is not None:
+        header += f"{'redis bytes':>13}"
+
+    for path_count in path_counts:
+        result = build_result(path_count)
+        print(f"\naffected_paths={path_count}")
+        print(header)
+
+        for name, codec in variants:
+            if codec is None:
+                # The original _cache_simulation / get_simulation_result path
+                def encode():
+                    return json.dumps(result.model_dump(mode="json")).encode()
+
+                payload = encode()
+
+                def decode():
+                    return SimulationResult.model_validate(json.loads(payload))
+            else:
+                def encode():
+                    return codec.encode(result)
+
+                payload = encode()
+
+                def decode():
+                    return codec.decode(payload, SimulationResult)
+
+            assert decode() == result
+            line = (
+                f"{name:<22}{len(payload):>9}"
+                f"{ops_per_second(encode):>12.0f}{ops_per_second(decode):>12.0f}"
+            )
+            if client is not None:
+                line += f"{redis_memory(client, payload):>13}"
+            print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--paths", type=int, nargs="+", default=[10, 200, 2000])
+    parser.add_argument("--redis-url", default=None)
+    args = parser.parse_args()
+    run(args.paths, args.redis_url)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""Measure simulate() latency, peak memory and throughput per action type.
+
+Run from the service directory:
+
+    python -m benchmarks.bench_simulation [--nodes 100 1000 3000]
+        [--requests 20] [--actions remove_link add_link] [--seed 1]
+
+Topologies come from the tiered ISP generator and Redis and Neo4j are
+mocked, so the suite runs offline. Each size first reports the baseline
+build, then every action over distinct targets with the result cache
+cleared, so each request pays for a full analysis.
+"""
+import argparse
+import asyncio
+import logging
+import time
+import tracemalloc
+from typing import Callable, List, Tuple
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import numpy as np
+import structlog
+
+from app.models.simulation import (
+    SimulationAction, SimulationRequest, SimulationStatus
+)
+from app.services.graph_core import CompactTopology
+from app.services.simulation_engine import NetworkSimulator
+from app.services.topology_generator import generate_isp_topology
+
+# Bytes held per node pair by a baseline: latency distances, hop counts
+# and int32 predecessors
+BASELINE_BYTES_PER_PAIR = 20
+
+RequestFactory = Callable[[CompactTopology, np.random.Generator], SimulationRequest]
+
+
+def _link(topology: CompactTopology, rng: np.random.Generator) -> Tuple[str, str]:
+    e = int(rng.integers(topology.edge_count))
+    return (
+        str(topology.node_ids[topology.src[e]]),
+        str(topology.node_ids[topology.dst[e]])
+    )
+
+
+def _node(topology: CompactTopology, rng: np.random.Generator) -> str:
+    return str(topology.node_ids[int(rng.integers(topology.node_count))])
+
+
+def _remove_link(topology, rng):
+    src, dst = _link(topology, rng)
+    return SimulationRequest(action=SimulationAction.REMOVE_LINK, src=src, dst=dst)
+
+
+def _add_link(topology, rng):
+    return SimulationRequest(
+        action=SimulationAction.ADD_LINK,
+        src=_node(topology, rng), dst=_node(topology, rng), capacity=10000
+    )
+
+
+def _change_capacity(topology, rng):
+    src, dst = _link(topology, rng)
+    return SimulationRequest(
+        action=SimulationAction.CHANGE_CAPACITY, src=src, dst=dst, capacity=100
+    )
+
+
+def _add_node(topology, rng):
+    return SimulationRequest(
+        action=SimulationAction.ADD_NODE,
+        node_id=f"bench-{rng.integers(1 << 30)}",
+        parameters={"neighbors": [_node(topology, rng), _node(topology, rng)]}
+    )
+
+
+def _remove_node(topology, rng):
+    return SimulationRequest(
+        action=SimulationAction.REMOVE_NODE, node_id=_node(topology, rng)
+    )
+
+
+def _change_qos(topology, rng):
+    src, dst = _link(topology, rng)
+    return SimulationRequest(
+        action=SimulationAction.CHANGE_QOS, src=src, dst=dst,
+        qos_class="voice", parameters={"bandwidth_share": 0.5}
+    )
+
+
+def _availability(topology, rng):
+    return SimulationRequest(
+        action=SimulationAction.AVAILABILITY,
+        parameters={"trials": 1000, "seed": int(rng.integers(1 << 30))}
+    )
+
+
+ACTIONS = {
+    SimulationAction.REMOVE_LINK.value: _remove_link,
+    SimulationAction.ADD_LINK.value: _add_link,
+    SimulationAction.CHANGE_CAPACITY.value: _change_capacity,
+    SimulationAction.ADD_NODE.value: _add_node,
+    SimulationAction.REMOVE_NODE.value: _remove_node,
+    SimulationAction.CHANGE_QOS.value: _change_qos,
+    SimulationAction.AVAILABILITY.value: _availability,
+}
+
+
+def offline_simulator() -> NetworkSimulator:
+    """A simulator whose Redis and Neo4j clients are mocks."""
+    redis_client = AsyncMock()
+    redis_client.get = AsyncMock(return_value=None)
+    redis_client.pipeline = MagicMock()
+    redis_client.pipeline.return_value.execute = AsyncMock(return_value=[])
+    with patch.multiple(
+        "app.services.simulation_engine",
+        get_redis_client=lambda: redis_client,
+        get_binary_redis_client=lambda: redis_client,
+        get_neo4j_driver=MagicMock
+    ):
+        return NetworkSimulator()
+
+
+async def measure(fn) -> Tuple[float, int]:
+    """Run a coroutine function, returning seconds and traced peak bytes."""
+    tracemalloc.start()
+    try:
+        start_time = time.perf_counter()
+        await fn()
+        elapsed = time.perf_counter() - start_time
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return elapsed, peak
+
+
+async def run_size(
+    nodes: int,
+    actions: List[str],
+    requests: int,
+    seed: int
+):
+    topology = generate_isp_topology(nodes, seed=seed)
+    simulator = offline_simulator()
+    simulator._topology = topology
+    rng = np.random.default_rng(seed)
+
+    print(f"\nnodes={topology.node_count} links={topology.edge_count}")
+    elapsed, peak = await measure(simulator._prepare_baseline)
+    print(f"{'baseline':<18}{elapsed * 1000:>10.1f} ms{peak / 2**20:>10.1f} MiB")
+    baseline = await simulator._prepare_baseline()
+    print(f"{'  criticality':<18}{baseline.criticality.duration * 1000:>10.1f} ms")
+    print(
+        f"{'action':<18}{'p50 ms':>10}{'p95 ms':>10}{'req/s':>10}"
+        f"{'peak MiB':>10}{'failed':>8}"
+    )
+
+    for action in actions:
+        batch = [ACTIONS[action](topology, rng) for _ in range(requests)]
+        latencies = []
+        failed = 0
+
+        async def run_batch():
+            nonlocal failed
+            for request in batch:
+                simulator.result_cache.clear()
+                start_time = time.perf_counter()
+                result = await simulator.simulate(request)
+                latencies.append(time.perf_counter() - start_time)
+                failed += result.status != SimulationStatus.COMPLETED
+
+        elapsed, peak = await measure(run_batch)
+        p50, p95 = np.percentile(latencies, [50, 95]) * 1000
+        print(
+            f"{action:<18}{p50:>10.1f}{p95:>10.1f}{requests / elapsed:>10.1f}"
+            f"{peak / 2**20:>10.1f}{failed:>8}"
+        )
+
+
+async def run(
+    sizes: List[int],
+    actions: List[str],
+    requests: int,
+    seed: int,
+    max_memory_gb: float
+):
+    for nodes in sizes:
+        needed = BASELINE_BYTES_PER_PAIR * nodes * nodes
+        if needed > max_memory_gb * 2**30:
+            print(
+                f"\nnodes={nodes}: skipped, the dense baseline needs about "
+                f"{needed / 2**30:.1f} GiB (raise --max-memory-gb)"
+            )
+            continue
+        await run_size(nodes, actions, requests, seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, nargs="+", default=[100, 1000, 3000])
+    parser.add_argument(
+        "--actions", nargs="+", choices=sorted(ACTIONS), default=list(ACTIONS)
+    )
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--max-memory-gb", type=float, default=4.0)
+    args = parser.parse_args()
+
+    # Per-request log lines would dominate the output
+    structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(logging.ERROR)
+    )
+    asyncio.run(run(
+        args.nodes, args.actions, args.requests, args.seed, args.max_memory_gb
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 import pytest
 from fastapi.testclient import TestClient
-from unittest.mock import patch, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
 from app.main import app
 
@@ -38,6 +38,13 @@ def test_root_endpoint():
     assert "version" in data
 
 
+def test_metrics_endpoint():
+    """Test Prometheus metrics endpoint."""
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert "whatif_simulation_stage_seconds" in response.text
+
+
 def test_login_success():
     """Test successful login."""
     response = client.post(
@@ -108,6 +115,79 @@ def test_simulate_with_demo_token():
         assert data["status"] == "completed"
 
 
+def test_contingency_error_mapping():
+    """Test that bad input maps to 400 and only token errors to 401."""
+    simulator = MagicMock()
+    simulator.simulate_contingency = AsyncMock(
+        side_effect=ValueError("Unknown link: R1-NOPE")
+    )
+    with patch(
+        "app.api.v1.endpoints.simulation.get_simulator", return_value=simulator
+    ):
+        response = client.post(
+            "/api/v1/simulate/contingency",
+            json={"links": ["R1-NOPE"]},
+            headers={"Authorization": "Bearer demo-token"}
+        )
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Unknown link: R1-NOPE"
+
+        response = client.post(
+            "/api/v1/simulate/contingency",
+            json={"links": ["R1-NOPE"]},
+            headers={"Authorization": "Bearer not-a-token"}
+        )
+        assert response.status_code == 401
+
+
+def test_async_submit_error_mapping():
+    """Test that a rejected submission is a 400, not an auth failure."""
+    queue = MagicMock()
+    queue.submit = AsyncMock(side_effect=ValueError("Unknown node: R9"))
+    request = {"action": "remove_link", "src": "R1", "dst": "R9"}
+    with patch(
+        "app.api.v1.endpoints.simulation.get_job_queue", return_value=queue
+    ):
+        response = client.post(
+            "/api/v1/simulate/async",
+            json=request,
+            headers={"Authorization": "Bearer demo-token"}
+        )
+        assert response.status_code == 400
+
+        response = client.post(
+            "/api/v1/simulate/async",
+            json=request,
+            headers={"Authorization": "Bearer not-a-token"}
+        )
+        assert response.status_code == 401
+        queue.submit.assert_awaited_once()
+
+
+def test_batch_error_mapping():
+    """Test that a bad batch is a 400 and a bad token a 401."""
+    simulator = MagicMock()
+    simulator.simulate_batch = AsyncMock(side_effect=ValueError("Unknown node: R9"))
+    batch = {"scenarios": [{"action": "remove_link", "src": "R1", "dst": "R9"}]}
+    with patch(
+        "app.api.v1.endpoints.simulation.get_simulator", return_value=simulator
+    ):
+        response = client.post(
+            "/api/v1/simulate/batch",
+            json=batch,
+            headers={"Authorization": "Bearer demo-token"}
+        )
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Unknown node: R9"
+
+        response = client.post(
+            "/api/v1/simulate/batch",
+            json=batch,
+            headers={"Authorization": "Bearer not-a-token"}
+        )
+        assert response.status_code == 401
+
+
 def test_get_system_metrics():
     """Test getting system metrics."""
     response = client.get(
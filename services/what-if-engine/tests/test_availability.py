@@ -0,0 +1,87 @@
+import networkx as nx
+import pytest
+from app.models.simulation import (SimulationAction, SimulationRequest,
+                                   TrafficDemand)
+from app.services.availability import estimate_availability
+from app.services.baseline import BaselineAnalysis
+from app.services.graph_core import CompactTopology
+from app.services.impact_analyzer import ImpactAnalyzer
+
+
+def _path_topology():
+    graph = nx.Graph()
+    graph.add_edge("A", "B", capacity=100, utilization=0.5, latency=1)
+    graph.add_edge("B", "C", capacity=100, utilization=0.5, latency=1)
+    return CompactTopology.from_networkx(graph)
+
+
+def _request(**parameters):
+    return SimulationRequest(
+        action=SimulationAction.AVAILABILITY, parameters=parameters
+    )
+
+
+def test_path_availability_matches_closed_form():
+    """Test the estimate against the exact availability of a 3-node path."""
+    p = 0.1
+    estimate = estimate_availability(
+        _path_topology(),
+        _request(trials=100000, link_failure_probability=p, seed=7)
+    )
+
+    # A-B and B-C survive with 1-p, A-C needs both links
+    expected = (4 * (1 - p) + 2 * (1 - p) ** 2) / 6
+    assert estimate.availability == pytest.approx(expected, abs=0.005)
+    # Each link carries 50 Mbps, lost whenever it fails
+    assert estimate.expected_lost_traffic == pytest.approx(2 * 50 * p, rel=0.05)
+
+
+def test_seeded_estimate_independent_of_workers():
+    """Test that trial blocks and seeds do not depend on the worker count."""
+    graph = nx.connected_watts_strogatz_graph(60, 4, 0.3, seed=3)
+    for src, dst in graph.edges():
+        graph[src][dst].update(capacity=1000, utilization=0.2)
+    topology = CompactTopology.from_networkx(graph)
+    request = _request(
+        trials=30000, link_failure_probability=0.05,
+        node_failure_probability=0.01, seed=11
+    )
+
+    inline = estimate_availability(topology, request, max_workers=1)
+    pooled = estimate_availability(topology, request, max_workers=2)
+
+    assert inline == pooled
+    assert 0.0 < inline.availability < 1.0
+
+
+def test_availability_action_reports_demand_loss():
+    """Test the availability action with demands and per-element overrides."""
+    baseline = BaselineAnalysis(_path_topology())
+
+    impact = ImpactAnalyzer().evaluate(baseline, SimulationRequest(
+        action=SimulationAction.AVAILABILITY,
+        parameters={
+            "trials": 20000, "seed": 1, "link_failure_probability": 0.0,
+            "failure_probabilities": {"C": 0.5}
+        },
+        traffic_matrix=[
+            TrafficDemand(src="A", dst="C", volume=40),
+            TrafficDemand(src="A", dst="B", volume=10)
+        ]
+    ))
+
+    assert impact.failure_trials == 20000
+    assert impact.expected_lost_traffic == pytest.approx(20, rel=0.05)
+    # Only pairs involving C fail, half of the time
+    assert impact.availability == pytest.approx(1 - 0.5 * 4 / 6, abs=0.01)
+    low, high = impact.availability_interval
+    assert low <= impact.availability <= high
+    assert impact.risk_level == "critical"
+
+
+def test_invalid_probability_rejected():
+    """Test that probabilities outside [0, 1] are rejected."""
+    with pytest.raises(ValueError):
+        estimate_availability(
+            _path_topology(), _request(link_failure_probability=1.5)
+        )
@@ -0,0 +1,53 @@
+import json
+
+import pytest
+from app.models.simulation import (ImpactAnalysis, SimulationAction,
+                                   SimulationRequest, SimulationResult,
+                                   SimulationStatus)
+from app.services.codecs import CODECS, PayloadCodec
+
+
+@pytest.fixture
+def result():
+    return SimulationResult(
+        status=SimulationStatus.COMPLETED,
+        request=SimulationRequest(action=SimulationAction.ADD_LINK, src="R1", dst="R3"),
+        impact_analysis=ImpactAnalysis(
+            affected_paths=[f"R{i} -> R{i + 1} -> R{i + 2}" for i in range(200)],
+            risk_level="medium"
+        ),
+        execution_time=0.5
+    )
+
+
+@pytest.mark.parametrize("codec", sorted(CODECS))
+@pytest.mark.parametrize("threshold", [0, 256])
+def test_round_trip(result, codec, threshold):
+    """Test that every codec, compressed or not, round-trips a result."""
+    payload_codec = PayloadCodec(codec, compression_threshold=threshold)
+    
+    payload = payload_codec.encode(result)
+    
+    assert PayloadCodec().decode(payload, SimulationResult) == result
+
+
+def test_legacy_json_payload_decodes(result):
+    """Test that results stored before the codec layer still decode."""
+    legacy = json.dumps(result.model_dump(mode="json"))
+    
+    assert PayloadCodec("orjson").decode(legacy, SimulationResult) == result
+
+
+def test_compression_shrinks_large_payloads(result):
+    """Test that large affected-path lists are compressed."""
+    plain = PayloadCodec("json").encode(result)
+    compressed = PayloadCodec("json", compression_threshold=1024).encode(result)
+    
+    assert len(compressed) < len(plain) / 3
+
+
+def test_unknown_codec_falls_back_to_json(result):
+    """Test that an unavailable codec falls back to plain JSON."""
+    payload = PayloadCodec("does-not-exist").encode(result)
+    
+    assert payload.startswith(b"{")
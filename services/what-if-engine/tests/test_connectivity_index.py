@@ -0,0 +1,85 @@
+import networkx as nx
+import pytest
+from app.models.simulation import SimulationAction, SimulationRequest
+from app.services.baseline import BaselineAnalysis
+from app.services.connectivity_index import ConnectivityIndex
+from app.services.graph_core import CompactTopology
+from app.services.impact_analyzer import ImpactAnalyzer
+
+
+@pytest.fixture
+def baseline():
+    """Two triangles joined by a bridge, with a stub pair off the second."""
+    graph = nx.Graph()
+    graph.add_edges_from([
+        ("A", "B"), ("B", "C"), ("C", "A"),
+        ("C", "D"),
+        ("D", "E"), ("E", "F"), ("F", "D"),
+        ("F", "G"), ("G", "H")
+    ])
+    for src, dst in graph.edges():
+        graph[src][dst].update(capacity=1000, utilization=0.2, latency=5)
+    return BaselineAnalysis(CompactTopology.from_networkx(graph))
+
+
+def _names(topology, nodes):
+    return sorted(str(topology.node_ids[i]) for i in nodes)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_index_matches_networkx(seed):
+    """Test bridges and articulation points against NetworkX."""
+    graph = nx.gnm_random_graph(40, 50, seed=seed)
+    topology = CompactTopology.from_networkx(graph)
+    index = ConnectivityIndex(topology)
+
+    bridges = {
+        topology.find_edge(topology.node_index[u], topology.node_index[v])
+        for u, v in nx.bridges(graph)
+    }
+    articulation = {
+        topology.node_index[n] for n in nx.articulation_points(graph)
+    }
+    assert set(index.bridges.tolist()) == bridges
+    assert set(index.articulation_points.tolist()) == articulation
+    assert index.connected == nx.is_connected(graph)
+
+
+def test_groups_cut_off_by_bridge_and_node(baseline):
+    """Test the smaller side of a bridge and the pieces around a cut node."""
+    topology = baseline.topology
+    index = baseline.connectivity
+    bridge = topology.find_edge(
+        topology.node_index["C"], topology.node_index["D"]
+    )
+
+    groups = index.groups_without_link(bridge)
+    assert [_names(topology, g) for g in groups] == [["A", "B", "C"]]
+    assert index.lost_pairs_without_link(bridge) == 2 * 3 * 5
+
+    groups = index.groups_without_node(topology.node_index["F"])
+    assert [_names(topology, g) for g in groups] == [["G", "H"]]
+    assert index.groups_without_node(topology.node_index["A"]) == []
+
+
+def test_remove_bridge_reports_disconnected_groups(baseline):
+    """Test that REMOVE_LINK and REMOVE_NODE report the groups they cut off."""
+    analyzer = ImpactAnalyzer()
+
+    impact = analyzer.evaluate(baseline, SimulationRequest(
+        action=SimulationAction.REMOVE_LINK, src="C", dst="D"
+    ))
+    assert impact.risk_level == "critical"
+    assert impact.disconnected_groups == [["A", "B", "C"]]
+
+    impact = analyzer.evaluate(baseline, SimulationRequest(
+        action=SimulationAction.REMOVE_NODE, src="D"
+    ))
+    assert impact.risk_level == "critical"
+    assert impact.disconnected_groups == [["A", "B", "C"]]
+
+    impact = analyzer.evaluate(baseline, SimulationRequest(
+        action=SimulationAction.REMOVE_LINK, src="A", dst="B"
+    ))
+    assert impact.disconnected_groups == []
+    assert impact.risk_level != "critical"
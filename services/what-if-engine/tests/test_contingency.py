@@ -0,0 +1,80 @@
+import random
+
+import networkx as nx
+import pytest
+from app.models.simulation import (ContingencyRequest, SimulationAction,
+                                   SimulationRequest)
+from app.services.baseline import BaselineAnalysis
+from app.services.contingency import ContingencySweep
+from app.services.graph_core import CompactTopology
+from app.services.impact_analyzer import ImpactAnalyzer
+
+
+@pytest.fixture
+def baseline():
+    """Baseline of a random mesh with a stub router hanging off it."""
+    rng = random.Random(3)
+    graph = nx.connected_watts_strogatz_graph(20, 4, 0.3, seed=3)
+    graph = nx.relabel_nodes(graph, {n: f"R{n}" for n in graph.nodes()})
+    graph.add_edge("R0", "STUB")
+    for src, dst in graph.edges():
+        graph[src][dst].update(
+            capacity=1000, utilization=rng.uniform(0.1, 0.5),
+            latency=rng.randint(1, 10)
+        )
+    return BaselineAnalysis(CompactTopology.from_networkx(graph))
+
+
+def test_n1_matches_remove_link_simulation(baseline):
+    """Test each N-1 failure against a full REMOVE_LINK analysis."""
+    analyzer = ImpactAnalyzer()
+    sweep = ContingencySweep(baseline, analyzer)
+    topology = baseline.topology
+
+    for edge_id in range(topology.edge_count):
+        failure = sweep.evaluate_failure((edge_id,))
+        src = topology.node_ids[topology.src[edge_id]]
+        dst = topology.node_ids[topology.dst[edge_id]]
+        impact = analyzer.evaluate(baseline, SimulationRequest(
+            action=SimulationAction.REMOVE_LINK, src=src, dst=dst
+        ))
+
+        assert failure.latency_increase == pytest.approx(impact.latency_increase)
+        assert failure.disconnected == (impact.risk_level == "critical")
+
+
+def test_n1_sweep_reports_bridge_first(baseline):
+    """Test that the stub link is reported as a partitioning failure."""
+    sweep = ContingencySweep(baseline, ImpactAnalyzer())
+
+    result = sweep.run(ContingencyRequest(order=1))
+
+    assert result.scenarios_evaluated == baseline.topology.edge_count
+    assert result.failures[0].failed_links == ["R0-STUB"]
+    assert result.failures[0].risk_level == "critical"
+    assert result.failures[0].connectivity_loss > 0
+
+
+def test_n2_detects_two_link_cuts():
+    """Test that N-2 finds cuts made of two non-bridge links."""
+    graph = nx.cycle_graph(4)
+    graph = nx.relabel_nodes(graph, {n: f"R{n}" for n in graph.nodes()})
+    for src, dst in graph.edges():
+        graph[src][dst].update(capacity=1000, utilization=0.2, latency=1)
+    baseline = BaselineAnalysis(CompactTopology.from_networkx(graph))
+    sweep = ContingencySweep(baseline, ImpactAnalyzer())
+
+    result = sweep.run(ContingencyRequest(order=2))
+
+    assert sweep.bridges == set()
+    assert result.scenarios_evaluated == 6
+    assert result.partitioning_failures == 6
+    assert not result.truncated
+
+
+def test_unknown_link_is_rejected(baseline):
+    """Test candidate link validation."""
+    sweep = ContingencySweep(baseline, ImpactAnalyzer())
+
+    with pytest.raises(ValueError):
+        sweep.run(ContingencyRequest(links=["R1-NOPE"]))
@@ -0,0 +1,93 @@
+import networkx as nx
+import numpy as np
+import pytest
+from app.models.simulation import SimulationAction, SimulationRequest
+from app.services import criticality
+from app.services.baseline import BaselineAnalysis
+from app.services.criticality import shortest_path_counts
+from app.services.graph_core import CompactTopology
+from app.services.impact_analyzer import ImpactAnalyzer
+
+
+def _weighted_graph(seed):
+    """Random graph with small integer latencies, so paths tie often."""
+    rng = np.random.default_rng(seed)
+    graph = nx.gnm_random_graph(40, 70, seed=seed)
+    for src, dst in graph.edges():
+        graph[src][dst].update(
+            latency=int(rng.integers(1, 4)), capacity=1000,
+            utilization=float(rng.uniform(0.1, 0.5))
+        )
+    return graph
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_path_counts_match_networkx_betweenness(seed):
+    """Test link and node counts against unnormalized NetworkX betweenness."""
+    graph = _weighted_graph(seed)
+    topology = CompactTopology.from_networkx(graph)
+    links, nodes = shortest_path_counts(topology, topology.latency)
+
+    expected = nx.edge_betweenness_centrality(
+        graph, weight="latency", normalized=False
+    )
+    for (src, dst), value in expected.items():
+        edge_id = topology.find_edge(
+            topology.node_index[src], topology.node_index[dst]
+        )
+        assert links[edge_id] == pytest.approx(value)
+    expected = nx.betweenness_centrality(graph, weight="latency", normalized=False)
+    for node, value in expected.items():
+        assert nodes[topology.node_index[node]] == pytest.approx(value)
+
+
+def test_pooled_and_sampled_counts(monkeypatch):
+    """Test that the shared compute pool agrees and sampling estimates the totals."""
+    monkeypatch.setattr(criticality, "POOL_MIN_SOURCES", 0)
+    topology = CompactTopology.from_networkx(_weighted_graph(5))
+    exact = shortest_path_counts(topology, topology.latency)
+    pooled = shortest_path_counts(topology, topology.latency, max_workers=2)
+    sampled = shortest_path_counts(topology, topology.latency, max_sources=20)
+
+    np.testing.assert_allclose(pooled[0], exact[0])
+    np.testing.assert_allclose(pooled[1], exact[1])
+    assert sampled[0].sum() == pytest.approx(exact[0].sum(), rel=0.5)
+
+
+def test_report_ranks_bridge_and_hub_first():
+    """Test that the only link into a stub region and its hub rank highest."""
+    graph = nx.Graph()
+    graph.add_edges_from(nx.cycle_graph(["A", "B", "C", "D"]).edges())
+    graph.add_edges_from([("D", "E"), ("E", "F"), ("E", "G")])
+    for src, dst in graph.edges():
+        graph[src][dst].update(capacity=1000, utilization=0.2, latency=5)
+    baseline = BaselineAnalysis(CompactTopology.from_networkx(graph))
+
+    report = baseline.criticality.report(limit=3)
+
+    assert report.topology_version == baseline.version
+    assert report.links[0].element in ("D-E", "E-D")
+    assert report.links[0].cut
+    assert report.nodes[0].element in ("D", "E") and report.nodes[0].cut
+    scores = [link.score for link in report.links]
+    assert scores == sorted(scores, reverse=True)
+    assert len(report.links) == 3
+
+
+def test_critical_link_removal_raises_risk():
+    """Test that removing a high-betweenness link is never rated low risk."""
+    graph = nx.Graph()
+    graph.add_edges_from(nx.cycle_graph(8).edges())
+    graph.add_edge(0, 4)
+    graph = nx.relabel_nodes(graph, {n: f"R{n}" for n in graph.nodes()})
+    for src, dst in graph.edges():
+        graph[src][dst].update(capacity=1000, utilization=0.1, latency=1)
+    baseline = BaselineAnalysis(CompactTopology.from_networkx(graph))
+    analyzer = ImpactAnalyzer()
+
+    impact = analyzer.evaluate(baseline, SimulationRequest(
+        action=SimulationAction.REMOVE_LINK, src="R0", dst="R4"
+    ))
+    assert impact.risk_level in ("medium", "high")
+    assert analyzer._assess_risk_level(True, True, 0.0, [], 0.0) == "low"
+    assert analyzer._assess_risk_level(True, True, 0.0, [], 0.7) == "high"
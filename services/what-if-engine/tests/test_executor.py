@@ -0,0 +1,97 @@
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+from app.services.executor import AnalysisExecutor, ExecutorSaturated
+
+
+@pytest.mark.asyncio
+async def test_jobs_run_off_event_loop():
+    """Test that the event loop keeps running while a job blocks."""
+    executor = AnalysisExecutor(max_workers=1)
+    ticks = []
+
+    async def heartbeat():
+        for _ in range(5):
+            ticks.append(time.perf_counter())
+            await asyncio.sleep(0.01)
+
+    result, _ = await asyncio.gather(
+        executor.run(lambda: (time.sleep(0.1), threading.get_ident())[1]),
+        heartbeat()
+    )
+
+    assert result != threading.get_ident()
+    assert len(ticks) == 5
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_queue_depth_and_wait_times():
+    """Test queued jobs wait for a slot and are counted."""
+    executor = AnalysisExecutor(max_workers=1, max_queue=4)
+    release = threading.Event()
+
+    first = asyncio.ensure_future(executor.run(release.wait))
+    second = asyncio.ensure_future(executor.run(lambda: "done"))
+    await asyncio.sleep(0.05)
+
+    stats = executor.stats()
+    assert stats["running"] == 1
+    assert stats["queue_depth"] == 1
+
+    release.set()
+    assert await second == "done"
+    await first
+
+    stats = executor.stats()
+    assert stats["completed"] == 2
+    assert stats["queue_depth"] == 0
+    assert stats["max_wait_time"] > 0
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_full_queue_rejects_jobs():
+    """Test back-pressure once workers and queue are full."""
+    executor = AnalysisExecutor(max_workers=1, max_queue=1)
+    release = threading.Event()
+
+    running = asyncio.ensure_future(executor.run(release.wait))
+    queued = asyncio.ensure_future(executor.run(lambda: None))
+    await asyncio.sleep(0.05)
+
+    with pytest.raises(ExecutorSaturated):
+        await executor.run(lambda: None)
+    assert executor.stats()["rejected"] == 1
+
+    release.set()
+    await asyncio.gather(running, queued)
+    executor.shutdown()
+
+
+def _scaled_square(state, item):
+    if item < 0:
+        raise ValueError(f"Negative item: {item}")
+    return os.getpid(), state * item * item
+
+
+def test_fan_out_runs_on_shared_compute_pool():
+    """Test that items run in pool processes and item errors propagate."""
+    executor = AnalysisExecutor(pool_workers=2)
+    try:
+        results = executor.fan_out(_scaled_square, 2, list(range(8)), 2)
+
+        assert [value for _, value in results] == [2 * i * i for i in range(8)]
+        assert os.getpid() not in {pid for pid, _ in results}
+
+        pool = executor._compute_pool
+        with pytest.raises(ValueError):
+            executor.fan_out(_scaled_square, 2, [1, -1], 2)
+        # A failing item is not retried inline and keeps the pool
+        assert executor._compute_pool is pool
+        assert executor.shared._refs == {}
+    finally:
+        executor.shutdown()
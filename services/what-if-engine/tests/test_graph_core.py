@@ -0,0 +1,94 @@
+import networkx as nx
+import numpy as np
+import pytest
+from app.services.graph_core import CompactTopology, as_compact, default_cost
+
+
+@pytest.fixture
+def graph():
+    """Small router graph."""
+    graph = nx.Graph()
+    graph.add_node("R1", type="router")
+    graph.add_edge("R1", "R2", capacity=1000, utilization=0.65, latency=2)
+    graph.add_edge("R2", "R3", capacity=500, utilization=0.9, latency=3, cost=7)
+    graph.add_edge("R1", "R3", capacity=1000, utilization=0.4, latency=5)
+    return graph
+
+
+def test_from_networkx_interns_nodes_and_columns(graph):
+    """Test conversion into integer ids and NumPy columns."""
+    topology = CompactTopology.from_networkx(graph)
+
+    assert topology.node_ids == ["R1", "R2", "R3"]
+    assert topology.edge_count == 3
+    assert np.allclose(topology.capacity, [1000, 1000, 500])
+    assert topology.cost[topology.find_edge(1, 2)] == 7
+    # Missing cost falls back to the capacity-derived default
+    assert topology.cost[topology.find_edge(0, 1)] == default_cost(
+        np.array([1000.0])
+    )[0]
+    assert topology.node_attrs[0] == {"type": "router"}
+
+
+def test_csr_adjacency_lists_both_directions(graph):
+    """Test CSR neighbors of every node."""
+    topology = CompactTopology.from_networkx(graph)
+
+    neighbors, edge_ids = topology.incident_edges(topology.node_index["R2"])
+
+    assert sorted(topology.node_ids[n] for n in neighbors) == ["R1", "R3"]
+    assert len(set(edge_ids.tolist())) == 2
+
+
+def test_overlay_does_not_touch_base(graph):
+    """Test copy-on-write behaviour of scenario overlays."""
+    topology = CompactTopology.from_networkx(graph)
+    capacity = topology.capacity
+
+    overlay = topology.overlay()
+    overlay.set_edge_attrs("R1", "R2", capacity=10)
+    overlay.remove_edge("R2", "R3")
+    overlay.add_edge("R3", "R4", capacity=100, latency=1)
+
+    assert topology.capacity is capacity
+    assert topology.capacity[0] == 1000
+    assert overlay["R1"]["R2"]["capacity"] == 10
+    assert not overlay.has_edge("R2", "R3")
+    assert overlay.has_edge("R4", "R3")
+    assert overlay.node_count == 4
+
+
+def test_overlay_materialize_matches_networkx(graph):
+    """Test that a materialized overlay equals the NetworkX equivalent."""
+    overlay = CompactTopology.from_networkx(graph).overlay()
+    overlay.remove_node("R2")
+    overlay.add_edge("R1", "R4", capacity=100)
+
+    expected = graph.copy()
+    expected.remove_node("R2")
+    expected.add_edge("R1", "R4", capacity=100)
+
+    result = overlay.to_networkx()
+    assert set(result.nodes()) == set(expected.nodes())
+    assert {frozenset(e) for e in result.edges()} == {
+        frozenset(e) for e in expected.edges()
+    }
+    assert as_compact(overlay).is_connected()
+
+
+def test_overlay_columns_cached_until_changed(graph):
+    """Test merged columns are reused, then rebuilt after a change."""
+    overlay = CompactTopology.from_networkx(graph).overlay()
+    overlay.add_edge("R3", "R4", capacity=100)
+
+    capacity = overlay.column("capacity")
+    assert overlay.column("capacity") is capacity
+    assert not capacity.flags.writeable
+
+    overlay.set_edge_attrs("R4", "R3", capacity=400)
+    assert overlay.column("capacity")[3] == 400
+    assert overlay.find_edge(3, 2) == overlay.find_edge(2, 3) == 3
+    assert overlay["R4"]["R3"]["capacity"] == 400
+
+    overlay.remove_node("R4")
+    assert not overlay.has_edge("R3", "R4")
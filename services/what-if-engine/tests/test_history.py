@@ -0,0 +1,143 @@
+from datetime import datetime, timedelta
+
+import pytest
+from app.models.simulation import (ImpactAnalysis, SimulationAction,
+                                   SimulationRequest, SimulationResult,
+                                   SimulationStatus)
+from app.services.history import SimulationHistory
+
+
+class FakeRedis:
+    """In-memory stand-in for the sorted-set commands the index uses."""
+    
+    def __init__(self):
+        self.values = {}
+        self.zsets = {}
+    
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+    
+    async def mget(self, keys):
+        return [self.values.get(key) for key in keys]
+    
+    def zadd(self, key, mapping):
+        self.zsets.setdefault(key, {}).update(mapping)
+    
+    def zrem(self, key, *members):
+        for member in members:
+            self.zsets.get(key, {}).pop(member, None)
+    
+    def zremrangebyscore(self, key, low, high):
+        zset = self.zsets.get(key, {})
+        for member in [m for m, score in zset.items() if score <= high]:
+            del zset[member]
+    
+    def zinterstore(self, dest, keys, aggregate="MAX"):
+        members = set.intersection(*(set(self.zsets.get(k, {})) for k in keys))
+        self.zsets[dest] = {
+            m: max(self.zsets[k][m] for k in keys) for m in members
+        }
+    
+    def expire(self, key, ttl):
+        pass
+    
+    def zcard(self, key):
+        return len(self.zsets.get(key, {}))
+    
+    def zrevrange(self, key, start, stop):
+        ordered = sorted(self.zsets.get(key, {}).items(), key=lambda i: -i[1])
+        return [member for member, _ in ordered[start:stop + 1]]
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+    
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.calls.append((getattr(self.redis, name), args, kwargs))
+            return self
+        return queue
+    
+    async def execute(self):
+        return [fn(*args, **kwargs) for fn, args, kwargs in self.calls]
+
+
+def _result(index, action, status, risk_level=None):
+    result = SimulationResult(
+        simulation_id=f"sim-{index}",
+        status=status,
+        request=SimulationRequest(action=action, src="R1", dst="R2"),
+        impact_analysis=ImpactAnalysis(risk_level=risk_level) if risk_level else None,
+        created_at=datetime.utcnow() - timedelta(seconds=100 - index)
+    )
+    return result
+
+
+async def _store(redis, history, result):
+    redis.values[f"simulation:{result.simulation_id}"] = result.model_dump_json()
+    await history.record(result)
+
+
+@pytest.mark.asyncio
+async def test_pages_newest_first():
+    """Test limit/offset pagination over the created_at index."""
+    redis = FakeRedis()
+    history = SimulationHistory(redis)
+    for i in range(5):
+        await _store(redis, history, _result(
+            i, SimulationAction.ADD_LINK, SimulationStatus.COMPLETED, "low"
+        ))
+    
+    page, total = await history.page(limit=2, offset=1)
+    
+    assert total == 5
+    assert [r.simulation_id for r in page] == ["sim-3", "sim-2"]
+
+
+@pytest.mark.asyncio
+async def test_filters_and_status_transitions():
+    """Test secondary indexes, combined filters and status moves."""
+    redis = FakeRedis()
+    history = SimulationHistory(redis)
+    pending = _result(0, SimulationAction.REMOVE_LINK, SimulationStatus.PENDING)
+    await _store(redis, history, pending)
+    await _store(redis, history, _result(
+        1, SimulationAction.ADD_LINK, SimulationStatus.COMPLETED, "high"
+    ))
+    await _store(redis, history, _result(
+        2, SimulationAction.REMOVE_LINK, SimulationStatus.COMPLETED, "high"
+    ))
+    
+    page, total = await history.page(status=SimulationStatus.PENDING)
+    assert [r.simulation_id for r in page] == ["sim-0"]
+    
+    pending.status = SimulationStatus.COMPLETED
+    pending.impact_analysis = ImpactAnalysis(risk_level="low")
+    await _store(redis, history, pending)
+    
+    assert (await history.page(status=SimulationStatus.PENDING))[1] == 0
+    page, total = await history.page(
+        action=SimulationAction.REMOVE_LINK, risk_level="high",
+        status=SimulationStatus.COMPLETED
+    )
+    assert total == 1
+    assert page[0].simulation_id == "sim-2"
+
+
+@pytest.mark.asyncio
+async def test_expired_results_are_pruned():
+    """Test that ids whose results expired are dropped from the index."""
+    redis = FakeRedis()
+    history = SimulationHistory(redis)
+    for i in range(2):
+        await _store(redis, history, _result(
+            i, SimulationAction.ADD_LINK, SimulationStatus.COMPLETED, "low"
+        ))
+    del redis.values["simulation:sim-1"]
+    
+    page, _ = await history.page()
+    
+    assert [r.simulation_id for r in page] == ["sim-0"]
+    assert (await history.page())[1] == 1
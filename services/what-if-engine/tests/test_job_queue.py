@@ -0,0 +1,193 @@
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from app.models.simulation import (SimulationAction, SimulationRequest,
+                                   SimulationResult, SimulationStatus)
+from app.services.job_queue import SimulationJobQueue
+from app.services.simulation_engine import NetworkSimulator
+
+
+@pytest.fixture
+def mock_redis():
+    """Dict-backed Redis mock so job status round-trips."""
+    store = {}
+    mock_redis = AsyncMock()
+    mock_redis.get = AsyncMock(side_effect=lambda key: store.get(key))
+
+    async def setex(key, ttl, value):
+        store[key] = value
+        return True
+
+    mock_redis.setex = AsyncMock(side_effect=setex)
+    mock_redis.pipeline = MagicMock()
+    mock_redis.pipeline.return_value.execute = AsyncMock(return_value=[])
+    return mock_redis
+
+
+@pytest.fixture
+def simulator(mock_redis, monkeypatch):
+    """Create NetworkSimulator with mocked dependencies."""
+    monkeypatch.setattr(
+        "app.services.simulation_engine.get_redis_client",
+        lambda: mock_redis
+    )
+    monkeypatch.setattr(
+        "app.services.simulation_engine.get_binary_redis_client",
+        lambda: mock_redis
+    )
+    monkeypatch.setattr(
+        "app.services.simulation_engine.get_neo4j_driver",
+        lambda: MagicMock()
+    )
+    return NetworkSimulator()
+
+
+async def _wait_for_status(simulator, simulation_id, status, timeout=2.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        result = await simulator.get_simulation_result(simulation_id)
+        if result and result.status == status:
+            return result
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"Simulation never reached {status}")
+
+
+@pytest.mark.asyncio
+async def test_submit_returns_pending_then_completes(simulator):
+    """Test that submission returns immediately and the job completes."""
+    queue = SimulationJobQueue(simulator, backend="memory")
+    request = SimulationRequest(
+        action=SimulationAction.REMOVE_LINK, src="R1", dst="R2"
+    )
+
+    result = await queue.submit(request)
+    assert result.status == SimulationStatus.PENDING
+
+    completed = await _wait_for_status(
+        simulator, result.simulation_id, SimulationStatus.COMPLETED
+    )
+    assert completed.impact_analysis is not None
+    await queue.stop()
+
+
+@pytest.mark.asyncio
+async def test_cancel_running_job(simulator, monkeypatch):
+    """Test that cancelling a running job marks it CANCELLED."""
+    started = asyncio.Event()
+
+    async def slow_baseline():
+        started.set()
+        await asyncio.sleep(10)
+
+    monkeypatch.setattr(simulator, "_prepare_baseline", slow_baseline)
+    queue = SimulationJobQueue(simulator, backend="memory")
+
+    result = await queue.submit(SimulationRequest(
+        action=SimulationAction.REMOVE_LINK, src="R1", dst="R2"
+    ))
+    await asyncio.wait_for(started.wait(), 1)
+    await queue.cancel(result.simulation_id)
+
+    await _wait_for_status(
+        simulator, result.simulation_id, SimulationStatus.CANCELLED
+    )
+    await queue.stop()
+
+
+@pytest.mark.asyncio
+async def test_job_exceeding_time_limit_fails(simulator, monkeypatch):
+    """Test that MAX_SIMULATION_TIME is enforced on queued jobs."""
+    async def slow_baseline():
+        await asyncio.sleep(10)
+
+    monkeypatch.setattr(simulator, "_prepare_baseline", slow_baseline)
+    queue = SimulationJobQueue(simulator, backend="memory", timeout=0.05)
+
+    result = await queue.submit(SimulationRequest(
+        action=SimulationAction.REMOVE_LINK, src="R1", dst="R2"
+    ))
+
+    failed = await _wait_for_status(
+        simulator, result.simulation_id, SimulationStatus.FAILED
+    )
+    assert "time limit" in failed.error_message
+    await queue.stop()
+
+
+@pytest.mark.asyncio
+async def test_stream_trimmed_and_abandoned_jobs_reclaimed(simulator, mock_redis):
+    """Test stream trimming and recovery of jobs a dead worker left pending."""
+    queue = SimulationJobQueue(simulator, backend="redis", max_length=500)
+    request = SimulationRequest(
+        action=SimulationAction.REMOVE_LINK, src="R1", dst="R2"
+    )
+    await queue._enqueue("job-1", request)
+    assert mock_redis.xadd.call_args.kwargs == {"maxlen": 500, "approximate": True}
+
+    pending = SimulationResult(
+        simulation_id="pending", status=SimulationStatus.PENDING, request=request
+    )
+    running = SimulationResult(
+        simulation_id="running", status=SimulationStatus.RUNNING, request=request
+    )
+    for result in (pending, running):
+        await simulator._cache_simulation(result)
+    fields = {"request": request.model_dump_json()}
+    mock_redis.xautoclaim = AsyncMock(return_value=[
+        "0-0",
+        [
+            ("1-0", {**fields, "simulation_id": "pending"}),
+            ("2-0", {**fields, "simulation_id": "running"}),
+            ("3-0", None)
+        ],
+        []
+    ])
+    mock_redis.xadd.reset_mock()
+
+    assert await queue._reclaim_stale_jobs() == 2
+
+    # Never started: queued again; started: failed instead of re-run
+    assert mock_redis.xadd.call_args.args[1]["simulation_id"] == "pending"
+    failed = await simulator.get_simulation_result("running")
+    assert failed.status == SimulationStatus.FAILED
+    assert "worker stopped" in failed.error_message
+    assert [c.args[2] for c in mock_redis.xack.call_args_list] == ["1-0", "2-0", "3-0"]
+
+
+@pytest.mark.asyncio
+async def test_job_interrupted_by_stop_stays_pending(
+    simulator, mock_redis, monkeypatch
+):
+    """Test that a job cut off by a stopping worker is left for reclaiming."""
+    started = asyncio.Event()
+
+    async def slow_baseline():
+        started.set()
+        await asyncio.sleep(10)
+
+    monkeypatch.setattr(simulator, "_prepare_baseline", slow_baseline)
+    request = SimulationRequest(
+        action=SimulationAction.REMOVE_LINK, src="R1", dst="R2"
+    )
+    messages = [[("simulation:jobs", [("1-0", {
+        "simulation_id": "job-1", "request": request.model_dump_json()
+    })])]]
+
+    async def xreadgroup(*args, **kwargs):
+        if messages:
+            return messages.pop()
+        await asyncio.sleep(10)
+
+    mock_redis.xreadgroup = AsyncMock(side_effect=xreadgroup)
+    mock_redis.xautoclaim = AsyncMock(return_value=["0-0", [], []])
+    queue = SimulationJobQueue(simulator, backend="redis", workers=1)
+
+    await queue.start()
+    await asyncio.wait_for(started.wait(), 1)
+    await queue.stop()
+
+    mock_redis.xack.assert_not_called()
+    result = await simulator.get_simulation_result("job-1")
+    assert result.status == SimulationStatus.RUNNING
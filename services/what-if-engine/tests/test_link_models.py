@@ -0,0 +1,102 @@
+import networkx as nx
+import numpy as np
+import pytest
+from app.core.config import settings
+from app.services.baseline import BaselineAnalysis
+from app.services.graph_core import CompactTopology
+from app.services.link_models import (LinkPerformanceModel, MD1Model,
+                                      MM1KModel, MM1Model, ThresholdModel,
+                                      create_link_model)
+
+
+def _mm1k_reference(load, k, service):
+    """M/M/1/K loss and waiting time from the explicit state distribution."""
+    states = np.arange(k + 1)
+    weights = load ** states
+    probabilities = weights / weights.sum()
+    in_system = float((states * probabilities).sum())
+    admitted = load * (1 - probabilities[-1])
+    return probabilities[-1], in_system * service / admitted - service
+
+
+@pytest.mark.parametrize("load", [0.3, 0.9, 1.0, 1.4, 3.0])
+def test_mm1k_matches_state_distribution(load):
+    """Test the finite-buffer model on both sides of saturation."""
+    model = MM1KModel(buffer_packets=16)
+    capacity = np.array([100.0])
+    service = model.service_time(capacity)[0]
+
+    loss, wait = _mm1k_reference(load, 16, service)
+    assert model.loss(np.array([load]))[0] == pytest.approx(loss, rel=1e-6)
+    assert model.delay(np.array([load]), capacity)[0] == pytest.approx(
+        wait, rel=1e-6, abs=1e-9
+    )
+
+
+def test_open_queue_models():
+    """Test M/M/1 and M/D/1 waiting times and the threshold model's loss."""
+    capacity = np.array([12.0, 12.0, 0.0])
+    utilization = np.array([0.5, 2.0, 0.5])
+
+    # 1500-byte packets over 12 Mbps take 1 ms
+    mm1 = MM1Model().delay(utilization, capacity)
+    assert mm1[0] == pytest.approx(1.0)
+    assert mm1[1] > 100 and mm1[2] == 0.0
+    assert MD1Model().delay(utilization, capacity)[0] == pytest.approx(0.5)
+    assert MM1Model().loss(utilization)[1] == pytest.approx(0.5)
+
+    np.testing.assert_allclose(
+        ThresholdModel().loss(np.array([0.5, 0.9, 1.5])), [0.0, 0.05, 0.1]
+    )
+    with pytest.raises(ValueError):
+        create_link_model("unknown")
+    with pytest.raises(TypeError):
+        LinkPerformanceModel()
+
+
+def test_default_model_keeps_threshold_loss():
+    """Test that the queueing models are opt-in, not the default."""
+    model = create_link_model(settings.LINK_PERFORMANCE_MODEL)
+
+    assert isinstance(model, ThresholdModel)
+    assert model.loss(np.array([0.9]))[0] == pytest.approx(0.05)
+
+
+def test_models_vectorize_over_many_links():
+    """Test that every model evaluates 100k links in one pass."""
+    rng = np.random.default_rng(3)
+    utilization = rng.uniform(0.0, 1.5, 100000)
+    capacity = rng.choice([0.0, 100.0, 10000.0], 100000)
+
+    for name in ("threshold", "mm1", "md1", "mm1k"):
+        model = create_link_model(name)
+        loss = model.loss(utilization)
+        delay = model.delay(utilization, capacity)
+        assert loss.shape == delay.shape == (100000,)
+        assert np.isfinite(delay).all() and (delay >= 0).all()
+        assert ((loss >= 0) & (loss <= 1)).all()
+
+
+def test_path_latency_includes_queueing_delay():
+    """Test that latency paths route around a heavily queued link."""
+    graph = nx.Graph()
+    graph.add_edge("A", "B", capacity=12, utilization=0.95, latency=1)
+    graph.add_edge("A", "C", capacity=12, utilization=0.1, latency=2)
+    graph.add_edge("C", "B", capacity=12, utilization=0.1, latency=2)
+    topology = CompactTopology.from_networkx(graph)
+    a, b = topology.node_index["A"], topology.node_index["B"]
+
+    plain = BaselineAnalysis(topology)
+    queued = BaselineAnalysis(topology, MM1Model())
+
+    assert plain.latency_paths.distances[a, b] == pytest.approx(1.0)
+    # The direct link queues for 19 ms, the detour for about 0.2 ms
+    assert queued.latency_paths.distances[a, b] == pytest.approx(
+        4 + 2 * 0.1 / 0.9
+    )
+
+    # Scenario updates keep pricing in queueing delay
+    overlay = topology.overlay()
+    overlay.set_edge_attrs("A", "B", utilization=0.1)
+    updated = queued.latency_paths.apply_overlay(overlay)
+    assert updated[a, b] == pytest.approx(1 + 0.1 / 0.9)
@@ -0,0 +1,115 @@
+import itertools
+
+import networkx as nx
+import numpy as np
+import pytest
+from app.models.simulation import (LinkCandidate, LinkOptimizationRequest,
+                                   TrafficDemand)
+from app.services.baseline import BaselineAnalysis
+from app.services.executor import get_executor
+from app.services.graph_core import CompactTopology
+from app.services.link_optimizer import LinkOptimizer
+from app.services.topology_generator import generate_isp_topology
+
+
+@pytest.fixture(scope="module")
+def baseline():
+    return BaselineAnalysis(generate_isp_topology(200, seed=2))
+
+
+def _candidates(topology, count, seed):
+    """Random unlinked node pairs with prices of 1 to 3."""
+    rng = np.random.default_rng(seed)
+    candidates, seen = [], set()
+    while len(candidates) < count:
+        a, b = rng.choice(topology.node_count, 2, replace=False)
+        if topology.find_edge(a, b) >= 0 or frozenset((a, b)) in seen:
+            continue
+        seen.add(frozenset((a, b)))
+        candidates.append(LinkCandidate(
+            src=str(topology.node_ids[a]), dst=str(topology.node_ids[b]),
+            latency=2, price=float(rng.integers(1, 4))
+        ))
+    return candidates
+
+
+def test_search_matches_brute_force(baseline):
+    """Test that branch-and-bound finds the best subset within the budget."""
+    request = LinkOptimizationRequest(
+        candidates=_candidates(baseline.topology, 10, seed=0),
+        budget=5, max_links=3
+    )
+    optimizer = LinkOptimizer(baseline, request)
+    result = optimizer.run()
+
+    best = min(
+        optimizer._selection_values(selection)[-1]
+        for k in range(1, 4)
+        for selection in itertools.combinations(range(10), k)
+        if optimizer.prices[list(selection)].sum() <= 5
+    )
+    assert result.optimal
+    assert result.optimized_value == pytest.approx(best)
+    assert result.optimized_value <= result.greedy_value < result.baseline_value
+    assert result.total_price <= 5 and len(result.links) <= 3
+    assert sum(link.improvement for link in result.links) == pytest.approx(
+        result.baseline_value - result.optimized_value
+    )
+
+
+def test_parallel_evaluation_matches_inline(baseline):
+    """Test that pooled candidate evaluation selects the same links."""
+    request = LinkOptimizationRequest(
+        candidates=_candidates(baseline.topology, 8, seed=1),
+        budget=4, max_links=2
+    )
+    inline = LinkOptimizer(baseline, request).run()
+    pooled = LinkOptimizer(baseline, request).run(max_workers=2)
+
+    assert pooled.links == inline.links
+    assert pooled.optimized_value == inline.optimized_value
+    # The optimizer shared with the compute pool is dropped after the run
+    assert get_executor().shared._refs == {}
+
+
+def test_peak_utilization_objective():
+    """Test that a shortcut link offloads a congested path."""
+    graph = nx.path_graph(["A", "B", "C", "D"])
+    for src, dst in graph.edges():
+        graph[src][dst].update(capacity=100, utilization=0.0, latency=1, cost=1)
+    baseline = BaselineAnalysis(CompactTopology.from_networkx(graph))
+    request = LinkOptimizationRequest(
+        candidates=[
+            LinkCandidate(src="A", dst="C", cost=1),
+            LinkCandidate(src="A", dst="D", cost=1)
+        ],
+        budget=1,
+        objective="peak_utilization",
+        traffic_matrix=[TrafficDemand(src="A", dst="D", volume=80)]
+    )
+
+    result = LinkOptimizer(baseline, request).run()
+
+    assert result.baseline_value == pytest.approx(0.8)
+    assert [(link.src, link.dst) for link in result.links] == [("A", "D")]
+    assert result.optimized_value == pytest.approx(0.08)
+
+
+def test_invalid_candidates_rejected(baseline):
+    """Test unknown nodes, existing links and missing demands."""
+    topology = baseline.topology
+    src, dst = (str(topology.node_ids[i]) for i in (topology.src[0], topology.dst[0]))
+    for candidate in (
+        LinkCandidate(src="nowhere", dst=dst),
+        LinkCandidate(src=src, dst=dst)
+    ):
+        with pytest.raises(ValueError):
+            LinkOptimizer(baseline, LinkOptimizationRequest(
+                candidates=[candidate], budget=1
+            ))
+
+    with pytest.raises(ValueError):
+        LinkOptimizer(baseline, LinkOptimizationRequest(
+            candidates=_candidates(topology, 1, seed=0), budget=1,
+            objective="peak_utilization"
+        ))
@@ -0,0 +1,88 @@
+import pytest
+from app.models.simulation import SimulationAction, SimulationRequest
+from app.services.baseline import BaselineAnalysis
+from app.services.impact_analyzer import ImpactAnalyzer
+from app.services.pair_sampling import SourceSampler
+from app.services.topology_generator import generate_isp_topology
+
+
+@pytest.fixture(scope="module")
+def baseline():
+    return BaselineAnalysis(generate_isp_topology(600, seed=4))
+
+
+def _remove_link(baseline, edge_id, **parameters):
+    topology = baseline.topology
+    return SimulationRequest(
+        action=SimulationAction.REMOVE_LINK,
+        src=topology.node_ids[topology.src[edge_id]],
+        dst=topology.node_ids[topology.dst[edge_id]],
+        parameters=parameters
+    )
+
+
+def _busiest_ring_link(baseline):
+    """The ring link on the most shortest-path trees."""
+    topology = baseline.topology
+    ring = [
+        e for e, attrs in enumerate(topology.edge_attrs)
+        if attrs["tier"] == "ring"
+    ]
+    return max(
+        ring, key=lambda e: baseline.latency_paths.affected_sources([e]).size
+    )
+
+
+def test_exhaustive_sampling_matches_exact_analysis(baseline):
+    """Test that sampling every source reproduces the exact latency delta."""
+    analyzer = ImpactAnalyzer()
+    edge_id = _busiest_ring_link(baseline)
+    exact = analyzer.evaluate(baseline, _remove_link(baseline, edge_id))
+
+    overlay = analyzer._apply_simulation_changes(
+        baseline.topology, _remove_link(baseline, edge_id)
+    )
+    sampler = SourceSampler(
+        baseline, overlay.materialize(), accuracy=1e-12, time_budget=60
+    )
+    latency = sampler.latency_change()
+    paths = sampler.affected_pairs()
+
+    assert latency.exact and paths.exact
+    assert latency.mean == pytest.approx(exact.latency_increase)
+    assert latency.interval == [latency.mean, latency.mean]
+    assert paths.mean > 0
+    assert sampler.affected_paths
+
+
+def test_approximate_request_reports_interval(baseline):
+    """Test sampled estimates, their bounds and seeded reproducibility."""
+    analyzer = ImpactAnalyzer()
+    edge_id = _busiest_ring_link(baseline)
+    exact = analyzer.evaluate(baseline, _remove_link(baseline, edge_id))
+    request = _remove_link(baseline, edge_id, approximate=True, seed=3)
+
+    impact = analyzer.evaluate(baseline, request)
+    again = analyzer.evaluate(baseline, request)
+
+    low, high = impact.latency_interval
+    assert low <= exact.latency_increase <= high
+    assert low <= impact.latency_increase <= high
+    low, high = impact.affected_pair_interval
+    assert low <= impact.affected_pair_fraction <= high
+    assert 0 < impact.sampled_sources < baseline.topology.node_count
+    assert len(impact.affected_paths) <= 10
+    assert again == impact
+
+    # Exact analysis reports no sampling fields
+    assert exact.latency_interval is None and exact.sampled_sources is None
+
+
+def test_approximate_parameters_validated(baseline):
+    """Test that invalid accuracy and time budgets are rejected."""
+    analyzer = ImpactAnalyzer()
+    for parameters in ({"accuracy": 0}, {"time_budget": -1}):
+        with pytest.raises(ValueError):
+            analyzer.evaluate(
+                baseline, _remove_link(baseline, 0, approximate=True, **parameters)
+            )
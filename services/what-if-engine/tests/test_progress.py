@@ -0,0 +1,100 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from app.models.simulation import (SimulationAction, SimulationProgress,
+                                   SimulationRequest, SimulationResult,
+                                   SimulationStatus)
+from app.services.progress import ProgressBroker
+from app.services.simulation_engine import NetworkSimulator
+
+
+@pytest.fixture
+def simulator(monkeypatch):
+    """Create NetworkSimulator with a dict-backed Redis and in-process broker."""
+    store = {}
+    mock_redis = AsyncMock()
+    mock_redis.get = AsyncMock(side_effect=lambda key: store.get(key))
+
+    async def setex(key, ttl, value):
+        store[key] = value
+        return True
+
+    mock_redis.setex = AsyncMock(side_effect=setex)
+    mock_redis.pipeline = MagicMock()
+    mock_redis.pipeline.return_value.execute = AsyncMock(return_value=[])
+
+    for name in ("get_redis_client", "get_binary_redis_client"):
+        monkeypatch.setattr(
+            f"app.services.simulation_engine.{name}", lambda: mock_redis
+        )
+    monkeypatch.setattr(
+        "app.services.simulation_engine.get_neo4j_driver",
+        lambda: MagicMock()
+    )
+    simulator = NetworkSimulator()
+    simulator.progress = ProgressBroker(backend="memory")
+    return simulator
+
+
+@pytest.mark.asyncio
+async def test_broker_delivers_only_to_matching_subscribers():
+    """Test that subscribers receive events of their own simulation."""
+    broker = ProgressBroker(backend="memory")
+
+    async with broker.subscribe("a") as first, broker.subscribe("b") as second:
+        await broker.publish(SimulationProgress(simulation_id="a", stage="load"))
+
+        event = await first.get(timeout=1)
+        assert event.stage == "load"
+        assert await second.get(timeout=0.01) is None
+
+    assert not broker._subscribers
+
+
+@pytest.mark.asyncio
+async def test_watch_streams_stages_and_fragments(simulator):
+    """Test that a watcher sees every stage, partial analysis and the result."""
+    request = SimulationRequest(
+        action=SimulationAction.REMOVE_LINK, src="R1", dst="R2"
+    )
+    pending = SimulationResult(status=SimulationStatus.PENDING, request=request)
+    await simulator._cache_simulation(pending)
+
+    async def collect():
+        return [
+            event async for event in simulator.watch(pending.simulation_id)
+            if event is not None
+        ]
+
+    watcher = asyncio.create_task(collect())
+    await asyncio.sleep(0)
+    await simulator.simulate(request, simulation_id=pending.simulation_id)
+    events = await asyncio.wait_for(watcher, 2)
+
+    stages = [event.stage for event in events]
+    assert stages[0] == "pending"
+    assert stages[-1] == "completed"
+    assert stages.index("load") < stages.index("apply") < stages.index("analyze")
+
+    fragments = {}
+    for event in events:
+        if event.impact_analysis:
+            fragments.update(event.impact_analysis)
+    final = events[-1].result.impact_analysis
+    assert fragments["risk_level"] == final.risk_level
+    assert fragments["affected_paths"] == final.affected_paths
+
+
+@pytest.mark.asyncio
+async def test_watch_finished_simulation_yields_result_once(simulator):
+    """Test that watching a finished simulation returns its result and stops."""
+    request = SimulationRequest(
+        action=SimulationAction.REMOVE_LINK, src="R1", dst="R2"
+    )
+    result = await simulator.simulate(request)
+
+    events = [event async for event in simulator.watch(result.simulation_id)]
+    assert len(events) == 1
+    assert events[0].status == SimulationStatus.COMPLETED
+    assert events[0].result.impact_analysis == result.impact_analysis
@@ -0,0 +1,112 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import networkx as nx
+import numpy as np
+import pytest
+from app.models.simulation import (ReplayRequest, SimulationAction,
+                                   SimulationRequest)
+from app.services.baseline import BaselineAnalysis
+from app.services.graph_core import CompactTopology
+from app.services.replay import load_utilization_history, run_replay
+
+START = datetime(2024, 1, 1)
+
+
+def _triangle():
+    graph = nx.Graph()
+    for src, dst, capacity in [("A", "B", 1000), ("B", "C", 1000), ("A", "C", 500)]:
+        graph.add_edge(
+            src, dst, capacity=capacity, utilization=0.1, latency=1,
+            interface_src=f"{src}-to-{dst}", interface_dst=f"{dst}-to-{src}"
+        )
+    return CompactTopology.from_networkx(graph)
+
+
+class FakeClickHouse:
+    def __init__(self, rows):
+        self.rows = rows
+        self.parameters = None
+
+    def query(self, sql, parameters=None):
+        self.parameters = parameters
+        return SimpleNamespace(result_rows=self.rows)
+
+
+def test_history_matrix_fills_gaps():
+    """Test interface matching, busier-end selection and gap filling."""
+    topology = _triangle()
+    t0, t1, t2 = (START + timedelta(minutes=5 * i) for i in range(3))
+    client = FakeClickHouse([
+        (t0, "A", "A-to-B", 0.3),
+        (t0, "B", "B-to-A", 0.5),
+        (t1, "A", "A-to-B", 0.2),
+        (t2, "A", "A-to-B", 0.4),
+        (t2, "B", "B-to-C", 0.6),
+        (t2, "X", "unknown", 0.9),
+    ])
+
+    timestamps, history = load_utilization_history(client, topology, days=1)
+
+    assert timestamps == [t0, t1, t2]
+    assert sorted(client.parameters["devices"]) == ["A", "B", "C"]
+    ab = topology.find_edge(topology.node_index["A"], topology.node_index["B"])
+    bc = topology.find_edge(topology.node_index["B"], topology.node_index["C"])
+    ac = topology.find_edge(topology.node_index["A"], topology.node_index["C"])
+    assert np.allclose(history[:, ab], [0.5, 0.2, 0.4])
+    assert np.allclose(history[:, bc], [0.1, 0.1, 0.6])  # leading gap: static
+    assert np.allclose(history[:, ac], 0.1)  # never sampled: static
+
+
+def test_removed_link_load_replayed_on_detour():
+    """Test that every interval reroutes the removed link's load."""
+    topology = _triangle()
+    baseline = BaselineAnalysis(topology)
+    index = topology.node_index
+    ab = topology.find_edge(index["A"], index["B"])
+    bc = topology.find_edge(index["B"], index["C"])
+    ac = topology.find_edge(index["A"], index["C"])
+
+    intervals = 288
+    rng = np.random.default_rng(4)
+    history = rng.uniform(0.05, 0.5, size=(intervals, 3))
+    timestamps = [START + timedelta(minutes=5 * i) for i in range(intervals)]
+
+    result = run_replay(baseline, ReplayRequest(
+        scenario=SimulationRequest(
+            action=SimulationAction.REMOVE_LINK, src="A", dst="C"
+        ),
+        percentile=90
+    ), timestamps, history)
+
+    # Reference: A-C load (capacity 500) lands on both 1000 links
+    moved = history[:, ac] * 500 / 1000
+    expected = np.stack([history[:, ab] + moved, history[:, bc] + moved], axis=1)
+    peaks = expected.max(axis=1)
+
+    assert result.intervals == intervals
+    assert result.peak_utilization == pytest.approx(peaks.max())
+    assert result.percentile_utilization == pytest.approx(np.percentile(peaks, 90))
+    assert result.baseline_peak_utilization == pytest.approx(history.max())
+    assert result.congested_intervals == int((peaks > 0.8).sum())
+    assert result.busiest_interval == timestamps[int(np.argmax(peaks))]
+    assert result.peak_unrouted_traffic == 0.0
+    assert {link.link for link in result.links} == {"A-B", "B-C"}
+
+
+def test_partitioning_change_reports_unrouted_traffic():
+    """Test that load without a surviving path is reported as unrouted."""
+    graph = nx.Graph()
+    graph.add_edge("A", "B", capacity=100, utilization=0.2)
+    baseline = BaselineAnalysis(CompactTopology.from_networkx(graph))
+    history = np.array([[0.2], [0.7]])
+
+    result = run_replay(baseline, ReplayRequest(
+        scenario=SimulationRequest(
+            action=SimulationAction.REMOVE_LINK, src="A", dst="B"
+        )
+    ), [START, START + timedelta(minutes=5)], history)
+
+    assert result.peak_unrouted_traffic == pytest.approx(70.0)
+    assert result.peak_utilization == 0.0
+    assert result.links == []
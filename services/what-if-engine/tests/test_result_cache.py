@@ -0,0 +1,105 @@
+from unittest.mock import AsyncMock
+
+import pytest
+from app.models.simulation import (ImpactAnalysis, SimulationAction,
+                                   SimulationRequest)
+from app.services.codecs import PayloadCodec
+from app.services.link_models import MM1KModel, ThresholdModel
+from app.services.result_cache import (RESULT_KEY, ResultCache,
+                                       is_reproducible, request_key)
+
+MODEL = ThresholdModel().config()
+
+
+def test_request_key_is_canonical():
+    """Test that equal requests share a key and versions do not."""
+    first = SimulationRequest(
+        action=SimulationAction.ADD_LINK, src="R1", dst="R5",
+        parameters={"a": 1, "b": 2}
+    )
+    second = SimulationRequest(
+        action=SimulationAction.ADD_LINK, dst="R5", src="R1",
+        parameters={"b": 2, "a": 1}
+    )
+    
+    assert request_key("v1", first, MODEL) == request_key("v1", second, MODEL)
+    assert request_key("v1", first, MODEL) != request_key("v2", first, MODEL)
+
+
+def test_request_key_includes_link_model():
+    """Test that replicas with different link models do not share entries."""
+    request = SimulationRequest(action=SimulationAction.ADD_LINK, src="R1", dst="R5")
+    keys = {
+        request_key("v1", request, model.config())
+        for model in (
+            ThresholdModel(), MM1KModel(), MM1KModel(buffer_packets=16)
+        )
+    }
+    
+    assert len(keys) == 3
+
+
+def test_random_and_sampled_runs_not_memoized():
+    """Test that only reproducible requests are cached."""
+    def request(action, **parameters):
+        return SimulationRequest(action=action, parameters=parameters)
+    
+    assert is_reproducible(request(SimulationAction.REMOVE_LINK))
+    assert is_reproducible(request(SimulationAction.AVAILABILITY, seed=7))
+    assert not is_reproducible(request(SimulationAction.AVAILABILITY))
+    assert not is_reproducible(
+        request(SimulationAction.REMOVE_LINK, approximate=True, seed=7)
+    )
+
+
+@pytest.mark.asyncio
+async def test_result_served_from_redis():
+    """Test that another replica's result is reused and kept locally."""
+    impact = ImpactAnalysis(risk_level="high", packet_loss=0.02)
+    redis_client = AsyncMock()
+    redis_client.get = AsyncMock(return_value=impact.model_dump_json())
+    cache = ResultCache(redis_client)
+    compute = AsyncMock()
+    
+    first = await cache.get_or_compute("key", compute)
+    second = await cache.get_or_compute("key", compute)
+    
+    assert first == impact and second == impact
+    compute.assert_not_called()
+    redis_client.get.assert_awaited_once_with(RESULT_KEY.format(key="key"))
+
+
+@pytest.mark.asyncio
+async def test_results_stored_through_codec():
+    """Test that entries are encoded and read back by another replica."""
+    impact = ImpactAnalysis(
+        risk_level="low", affected_paths=[f"R{i} -> R{i + 1}" for i in range(200)]
+    )
+    store = {}
+    redis_client = AsyncMock()
+    redis_client.get = AsyncMock(side_effect=lambda key: store.get(key))
+
+    async def setex(key, ttl, value):
+        store[key] = value
+
+    redis_client.setex = AsyncMock(side_effect=setex)
+    codec = PayloadCodec("json", compression_threshold=64)
+
+    await ResultCache(redis_client, codec=codec).put("key", impact)
+    payload = store[RESULT_KEY.format(key="key")]
+
+    assert payload == codec.encode(impact)
+    assert await ResultCache(redis_client, codec=codec).get("key") == impact
+
+
+@pytest.mark.asyncio
+async def test_local_lru_evicts_oldest():
+    """Test the local LRU bound."""
+    redis_client = AsyncMock()
+    redis_client.get = AsyncMock(return_value=None)
+    cache = ResultCache(redis_client, max_entries=2)
+    
+    for key in ("a", "b", "c"):
+        await cache.put(key, ImpactAnalysis())
+    
+    assert list(cache._local) == ["b", "c"]
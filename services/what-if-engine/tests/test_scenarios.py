@@ -0,0 +1,114 @@
+import random
+
+import networkx as nx
+import numpy as np
+import pytest
+from app.models.simulation import (ScenarioStep, SimulationAction,
+                                   SimulationRequest)
+from app.services.baseline import BaselineAnalysis
+from app.services.graph_core import CompactTopology
+from app.services.impact_analyzer import ImpactAnalyzer
+from scipy.sparse.csgraph import dijkstra
+
+
+@pytest.fixture
+def baseline():
+    """Baseline of a random mesh with varied latencies."""
+    rng = random.Random(8)
+    graph = nx.connected_watts_strogatz_graph(30, 4, 0.3, seed=8)
+    graph = nx.relabel_nodes(graph, {n: f"R{n}" for n in graph.nodes()})
+    for src, dst in graph.edges():
+        graph[src][dst].update(
+            capacity=1000, utilization=rng.uniform(0.1, 0.5),
+            latency=rng.randint(1, 10)
+        )
+    return BaselineAnalysis(CompactTopology.from_networkx(graph))
+
+
+def _maintenance_plan(topology):
+    links = [
+        (topology.node_ids[topology.src[e]], topology.node_ids[topology.dst[e]])
+        for e in range(topology.edge_count)
+    ]
+    return [
+        ScenarioStep(action=SimulationAction.REMOVE_LINK, src=links[0][0], dst=links[0][1]),
+        ScenarioStep(
+            action=SimulationAction.ADD_NODE, node_id="R99", latency=1,
+            parameters={"neighbors": ["R3", "R17"]}
+        ),
+        ScenarioStep(action=SimulationAction.REMOVE_NODE, node_id="R5"),
+        ScenarioStep(action=SimulationAction.ADD_LINK, src="R2", dst="R20", latency=2),
+        ScenarioStep(action=SimulationAction.REMOVE_LINK, src=links[7][0], dst=links[7][1]),
+        ScenarioStep(action=SimulationAction.REMOVE_LINK, src="R3", dst="R99"),
+    ]
+
+
+def test_stepwise_distances_match_full_recompute(baseline):
+    """Test that chained incremental updates equal Dijkstra on each state."""
+    engine = baseline.latency_paths
+    analyzer = ImpactAnalyzer()
+    overlay = baseline.topology.overlay()
+    distances = engine.distances
+    active, weights = overlay.edge_active, engine.weights
+
+    for step in _maintenance_plan(baseline.topology):
+        analyzer._apply_step(overlay, step)
+        distances = engine.update(distances, active, weights, overlay)
+        active, weights = overlay.edge_active, overlay.column("latency")
+
+        modified = overlay.materialize()
+        expected = dijkstra(modified.weight_matrix("latency"), directed=False)
+        np.fill_diagonal(expected, 0.0)
+        assert np.allclose(distances, expected)
+
+
+def test_multi_step_request_reports_step_deltas(baseline):
+    """Test per-step deltas and that the final state matches one-shot analysis."""
+    first, *rest = _maintenance_plan(baseline.topology)
+    request = SimulationRequest(
+        action=first.action, src=first.src, dst=first.dst, steps=rest
+    )
+    analyzer = ImpactAnalyzer()
+
+    impact = analyzer.evaluate(baseline, request)
+
+    assert [step.step for step in impact.steps] == list(range(1, 7))
+    assert impact.steps[1].action == SimulationAction.ADD_NODE
+    assert impact.steps[2].target == "R5"
+    # Removing R5 cuts it off from the 29 other baseline nodes, both ways
+    assert impact.steps[2].disconnected_pairs == 58
+    assert impact.steps[-1].cumulative_latency_increase == pytest.approx(
+        impact.latency_increase
+    )
+
+    modified = analyzer._apply_simulation_changes(baseline.topology, request)
+    assert impact.latency_increase == pytest.approx(
+        analyzer._calculate_latency_impact(baseline.topology, modified, baseline)
+    )
+
+
+def test_change_qos_scales_class_utilization():
+    """Test that a bandwidth share raises the class's utilization."""
+    graph = nx.Graph()
+    graph.add_edge("A", "B", capacity=1000, utilization=0.5, latency=1)
+    graph.add_edge("A", "C", capacity=1000, utilization=0.3, latency=1)
+    baseline = BaselineAnalysis(CompactTopology.from_networkx(graph))
+
+    impact = ImpactAnalyzer().evaluate(baseline, SimulationRequest(
+        action=SimulationAction.CHANGE_QOS, node_id="A", qos_class="voice",
+        parameters={"bandwidth_share": 0.5}
+    ))
+
+    assert impact.congested_links == ["A-B"]
+
+
+def test_node_actions_require_node():
+    """Test that node actions without a node fail instead of being ignored."""
+    graph = nx.Graph()
+    graph.add_edge("A", "B", capacity=1000, utilization=0.5, latency=1)
+    baseline = BaselineAnalysis(CompactTopology.from_networkx(graph))
+
+    with pytest.raises(ValueError):
+        ImpactAnalyzer().evaluate(baseline, SimulationRequest(
+            action=SimulationAction.REMOVE_NODE
+        ))
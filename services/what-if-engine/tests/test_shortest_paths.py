@@ -0,0 +1,95 @@
+import random
+
+import networkx as nx
+import numpy as np
+import pytest
+from app.services.graph_core import CompactTopology
+from app.services.shortest_paths import IncrementalShortestPaths
+
+
+def _reference_distances(graph, nodes):
+    """Compute the expected distance matrix with NetworkX."""
+    lengths = dict(nx.all_pairs_dijkstra_path_length(graph, weight="latency"))
+    index = {node: i for i, node in enumerate(nodes)}
+    distances = np.full((len(nodes), len(nodes)), np.inf)
+    for src, targets in lengths.items():
+        for dst, length in targets.items():
+            distances[index[src], index[dst]] = length
+    return distances
+
+
+@pytest.fixture
+def random_graph():
+    """Random connected weighted graph."""
+    rng = random.Random(7)
+    graph = nx.connected_watts_strogatz_graph(40, 4, 0.3, seed=7)
+    graph = nx.relabel_nodes(graph, {n: f"R{n}" for n in graph.nodes()})
+    for src, dst in graph.edges():
+        graph[src][dst]["latency"] = rng.randint(1, 10)
+    return graph
+
+
+def test_baseline_matches_networkx(random_graph):
+    """Test baseline matrix against NetworkX Dijkstra."""
+    engine = IncrementalShortestPaths(random_graph)
+
+    expected = _reference_distances(random_graph, engine.nodes)
+    assert np.allclose(engine.distances, expected)
+
+
+def test_remove_edges_matches_full_recompute(random_graph):
+    """Test incremental update after removing links."""
+    engine = IncrementalShortestPaths(random_graph)
+    modified = random_graph.copy()
+    for src, dst in list(modified.edges())[:5]:
+        modified.remove_edge(src, dst)
+
+    distances = engine.distances_after(modified)
+
+    expected = _reference_distances(modified, engine.nodes)
+    assert np.allclose(distances, expected)
+
+
+def test_mixed_changes_match_full_recompute(random_graph):
+    """Test incremental update with added, removed and re-weighted links."""
+    engine = IncrementalShortestPaths(random_graph)
+    modified = random_graph.copy()
+    edges = list(modified.edges())
+    modified.remove_edge(*edges[0])
+    modified[edges[1][0]][edges[1][1]]["latency"] = 50
+    modified[edges[2][0]][edges[2][1]]["latency"] = 0.5
+    modified.add_edge("R0", "R20", latency=1)
+    modified.add_edge("R5", "NEW", latency=2)
+
+    distances = engine.distances_after(modified)
+
+    nodes = engine.nodes + ["NEW"]
+    expected = _reference_distances(modified, nodes)
+    assert np.allclose(distances, expected)
+
+
+def test_removed_node_is_unreachable(random_graph):
+    """Test that a removed node keeps its index but becomes isolated."""
+    engine = IncrementalShortestPaths(random_graph)
+    modified = random_graph.copy()
+    modified.remove_node("R3")
+
+    distances = engine.distances_after(modified)
+
+    index = engine.index["R3"]
+    assert np.isinf(np.delete(distances[index], index)).all()
+
+
+def test_overlay_fast_path_matches_full_recompute(random_graph):
+    """Test updates expressed as an overlay over the baseline topology."""
+    topology = CompactTopology.from_networkx(random_graph)
+    engine = IncrementalShortestPaths(topology)
+    overlay = topology.overlay()
+    src, dst = list(random_graph.edges())[3]
+    overlay.remove_edge(src, dst)
+    overlay.add_edge("R1", "R30", latency=1)
+
+    distances = engine.distances_after(overlay)
+
+    expected = _reference_distances(overlay.to_networkx(), engine.nodes)
+    assert np.allclose(distances, expected)
@@ -14,6 +14,8 @@ def mock_redis():
     mock_redis.ping = AsyncMock(return_value=True)
     mock_redis.get = AsyncMock(return_value=None)
     mock_redis.setex = AsyncMock(return_value=True)
+    mock_redis.pipeline = MagicMock()
+    mock_redis.pipeline.return_value.execute = AsyncMock(return_value=[])
     return mock_redis
 
 
@@ -32,6 +34,10 @@ def simulator(mock_redis, mock_neo4j, monkeypatch):
         "app.services.simulation_engine.get_redis_client",
         lambda: mock_redis
     )
+    monkeypatch.setattr(
+        "app.services.simulation_engine.get_binary_redis_client",
+        lambda: mock_redis
+    )
     monkeypatch.setattr(
         "app.services.simulation_engine.get_neo4j_driver", 
         lambda: mock_neo4j
@@ -209,4 +215,235 @@ async def test_cache_simulation(simulator, mock_redis):
     mock_redis.setex.assert_called()
     args = mock_redis.setex.call_args[0]
     assert args[0].startswith("simulation:")
-    assert args[1] == 3600  # TTL
\ No newline at end of file
+    assert args[1] == 3600  # TTL
+
+def test_find_affected_paths(simulator):
+    """Test affected path detection on the compact topology."""
+    graph = simulator._generate_synthetic_topology()
+    request = SimulationRequest(
+        action=SimulationAction.REMOVE_LINK,
+        src="R1",
+        dst="R2"
+    )
+    
+    modified_graph = simulator._apply_simulation_changes(graph, request)
+    affected_paths = simulator._find_affected_paths(graph, modified_graph)
+    
+    assert "R1 -> R3 -> R2" in affected_paths
+    assert all("R1 -> R2" not in path for path in affected_paths)
+
+
+@pytest.mark.asyncio
+async def test_baseline_cache_reused_per_topology_version(simulator, monkeypatch):
+    """Test that the baseline is computed once per topology version."""
+    from app.services.graph_core import CompactTopology
+    
+    graph = simulator._generate_synthetic_topology()
+    
+    async def load():
+        return CompactTopology.from_networkx(graph)
+    
+    monkeypatch.setattr(simulator, "_load_network_topology", load)
+    first = await simulator._prepare_baseline()
+    
+    # A reload of identical content maps to the cached version
+    simulator._topology = None
+    second = await simulator._prepare_baseline()
+    
+    assert first is second
+    
+    graph["R1"]["R2"]["latency"] = 20
+    simulator._topology = None
+    changed = await simulator._prepare_baseline()
+    
+    assert changed is not first
+    assert changed.version != first.version
+    assert len(simulator._graph_cache) == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_baseline_misses_computed_once(simulator, monkeypatch):
+    """Test that concurrent requests for a new version share one baseline."""
+    calls = []
+    original = simulator.executor.run
+    
+    async def counting_run(fn, *args, **kwargs):
+        calls.append(fn)
+        return await original(fn, *args, **kwargs)
+    
+    monkeypatch.setattr(simulator.executor, "run", counting_run)
+    baselines = await asyncio.gather(
+        *[simulator._prepare_baseline() for _ in range(3)]
+    )
+    
+    assert len(calls) == 1
+    assert all(b is baselines[0] for b in baselines)
+    assert simulator._baseline_inflight == {}
+
+
+@pytest.mark.asyncio
+async def test_process_mode_keeps_baseline_resident(simulator):
+    """Test that process workers receive the baseline by key only."""
+    from app.services.executor import AnalysisExecutor, SharedRef
+    
+    executor = AnalysisExecutor(kind="process", max_workers=1)
+    simulator.executor = executor
+    try:
+        baseline = await simulator._prepare_baseline()
+        key = simulator._baseline_key(baseline)
+        assert isinstance(simulator._share_baseline(baseline), SharedRef)
+        
+        result = await simulator.simulate(SimulationRequest(
+            action=SimulationAction.REMOVE_LINK, src="R1", dst="R2"
+        ))
+        
+        assert result.status == SimulationStatus.COMPLETED
+        assert "apply" in result.stage_timings
+        assert list(executor.shared._refs) == [key]
+        
+        simulator.invalidate_topology_cache()
+        assert executor.shared._refs == {}
+    finally:
+        executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_topology_version_change_invalidates_baseline(simulator, mock_redis):
+    """Test that a rediscovery drops cached baselines."""
+    mock_redis.get.return_value = "discovery-1"
+    await simulator._sync_topology_version()
+    await simulator._prepare_baseline()
+    assert len(simulator._graph_cache) == 1
+    
+    mock_redis.get.return_value = "discovery-2"
+    await simulator._sync_topology_version()
+    
+    assert simulator._graph_cache == {}
+
+
+@pytest.mark.asyncio
+async def test_simulate_batch_ranks_scenarios(simulator, monkeypatch):
+    """Test batch simulation with a shared baseline and ranking."""
+    monkeypatch.setattr(
+        "app.services.simulation_engine.settings.BATCH_WORKERS", 2
+    )
+    requests = [
+        SimulationRequest(action=SimulationAction.REMOVE_LINK, src="R1", dst="R2"),
+        SimulationRequest(action=SimulationAction.ADD_LINK, src="R1", dst="R5", latency=1),
+        SimulationRequest(action=SimulationAction.CHANGE_CAPACITY, src="R2", dst="R3", capacity=2000),
+    ]
+    
+    batch = await simulator.simulate_batch(requests)
+    
+    assert len(batch.results) == 3
+    assert all(r.status == SimulationStatus.COMPLETED for r in batch.results)
+    assert [r.rank for r in batch.ranking] == [1, 2, 3]
+    # The shortcut link lowers latency, so it ranks first among low-risk changes
+    assert batch.ranking[0].index == 1
+    assert batch.ranking[-1].index == 0
+    assert len(simulator._graph_cache) == 1
+
+
+@pytest.mark.asyncio
+async def test_identical_requests_computed_once(simulator, monkeypatch):
+    """Test that concurrent identical requests share one analysis."""
+    calls = []
+    original = simulator._analyze_impact
+    
+    async def counting_analyze(*args, **kwargs):
+        calls.append(args)
+        return await original(*args, **kwargs)
+    
+    monkeypatch.setattr(simulator, "_analyze_impact", counting_analyze)
+    request = SimulationRequest(
+        action=SimulationAction.REMOVE_LINK, src="R1", dst="R2"
+    )
+    
+    results = await asyncio.gather(*[simulator.simulate(request) for _ in range(3)])
+    repeat = await simulator.simulate(request)
+    
+    assert len(calls) == 1
+    assert len({r.simulation_id for r in results}) == 3
+    assert all(r.status == SimulationStatus.COMPLETED for r in results)
+    assert repeat.impact_analysis == results[0].impact_analysis
+    # Callers served by another's computation time their wait for it
+    assert sum("analyze" in r.stage_timings for r in results) == 2
+    assert "analyze" in repeat.stage_timings
+
+
+
+@pytest.mark.asyncio
+async def test_stage_timings_recorded_and_exported(simulator):
+    """Test per-stage timings on the result and in the stage histogram."""
+    from prometheus_client import REGISTRY
+    
+    def observed(stage):
+        return REGISTRY.get_sample_value(
+            "whatif_simulation_stage_seconds_count",
+            {"action": "remove_link", "stage": stage}
+        ) or 0.0
+    
+    before = observed("apsp")
+    request = SimulationRequest(
+        action=SimulationAction.REMOVE_LINK, src="R2", dst="R4"
+    )
+    result = await simulator.simulate(request)
+    
+    assert {
+        "cache", "load", "apply", "connectivity", "utilization",
+        "apsp", "affected_paths"
+    } <= set(result.stage_timings)
+    assert all(seconds >= 0 for seconds in result.stage_timings.values())
+    assert sum(result.stage_timings.values()) <= result.execution_time + 0.05
+    assert observed("apsp") == before + 1
+
+
+@pytest.mark.asyncio
+async def test_topology_loaded_once_until_change_event(simulator, monkeypatch):
+    """Test the warm topology is reused and refreshed on a change event."""
+    import json
+    
+    loads = []
+    original = simulator._load_network_topology
+    
+    async def counting_load():
+        loads.append(1)
+        return await original()
+    
+    monkeypatch.setattr(simulator, "_load_network_topology", counting_load)
+    
+    await simulator.warm_up()
+    first = await simulator._prepare_baseline()
+    assert len(loads) == 1
+    
+    await simulator._handle_topology_event("not json")
+    assert len(loads) == 1
+    
+    await simulator._handle_topology_event(json.dumps({
+        "event": "topology_updated", "version": "discovery-2"
+    }))
+    assert len(loads) == 2
+    assert simulator._topology_version == "discovery-2"
+    assert (await simulator._prepare_baseline()).version == first.version
+    assert len(loads) == 2
+
+
+@pytest.mark.asyncio
+async def test_topology_snapshot_used_on_restart(simulator, mock_redis, tmp_path, monkeypatch):
+    """Test that a fresh simulator starts from the snapshot of the current version."""
+    from app.services.graph_core import CompactTopology
+    from app.services.topology_loader import save_snapshot
+    
+    monkeypatch.setattr(
+        "app.services.simulation_engine.settings.TOPOLOGY_SNAPSHOT_DIR",
+        str(tmp_path)
+    )
+    graph = simulator._generate_synthetic_topology()
+    graph.add_edge("R1", "R9", capacity=100, utilization=0.1, latency=1)
+    save_snapshot(CompactTopology.from_networkx(graph), str(tmp_path), "discovery-7")
+    mock_redis.get.return_value = "discovery-7"
+    
+    baseline = await simulator._prepare_baseline()
+    
+    assert "R9" in baseline.topology.node_index
+    simulator.neo4j_driver.session.assert_not_called()
@@ -0,0 +1,96 @@
+import networkx as nx
+import pytest
+from app.models.simulation import (SimulationAction, SimulationRequest,
+                                   SRLGSweepRequest)
+from app.services.baseline import BaselineAnalysis
+from app.services.contingency import ContingencySweep
+from app.services.graph_core import CompactTopology
+from app.services.impact_analyzer import ImpactAnalyzer
+
+# Ring R0..R5 with three chords; "trench" cuts R1-R2 off the rest, the
+# "bundle" chords can all fail without splitting the ring
+GROUPS = {
+    ("R0", "R1"): ["trench"],
+    ("R2", "R3"): ["trench"],
+    ("R4", "R5"): "ring-south",
+    ("R0", "R3"): ["bundle"],
+    ("R1", "R4"): ["bundle", "trench"],
+    ("R2", "R5"): ["bundle", "trench"],
+}
+
+
+@pytest.fixture
+def baseline():
+    graph = nx.cycle_graph([f"R{i}" for i in range(6)])
+    graph.add_edges_from([("R0", "R3"), ("R1", "R4"), ("R2", "R5")])
+    for i, (src, dst) in enumerate(graph.edges()):
+        graph[src][dst].update(capacity=1000, utilization=0.2, latency=1 + i % 3)
+        groups = GROUPS.get((src, dst)) or GROUPS.get((dst, src))
+        if groups:
+            graph[src][dst]["srlg"] = groups
+    return BaselineAnalysis(CompactTopology.from_networkx(graph))
+
+
+def test_shared_risk_groups(baseline):
+    """Test that groups are read from lists and single names."""
+    topology = baseline.topology
+    groups = topology.shared_risk_groups()
+
+    assert sorted(groups) == ["bundle", "ring-south", "trench"]
+    assert len(groups["bundle"]) == 3 and len(groups["trench"]) == 4
+    assert [topology.edge_name(e) for e in groups["ring-south"]] in (
+        ["R4-R5"], ["R5-R4"]
+    )
+
+    # Group membership is part of the topology version
+    plain = topology.to_networkx()
+    for _, _, data in plain.edges(data=True):
+        data.pop("srlg", None)
+    assert CompactTopology.from_networkx(plain).fingerprint() != topology.fingerprint()
+
+
+def test_fail_srlg_action(baseline):
+    """Test that failing a group removes all of its links at once."""
+    analyzer = ImpactAnalyzer()
+    sweep = ContingencySweep(baseline, analyzer)
+    groups = baseline.topology.shared_risk_groups()
+
+    impact = analyzer.evaluate(baseline, SimulationRequest(
+        action=SimulationAction.FAIL_SRLG, parameters={"srlg": "bundle"}
+    ))
+    failure = sweep.evaluate_failure(tuple(groups["bundle"].tolist()))
+    assert impact.risk_level != "critical" and not failure.disconnected
+    assert impact.latency_increase == pytest.approx(failure.latency_increase)
+
+    impact = analyzer.evaluate(baseline, SimulationRequest(
+        action=SimulationAction.FAIL_SRLG, parameters={"srlg": "trench"}
+    ))
+    assert impact.risk_level == "critical"
+
+    with pytest.raises(ValueError):
+        analyzer.evaluate(baseline, SimulationRequest(
+            action=SimulationAction.FAIL_SRLG, parameters={"srlg": "nowhere"}
+        ))
+
+
+def test_srlg_sweep_ranks_partitioning_group_first(baseline):
+    """Test the sweep over all groups and over a requested subset."""
+    sweep = ContingencySweep(baseline, ImpactAnalyzer())
+
+    result = sweep.run_groups(SRLGSweepRequest())
+
+    assert result.groups_evaluated == 3 and not result.truncated
+    assert result.partitioning_failures == 1
+    assert result.failures[0].srlg == "trench"
+    assert result.failures[0].disconnected
+    # R1 and R2 lose the other four routers: 2 * 2 * 4 of 30 ordered pairs
+    assert result.failures[0].connectivity_loss == pytest.approx(16 / 30)
+    assert len(result.failures[0].failed_links) == 4
+
+    result = sweep.run_groups(SRLGSweepRequest(
+        groups=["bundle", "ring-south"], max_scenarios=1
+    ))
+    assert result.truncated and [f.srlg for f in result.failures] == ["bundle"]
+
+    with pytest.raises(ValueError):
+        sweep.run_groups(SRLGSweepRequest(groups=["nowhere"]))
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+from app.services.topology_generator import generate_isp_topology
+
+
+@pytest.mark.parametrize("nodes", [4, 10, 57, 1000])
+def test_generated_topology_is_connected_and_simple(nodes):
+    """Test node counts, connectivity and the absence of parallel links."""
+    topology = generate_isp_topology(nodes, seed=3)
+
+    assert topology.node_count == nodes
+    assert topology.is_connected()
+    assert (topology.src != topology.dst).all()
+    pairs = set(zip(
+        np.minimum(topology.src, topology.dst).tolist(),
+        np.maximum(topology.src, topology.dst).tolist()
+    ))
+    assert len(pairs) == topology.edge_count
+    assert ((topology.utilization >= 0) & (topology.utilization <= 1)).all()
+
+
+def test_generated_topology_is_redundant_and_seeded():
+    """Test that no single link failure partitions the access tier."""
+    topology = generate_isp_topology(500, seed=5)
+    again = generate_isp_topology(500, seed=5)
+    assert topology.fingerprint() == again.fingerprint()
+
+    roles = [attrs["role"] for attrs in topology.node_attrs]
+    degree = np.bincount(
+        np.concatenate([topology.src, topology.dst]),
+        minlength=topology.node_count
+    )
+    access = np.array([role == "access" for role in roles])
+    assert access.any() and (degree[access] == 2).all()
+    assert {attrs["tier"] for attrs in topology.edge_attrs} == {
+        "core", "uplink", "ring", "access"
+    }
+
+
+def test_generator_scales_to_100k_nodes():
+    """Test that a 100k-node topology is built in arrays."""
+    topology = generate_isp_topology(100000, seed=1)
+
+    assert topology.node_count == 100000
+    assert topology.edge_count > topology.node_count
+    assert topology.is_connected()
+
+    with pytest.raises(ValueError):
+        generate_isp_topology(2)
@@ -0,0 +1,73 @@
+from unittest.mock import MagicMock
+
+from app.services.topology_loader import (TOPOLOGY_QUERY, load_snapshot,
+                                          load_topology_from_neo4j,
+                                          save_snapshot)
+
+
+def _link(target, capacity, latency, **extra):
+    link = {
+        "target": target, "id": f"link-{target}", "capacity": capacity,
+        "utilization": 0.5, "latency": latency, "cost": None,
+        "interface_src": None, "interface_dst": None
+    }
+    link.update(extra)
+    return link
+
+
+def _driver(records):
+    """Neo4j driver mock whose session streams the given records."""
+    session = MagicMock()
+    session.run.return_value = iter(records)
+    driver = MagicMock()
+    driver.session.return_value.__enter__.return_value = session
+    return driver, session
+
+
+def test_bulk_load_single_query():
+    """Test that nodes and links are built from one streamed query."""
+    driver, session = _driver([
+        {"id": "R1", "attrs": {"name": "R1", "vendor": "Cisco"},
+         "links": [_link("R2", 1000, 2), _link("R3", 500, 5)]},
+        {"id": "R2", "attrs": {"name": "R2", "vendor": None},
+         "links": [_link("R1", 1000, 2)]},
+        {"id": "R3", "attrs": {"name": "R3"}, "links": []},
+        {"id": "R4", "attrs": {"name": "R4"}, "links": []},
+    ])
+    
+    topology = load_topology_from_neo4j(driver)
+    
+    session.run.assert_called_once_with(TOPOLOGY_QUERY)
+    assert topology.node_ids == ["R1", "R2", "R3", "R4"]
+    assert topology.edge_count == 2  # The reverse R2 -> R1 entry is dropped
+    assert topology.node_attrs[1] == {"name": "R2"}
+    assert topology.edge_data(topology.find_edge(0, 2))["capacity"] == 500
+    assert not topology.is_connected()
+
+
+def test_snapshot_round_trip(tmp_path):
+    """Test that a snapshot reloads memory-mapped with identical content."""
+    driver, _ = _driver([
+        {"id": "R1", "attrs": {}, "links": [_link("R2", 1000, 2)]},
+        {"id": "R2", "attrs": {}, "links": [_link("R3", 100, 4)]},
+    ])
+    topology = load_topology_from_neo4j(driver)
+    
+    save_snapshot(topology, str(tmp_path), "discovery-1")
+    loaded, version = load_snapshot(str(tmp_path))
+    
+    assert version == "discovery-1"
+    assert not loaded.src.flags.owndata  # Backed by the mapped file
+    assert loaded.fingerprint() == topology.fingerprint()
+    assert loaded.edge_attrs == topology.edge_attrs
+    
+    save_snapshot(topology, str(tmp_path), "discovery-2")
+    assert load_snapshot(str(tmp_path))[1] == "discovery-2"
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "CURRENT", "snapshot-discovery-2"
+    ]
+
+
+def test_missing_snapshot(tmp_path):
+    """Test that an empty directory has no snapshot."""
+    assert load_snapshot(str(tmp_path / "absent")) is None
@@ -0,0 +1,118 @@
+import random
+
+import networkx as nx
+import numpy as np
+import pytest
+from app.models.simulation import (SimulationAction, SimulationRequest,
+                                   TrafficDemand)
+from app.services.baseline import BaselineAnalysis
+from app.services.graph_core import CompactTopology
+from app.services.impact_analyzer import ImpactAnalyzer
+from app.services.traffic import TrafficRouter
+
+
+@pytest.fixture
+def baseline():
+    """Baseline of a random mesh with equal-cost links."""
+    rng = random.Random(5)
+    graph = nx.connected_watts_strogatz_graph(24, 4, 0.3, seed=5)
+    graph = nx.relabel_nodes(graph, {n: f"R{n}" for n in graph.nodes()})
+    for src, dst in graph.edges():
+        graph[src][dst].update(
+            capacity=1000, utilization=rng.uniform(0.1, 0.4),
+            latency=rng.randint(1, 10), cost=rng.choice([10, 10, 20])
+        )
+    return BaselineAnalysis(CompactTopology.from_networkx(graph))
+
+
+@pytest.fixture
+def demands():
+    rng = random.Random(11)
+    nodes = [f"R{n}" for n in range(24)]
+    return [
+        TrafficDemand(src=src, dst=dst, volume=rng.uniform(1, 50))
+        for src, dst in (rng.sample(nodes, 2) for _ in range(60))
+    ]
+
+
+def _reference_loads(topology, demands):
+    """Route every demand from scratch on a compact topology."""
+    router = TrafficRouter.from_topology(topology)
+    src = np.array([topology.node_index[d.src] for d in demands])
+    dst = np.array([topology.node_index[d.dst] for d in demands])
+    volumes = np.array([d.volume for d in demands])
+    directed = router.incidence(src, dst) @ volumes
+    return np.maximum(directed[:topology.edge_count], directed[topology.edge_count:])
+
+
+def test_ecmp_splits_evenly():
+    """Test that a demand splits equally over equal-cost paths."""
+    graph = nx.Graph()
+    for src, dst in [("A", "B"), ("B", "D"), ("A", "C"), ("C", "D")]:
+        graph.add_edge(src, dst, capacity=100, cost=10)
+    topology = CompactTopology.from_networkx(graph)
+
+    loads = _reference_loads(topology, [TrafficDemand(src="A", dst="D", volume=40)])
+
+    assert np.allclose(loads, 20.0)
+
+
+def test_incremental_loads_match_full_reroute(baseline, demands):
+    """Test scenario link loads against routing the modified topology."""
+    model = baseline.traffic_model(demands)
+    assert np.allclose(model.link_loads, _reference_loads(baseline.topology, demands))
+
+    overlay = baseline.topology.overlay()
+    topology = baseline.topology
+    removed = (topology.node_ids[topology.src[0]], topology.node_ids[topology.dst[0]])
+    overlay.remove_edge(*removed)
+    overlay.set_edge_attrs(
+        topology.node_ids[topology.src[3]], topology.node_ids[topology.dst[3]],
+        cost=5
+    )
+    overlay.add_edge("R0", "R12", capacity=1000, utilization=0.0, latency=2, cost=10)
+
+    utilization, unrouted = model.utilization_after(overlay)
+
+    modified = overlay.materialize()
+    expected_loads = _reference_loads(modified, demands)
+    background = np.concatenate([model.background, [0.0]])[overlay.edge_active]
+    expected = (expected_loads + background) / modified.capacity
+    assert np.allclose(utilization[overlay.edge_active], expected)
+    assert unrouted == 0.0
+
+
+def test_partition_reports_unrouted_traffic():
+    """Test that demands cut off by a failure are counted as unrouted."""
+    graph = nx.Graph()
+    graph.add_edge("A", "B", capacity=100, utilization=0.1)
+    graph.add_edge("B", "C", capacity=100, utilization=0.1)
+    baseline = BaselineAnalysis(CompactTopology.from_networkx(graph))
+
+    impact = ImpactAnalyzer().evaluate(baseline, SimulationRequest(
+        action=SimulationAction.REMOVE_LINK, src="B", dst="C",
+        traffic_matrix=[
+            TrafficDemand(src="A", dst="C", volume=30),
+            TrafficDemand(src="A", dst="B", volume=5)
+        ]
+    ))
+
+    assert impact.unrouted_traffic == pytest.approx(30.0)
+
+
+def test_rerouted_demand_congests_backup_path():
+    """Test that congestion reflects demand shifted by a link removal."""
+    graph = nx.Graph()
+    graph.add_edge("A", "B", capacity=100, utilization=0.5, cost=10)
+    graph.add_edge("A", "C", capacity=100, utilization=0.0, cost=10)
+    graph.add_edge("C", "B", capacity=100, utilization=0.0, cost=10)
+    baseline = BaselineAnalysis(CompactTopology.from_networkx(graph))
+    demand = [TrafficDemand(src="A", dst="B", volume=90)]
+
+    impact = ImpactAnalyzer().evaluate(baseline, SimulationRequest(
+        action=SimulationAction.REMOVE_LINK, src="A", dst="B",
+        traffic_matrix=demand
+    ))
+
+    assert sorted(impact.congested_links) == ["A-C", "B-C"]
+    assert impact.packet_loss > 0